@@ -0,0 +1,89 @@
+"""
+Raw Data Channel Capture
+========================
+
+Records all raw data channel traffic (LiDAR frames stay LZ4-compressed) to a
+capture file, or summarizes and decodes an existing capture offline.
+
+Usage:
+    python capture_session.py record session.go2cap [--duration 60] [--compression lz4]
+    python capture_session.py info session.go2cap
+"""
+
+import argparse
+import asyncio
+import logging
+from go2_webrtc_driver.webrtc_driver import Go2WebRTCConnection, WebRTCConnectionMethod
+from go2_webrtc_driver.msgs.capture import CaptureReader
+
+# Enable logging for debugging
+logging.basicConfig(level=logging.FATAL)
+
+LIDAR_TOPIC = "rt/utlidar/voxel_map_compressed"
+
+
+async def record(path: str, duration: float, compression: str):
+    conn = None
+    try:
+        # Choose a connection method (uncomment the correct one)
+        conn = Go2WebRTCConnection(WebRTCConnectionMethod.LocalSTA)
+
+        # Connect to the WebRTC service.
+        await conn.connect()
+
+        recorder = conn.datachannel.start_capture(path, compression=compression)
+
+        # Turn on the LiDAR and subscribe to the topics to record
+        await conn.datachannel.disableTrafficSaving(True)
+        conn.datachannel.pub_sub.publish_without_callback("rt/utlidar/switch", "on")
+        conn.datachannel.pub_sub.subscribe(LIDAR_TOPIC)
+        conn.datachannel.pub_sub.subscribe("rt/lf/lowstate")
+
+        await asyncio.sleep(duration)
+        conn.datachannel.stop_capture()
+        print(f"Recorded {recorder.records} messages: {recorder.raw_bytes / 1e6:.1f} MB raw, "
+              f"{recorder.written_bytes / 1e6:.1f} MB on disk")
+
+    except ValueError as e:
+        # Log any value errors that occur during the process.
+        logging.error(f"An error occurred: {e}")
+    finally:
+        # Ensure proper cleanup of the WebRTC connection
+        if conn:
+            try:
+                await conn.disconnect()
+                print("WebRTC connection closed successfully")
+            except Exception as e:
+                logging.error(f"Error closing WebRTC connection: {e}")
+
+
+def info(path: str):
+    reader = CaptureReader(path)
+    print(f"{path}: {len(reader.chunks)} chunks, compression {reader.header['compression']}")
+    for topic, entry in sorted(reader.topics().items()):
+        span = entry["last"] - entry["first"]
+        print(f"  {topic or '<no topic>':<45}{int(entry['count']):>8} msgs {span:>9.1f} s")
+
+    # Decode the first recorded LiDAR frame
+    for record in reader.read(topics=[LIDAR_TOPIC], direction="in"):
+        message = reader.decode(record)
+        print(f"First LiDAR frame (stamp {record.robot_stamp}): "
+              f"{message['data']['data'].get('point_count')} points")
+        break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or inspect raw data channel captures")
+    parser.add_argument("command", choices=["record", "info"])
+    parser.add_argument("path", help="Capture file")
+    parser.add_argument("--duration", type=float, default=60.0, help="Recording time in seconds")
+    parser.add_argument("--compression", choices=["lz4", "zstd"], default="lz4")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        info(args.path)
+    else:
+        try:
+            asyncio.run(record(args.path, args.duration, args.compression))
+        except KeyboardInterrupt:
+            pass
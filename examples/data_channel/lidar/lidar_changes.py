@@ -0,0 +1,81 @@
+"""
+LiDAR Voxel Change Detection
+============================
+
+Decodes the LiDAR voxel map into packed grids (no points) and prints, per
+frame, how many voxels appeared and disappeared since the previous frame,
+with the window movement in voxels. Only the changed voxels are expanded to
+points.
+
+Usage:
+    python lidar_changes.py
+    python lidar_changes.py --ip 192.168.8.181 --min-changes 50
+
+Notes:
+- Keyframes (first frame, or a frame that could not be aligned with the
+  previous one) report every occupied voxel as added.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from go2_webrtc_driver.webrtc_driver import Go2WebRTCConnection, WebRTCConnectionMethod
+from go2_webrtc_driver.lidar.voxel_changes import VoxelChangeDetector
+
+# Enable logging for debugging
+logging.basicConfig(level=logging.WARNING)
+
+
+async def main(args) -> None:
+    conn = None
+    try:
+        conn = Go2WebRTCConnection(WebRTCConnectionMethod.LocalSTA, ip=args.ip)
+        await conn.connect()
+
+        await conn.datachannel.disableTrafficSaving(True)
+
+        # Packed occupancy grids instead of point clouds
+        conn.datachannel.set_decoder("native", output="grid")
+        conn.datachannel.pub_sub.publish_without_callback("rt/utlidar/switch", "on")
+
+        detector = VoxelChangeDetector()
+
+        def on_lidar(message):
+            changes = detector.update(message["data"]["data"]["grid"])
+            added, removed = changes.counts()
+            if changes.keyframe:
+                print(f"Keyframe: {added} voxels")
+            elif added + removed >= args.min_changes:
+                new_points = changes.added_points()
+                center = new_points.mean(axis=0) if len(new_points) else None
+                print(f"+{added} -{removed} voxels, shift {changes.shift}, "
+                      f"new voxels centered at {center}")
+
+        conn.datachannel.pub_sub.subscribe("rt/utlidar/voxel_map_compressed", on_lidar)
+
+        await asyncio.sleep(3600)
+
+    except ValueError as e:
+        logging.error(f"An error occurred: {e}")
+    finally:
+        if conn:
+            try:
+                await conn.disconnect()
+                print("WebRTC connection closed successfully")
+            except Exception as e:
+                logging.error(f"Error closing WebRTC connection: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print LiDAR voxel changes between frames")
+    parser.add_argument("--ip", type=str, default=None, help="Robot IP for STA mode")
+    parser.add_argument("--min-changes", type=int, default=20,
+                        help="Only print frames with at least this many changed voxels")
+
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
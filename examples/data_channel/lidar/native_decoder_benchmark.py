@@ -0,0 +1,106 @@
+"""
+Native LiDAR Decoder Benchmark
+==============================
+
+Compares the numba and vectorized NumPy kernels of the native voxel decoder
+on synthetic voxel maps shaped like ``rt/utlidar/voxel_map_compressed``
+frames, and checks that both produce the same points. The "reused" column
+decodes with a zero-copy ``LidarDecoder`` that writes every frame into the
+same point array; the last line shows the packed ``VoxelGrid`` output for
+comparison. No robot connection is required.
+
+Usage:
+    python native_decoder_benchmark.py [--occupied 20000] [--iterations 200]
+    python native_decoder_benchmark.py --roi-z 0.2 1.0     # Also decode a height band
+
+Without numba installed only the NumPy kernel is measured:
+    pip install numba
+"""
+
+import argparse
+import time
+
+import lz4.block
+import numpy as np
+
+from go2_webrtc_driver.lidar import lidar_decoder_native as native
+
+SLICE_BYTES = 0x800   # 128 x 128 voxels per z slice, 8 per byte
+
+
+def make_frame(occupied: int, slices: int, seed: int = 0) -> bytes:
+    """Build a compressed voxel map with about `occupied` non-zero bytes."""
+    rng = np.random.default_rng(seed)
+    grid = np.zeros(SLICE_BYTES * slices, dtype=np.uint8)
+    # Most returns are near the ground: bias towards the lower slices
+    z = np.minimum(rng.exponential(slices / 4, occupied).astype(np.int64), slices - 1)
+    offsets = rng.integers(0, SLICE_BYTES, occupied)
+    grid[z * SLICE_BYTES + offsets] = rng.integers(1, 256, occupied, dtype=np.uint8)
+    return grid.tobytes()
+
+
+def bench(func, iterations: int) -> float:
+    """Return the mean time per call in milliseconds."""
+    func()  # Warm up (and JIT-compile the numba kernel)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the native LiDAR decoder kernels")
+    parser.add_argument("--occupied", type=int, default=20000, help="Occupied bytes per frame")
+    parser.add_argument("--slices", type=int, default=64, help="Z slices per frame")
+    parser.add_argument("--iterations", type=int, default=200, help="Decodes per measurement")
+    parser.add_argument("--roi-z", type=float, nargs=2, metavar=("MIN", "MAX"), default=None,
+                        help="Also measure decoding only this height band (meters)")
+    args = parser.parse_args()
+
+    raw = make_frame(args.occupied, args.slices)
+    compressed = lz4.block.compress(raw, store_size=False)
+    origin, resolution = [-3.2, -3.2, -0.5], 0.05
+    print(f"Frame: {len(raw)} bytes raw, {len(compressed)} compressed, "
+          f"numba {'available' if native.NUMBA_AVAILABLE else 'not installed'}")
+
+    backends = [backend for backend in native.BACKENDS
+                if backend != "numba" or native.NUMBA_AVAILABLE]
+    results = {}
+    metadata = {"src_size": len(raw), "origin": origin, "resolution": resolution}
+    print(f"{'backend':<8}{'points':>10}{'expand ms':>12}{'decode ms':>12}{'reused ms':>12}")
+    for backend in backends:
+        points = native.bits_to_points(raw, origin, resolution, backend)
+        results[backend] = points
+        expand = bench(lambda: native.bits_to_points(raw, origin, resolution, backend),
+                       args.iterations)
+        decode = bench(lambda: native.bits_to_points(
+            native.decompress(compressed, len(raw)), origin, resolution, backend), args.iterations)
+        decoder = native.LidarDecoder(zero_copy=True, backend=backend)
+        reused = bench(lambda: decoder.decode(compressed, metadata), args.iterations)
+        print(f"{backend:<8}{len(points):>10}{expand:>12.2f}{decode:>12.2f}{reused:>12.2f}")
+
+        if args.roi_z:
+            # Only the slices of the height band are expanded
+            roi = native.VoxelROI(z=tuple(args.roi_z), metric=True)
+            cropped = native.LidarDecoder(zero_copy=True, backend=backend, roi=roi)
+            band = cropped.decode(compressed, metadata)["points"]
+            expected = points[(points[:, 2] >= args.roi_z[0]) & (points[:, 2] <= args.roi_z[1])]
+            roi_ms = bench(lambda: cropped.decode(compressed, metadata), args.iterations)
+            print(f"{'  roi':<8}{len(band):>10}{'':>12}{'':>12}{roi_ms:>12.2f}"
+                  f"  (matches filter: {np.array_equal(band, expected)})")
+
+    # Packed grid output: no voxels are expanded at all
+    grid_decoder = native.LidarDecoder(output="grid")
+    grid = grid_decoder.decode(compressed, metadata)["grid"]
+    grid_ms = bench(lambda: grid_decoder.decode(compressed, metadata), args.iterations)
+    count_ms = bench(grid.count, args.iterations)
+    print(f"Grid: {grid.nbytes} bytes packed vs {results[backends[0]].nbytes} bytes of points, "
+          f"decode {grid_ms:.2f} ms, count() {count_ms:.3f} ms = {grid.count()} voxels")
+
+    if len(results) == 2:
+        same = np.array_equal(results["numba"], results["numpy"])
+        print(f"Outputs identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
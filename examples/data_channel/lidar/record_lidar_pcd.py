@@ -228,15 +228,12 @@ async def lidar_webrtc_connection():
                 except Exception as e:
                     logging.error(f"Error in LIDAR callback: {e}")
 
-            # Subscribe to LIDAR voxel map messages
-            conn.datachannel.pub_sub.subscribe(
-                "rt/utlidar/voxel_map_compressed",
-                lambda message: asyncio.create_task(lidar_callback_task(message))
-            )
-
-            # Keep the connection active
-            while True:
-                await asyncio.sleep(1)
+            # Stream LIDAR voxel map messages. The bounded queue drops the oldest
+            # frames if saving falls behind instead of piling up tasks.
+            async for message in conn.datachannel.pub_sub.stream(
+                "rt/utlidar/voxel_map_compressed", maxsize=4, overflow="drop_oldest"
+            ):
+                await lidar_callback_task(message)
 
         except KeyboardInterrupt:
             # Handle Ctrl+C to exit gracefully within the async context
@@ -0,0 +1,100 @@
+"""
+JSON Codec Benchmark at Lowstate Rates
+======================================
+
+Measures how long each available JSON codec takes to decode and encode a
+message shaped like ``rt/lf/lowstate`` and how much of the per-message budget
+that uses at the robot's publishing rate. No robot connection is required.
+
+Usage:
+    python json_codec_benchmark.py [--rate 500] [--iterations 20000]
+
+Install orjson or msgspec to compare them against the standard library:
+    pip install orjson msgspec
+"""
+
+import argparse
+import random
+import time
+
+from go2_webrtc_driver.msgs import json_codec
+
+
+def make_lowstate_message() -> dict:
+    """Build a message with the structure and size of a real lowstate update."""
+    rnd = random.Random(0)
+    return {
+        "type": "msg",
+        "topic": "rt/lf/lowstate",
+        "data": {
+            "imu_state": {
+                "quaternion": [rnd.uniform(-1, 1) for _ in range(4)],
+                "gyroscope": [rnd.uniform(-1, 1) for _ in range(3)],
+                "accelerometer": [rnd.uniform(-10, 10) for _ in range(3)],
+                "rpy": [rnd.uniform(-3.14, 3.14) for _ in range(3)],
+                "temperature": 63,
+            },
+            "motor_state": [
+                {
+                    "q": rnd.uniform(-3, 3),
+                    "temperature": rnd.randint(30, 60),
+                    "lost": 0,
+                    "reserve": [0, 0],
+                }
+                for _ in range(20)
+            ],
+            "bms_state": {
+                "version_high": 1,
+                "version_low": 18,
+                "status": 8,
+                "soc": 87,
+                "current": -3245,
+                "cycle": 42,
+                "bq_ntc": [25, 24],
+                "mcu_ntc": [29, 28],
+                "cell_vol": [3712 + i for i in range(15)],
+            },
+            "foot_force": [rnd.randint(0, 200) for _ in range(4)],
+            "temperature_ntc1": 47,
+            "power_v": 28.91,
+        },
+    }
+
+
+def bench(func, arg, iterations: int) -> float:
+    """Return the mean time per call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark data channel JSON codecs")
+    parser.add_argument("--rate", type=float, default=500.0, help="Message rate in Hz (default: 500)")
+    parser.add_argument("--iterations", type=int, default=20000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    message = make_lowstate_message()
+    text = json_codec.dumps(message)
+    budget_us = 1e6 / args.rate
+
+    print(f"Message size: {len(text)} bytes, rate: {args.rate:.0f} Hz "
+          f"({budget_us:.0f} us per message)")
+    print(f"{'codec':<10}{'loads us':>10}{'dumps us':>10}{'total us':>10}{'budget':>9}{'speedup':>9}")
+
+    original = json_codec.get_json_codec()
+    baseline = None
+    for name in reversed(json_codec.available_json_codecs()):
+        json_codec.set_json_codec(name)
+        loads_us = bench(json_codec.loads, text, args.iterations)
+        dumps_us = bench(json_codec.dumps, message, args.iterations)
+        total = loads_us + dumps_us
+        baseline = baseline or total
+        print(f"{name:<10}{loads_us:>10.1f}{dumps_us:>10.1f}{total:>10.1f}"
+              f"{total / budget_us:>8.1%}{baseline / total:>8.1f}x")
+    json_codec.set_json_codec(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Adaptive Bandwidth Governor
+===========================
+
+Streams LiDAR and video while the bandwidth governor watches inbound
+throughput, decode backlog and consumer lag. Under congestion it switches the
+video off, turns traffic saving on and pauses the LiDAR - one step at a time -
+and restores them when the link has headroom again.
+
+Usage:
+    python bandwidth_governor.py                          # Default limits
+    python bandwidth_governor.py --max-kbps 300           # Budget for a shared AP
+    python bandwidth_governor.py --steps video lidar      # Never touch traffic saving
+
+Notes:
+- Inbound throughput is measured on the data channel only; video is a media
+  track and shows up through its effect on the other signals.
+- The governor state is printed on every level change and every 5 seconds.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from go2_webrtc_driver.webrtc_driver import Go2WebRTCConnection, WebRTCConnectionMethod
+from go2_webrtc_driver.bandwidth_governor import BandwidthGovernor, BandwidthPolicy, STEPS
+
+# Enable logging for debugging
+logging.basicConfig(level=logging.WARNING)
+
+
+def on_change(level: int, step: str, degraded: bool) -> None:
+    print(f"Level {level}: {step} {'degraded' if degraded else 'restored'}")
+
+
+async def main(args) -> None:
+    conn = None
+    governor = None
+    try:
+        conn = Go2WebRTCConnection(WebRTCConnectionMethod.LocalSTA, ip=args.ip)
+        await conn.connect()
+
+        # Full-rate streams to govern
+        await conn.datachannel.disableTrafficSaving(True)
+        conn.datachannel.switchVideoChannel(True)
+        conn.datachannel.pub_sub.publish_without_callback("rt/utlidar/switch", "on")
+        conn.datachannel.set_decode_executor("thread", 1)
+        frames = conn.datachannel.pub_sub.stream("rt/utlidar/voxel_map_compressed", maxsize=4)
+
+        policy = BandwidthPolicy(
+            steps=args.steps,
+            max_inbound_bps=args.max_kbps * 1024 if args.max_kbps else None,
+            step_up_after=args.step_up_after,
+            min_dwell=args.min_dwell,
+        )
+        governor = BandwidthGovernor(conn, policy, on_change=on_change)
+        governor.start()
+
+        async def consume() -> None:
+            async for frame in frames:
+                # Simulate a slow consumer on a small companion computer
+                await asyncio.sleep(args.work)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            while True:
+                await asyncio.sleep(5)
+                stats = governor.stats()
+                sample = stats["last_sample"]
+                print(f"level={stats['level']} applied={stats['applied_steps']} "
+                      f"in={sample.get('inbound_bps', 0) / 1024:.0f} kB/s "
+                      f"decode_backlog={sample.get('decode_backlog')} "
+                      f"stream_backlog={sample.get('consumer_backlog')} flaps={stats['flaps']}")
+        finally:
+            consumer.cancel()
+
+    except ValueError as e:
+        logging.error(f"An error occurred: {e}")
+    finally:
+        if governor:
+            await governor.stop()
+        if conn:
+            try:
+                await conn.disconnect()
+                print("WebRTC connection closed successfully")
+            except Exception as e:
+                logging.error(f"Error closing WebRTC connection: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adaptive bandwidth governor demo for Go2")
+    parser.add_argument("--ip", type=str, default=None, help="Robot IP for STA mode")
+    parser.add_argument("--max-kbps", type=float, default=None,
+                        help="Inbound data channel budget in kB/s (default: no throughput limit)")
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=list(STEPS),
+                        help="Degradation steps in order")
+    parser.add_argument("--step-up-after", type=int, default=10, help="Clear samples before stepping up")
+    parser.add_argument("--min-dwell", type=float, default=5.0, help="Seconds between level changes")
+    parser.add_argument("--work", type=float, default=0.05, help="Seconds of work per LiDAR frame")
+
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
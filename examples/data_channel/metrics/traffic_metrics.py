@@ -0,0 +1,85 @@
+"""
+Data Channel Traffic Metrics
+============================
+
+Subscribes to the LiDAR and low state topics, prints the busiest topics every
+few seconds and serves all data channel metrics for Prometheus scraping.
+
+Usage:
+    python traffic_metrics.py [--port 9108]
+
+Then:
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import argparse
+import asyncio
+import logging
+from go2_webrtc_driver.webrtc_driver import Go2WebRTCConnection, WebRTCConnectionMethod
+from go2_webrtc_driver.msgs.metrics import start_metrics_server
+
+# Enable logging for debugging
+logging.basicConfig(level=logging.FATAL)
+
+
+def print_hot_topics(metrics, limit: int = 8) -> None:
+    """Print the topics with the highest byte rate."""
+    traffic = sorted(metrics.snapshot()["traffic"],
+                     key=lambda t: t["bytes_per_second"], reverse=True)
+    print(f"{'dir':<4}{'topic':<40}{'msg/s':>8}{'kB/s':>10}")
+    for entry in traffic[:limit]:
+        print(f"{entry['direction']:<4}{entry['topic'][:39]:<40}"
+              f"{entry['messages_per_second']:>8.1f}{entry['bytes_per_second'] / 1024:>10.1f}")
+    for entry in metrics.snapshot()["decode_time"]:
+        print(f"decode {entry['topic']}: mean {entry['mean'] * 1000:.1f} ms over {entry['count']} frames")
+    print()
+
+
+async def main(port: int):
+    conn = None
+    server = None
+    try:
+        # Choose a connection method (uncomment the correct one)
+        conn = Go2WebRTCConnection(WebRTCConnectionMethod.LocalSTA)
+
+        # Connect to the WebRTC service.
+        await conn.connect()
+
+        # Serve the metrics; they are kept across reconnects by the connection.
+        server = await start_metrics_server(conn.metrics, port=port)
+        print(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+
+        # Generate some traffic: LiDAR voxel maps and low state.
+        await conn.datachannel.disableTrafficSaving(True)
+        conn.datachannel.pub_sub.publish_without_callback("rt/utlidar/switch", "on")
+        conn.datachannel.pub_sub.subscribe("rt/utlidar/voxel_map_compressed",
+                                           lambda message: message["data"]["data"])
+        conn.datachannel.pub_sub.subscribe("rt/lf/lowstate", lambda message: None)
+
+        while True:
+            await asyncio.sleep(5)
+            print_hot_topics(conn.metrics)
+
+    except ValueError as e:
+        # Log any value errors that occur during the process.
+        logging.error(f"An error occurred: {e}")
+    finally:
+        if server:
+            server.close()
+        # Ensure proper cleanup of the WebRTC connection
+        if conn:
+            try:
+                await conn.disconnect()
+                print("WebRTC connection closed successfully")
+            except Exception as e:
+                logging.error(f"Error closing WebRTC connection: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print and serve data channel traffic metrics")
+    parser.add_argument("--port", type=int, default=9108, help="Metrics HTTP port (default: 9108)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,98 @@
+"""
+Coalescing Velocity Channel Demo
+================================
+
+Feed velocity targets at a high rate (like a gamepad or planner would) through
+the coalescing velocity channel. Only the newest target is sent, at most once
+per period, and the robot stops by itself when updates stop (deadman).
+
+Usage:
+    python examples/data_channel/velocity_channel.py                   # 50 Hz producer, 20 Hz commands
+    python examples/data_channel/velocity_channel.py --rate 100 --period 0.1
+    python examples/data_channel/velocity_channel.py --stall           # Stop updating, let the deadman stop the robot
+
+Notes:
+- The producer draws a slow left/right yaw sweep while walking forward.
+- Channel counters (sent, coalesced, deadman trips, round trip) are printed at the end.
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import time
+
+from go2_webrtc_driver import Go2RobotHelper
+from go2_webrtc_driver.constants import WebRTCConnectionMethod
+
+
+async def produce_targets(velocity, rate: float, duration: float, speed: float) -> None:
+    """Update the target at `rate` Hz; the channel sends only the newest."""
+    start = time.monotonic()
+    while time.monotonic() - start < duration:
+        elapsed = time.monotonic() - start
+        yaw = 0.4 * math.sin(2 * math.pi * elapsed / 4.0)
+        velocity.set(speed, 0.0, yaw)
+        await asyncio.sleep(1.0 / rate)
+
+
+async def main(args) -> None:
+    logging.getLogger().setLevel(logging.WARNING)
+
+    connection_method = {
+        "ap": WebRTCConnectionMethod.LocalAP,
+        "sta": WebRTCConnectionMethod.LocalSTA,
+        "remote": WebRTCConnectionMethod.Remote,
+    }[args.method]
+
+    async with Go2RobotHelper(
+        connection_method=connection_method,
+        serial_number=args.serial,
+        ip=args.ip,
+        username=args.username,
+        password=args.password,
+        enable_state_monitoring=False,
+        logging_level=logging.WARNING,
+    ) as robot:
+        await robot.ensure_mode("normal")
+        await robot.execute_command("StandUp", wait_time=1.5)
+        await robot.prepare_programmatic_control()
+
+        velocity = robot.start_velocity_channel(period=args.period, deadman_timeout=args.deadman)
+        await produce_targets(velocity, args.rate, args.duration, args.speed)
+
+        if args.stall:
+            print(f"Producer stalled; the deadman stops the robot after {args.deadman}s")
+            await asyncio.sleep(args.deadman + 1.0)
+
+        stats = velocity.stats()
+        await robot.stop_velocity_channel()
+
+        latency = stats["last_latency"]
+        print(f"Targets: {stats['updates']}  Sent: {stats['sent']}  Coalesced: {stats['coalesced']}  "
+              f"Busy ticks: {stats['busy_ticks']}  Deadman trips: {stats['deadman_trips']}  "
+              f"Errors: {stats['errors']}  Last round trip: "
+              f"{'-' if latency is None else f'{latency * 1000:.1f} ms'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coalescing velocity channel demo for Go2")
+    parser.add_argument("--method", choices=["ap", "sta", "remote"], default="sta")
+    parser.add_argument("--ip", type=str, default=None, help="Robot IP for STA mode")
+    parser.add_argument("--serial", type=str, default=None, help="Robot serial number")
+    parser.add_argument("--username", type=str, default=None, help="Username for remote mode")
+    parser.add_argument("--password", type=str, default=None, help="Password for remote mode")
+
+    parser.add_argument("--rate", type=float, default=50.0, help="Target update rate (Hz)")
+    parser.add_argument("--period", type=float, default=0.05, help="Seconds between sent commands")
+    parser.add_argument("--deadman", type=float, default=0.5, help="Deadman timeout (seconds)")
+    parser.add_argument("--duration", type=float, default=6.0, help="Seconds to drive")
+    parser.add_argument("--speed", type=float, default=0.3, help="Forward velocity")
+    parser.add_argument("--stall", action="store_true", help="Stop updating and let the deadman stop the robot")
+
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
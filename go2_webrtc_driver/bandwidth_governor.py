@@ -0,0 +1,401 @@
+"""
+Adaptive Bandwidth Governor
+===========================
+
+Several robots sharing one Wi-Fi access point compete for airtime. When the
+link saturates, LiDAR frames and state messages arrive late and in bursts,
+the decode executor drops frames and consumers fall behind - while the robot
+keeps sending at full rate.
+
+``BandwidthGovernor`` watches the connection and walks a ladder of
+degradation steps, one rung at a time:
+
+- "video": video channel off (``switchVideoChannel``)
+- "traffic_saving": robot-side traffic saving on (``disableTrafficSaving``)
+- "lidar": LiDAR paused (``rt/utlidar/switch`` off)
+
+Every ``interval`` seconds one sample is taken from:
+
+- inbound data channel throughput (the connection metrics)
+- LiDAR decode backlog and frames dropped by the decode executor
+- consumer lag: held-back messages and drops of ``pub_sub.stream()`` streams
+- outbound bytes waiting in the data channel (``bufferedAmount``)
+
+A sample is congested if any signal is above its limit and clear if all of
+them are below ``headroom`` times their limit; anything in between keeps the
+current level. The governor steps down after ``step_down_after`` congested
+samples in a row and back up after ``step_up_after`` clear ones, never
+changes level more often than ``min_dwell`` seconds, and doubles the clear
+samples needed to step up each time a step up had to be undone quickly.
+
+The governor only restores what it switched itself: steps are applied in
+"degraded" direction when stepping down and back to "normal" when stepping
+up, so list only the streams the application actually uses in ``steps``.
+
+Usage:
+    ```python
+    policy = BandwidthPolicy(max_inbound_bps=400_000, steps=("video", "lidar"))
+    governor = BandwidthGovernor(conn, policy)
+    governor.start()
+    ...
+    await governor.stop()          # Restores everything it switched off
+    ```
+
+Author: Go2 WebRTC Connect
+Version: 1.0
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from .constants import RTC_TOPIC
+
+STEPS = ("video", "traffic_saving", "lidar")
+
+
+class BandwidthPolicy:
+    """
+    Limits and hysteresis of a BandwidthGovernor.
+
+    Args:
+        steps: Degradation steps in the order they are applied
+        max_inbound_bps: Inbound data channel bytes per second considered
+            congested, None to ignore throughput
+        max_decode_backlog: LiDAR frames decoding or waiting for delivery
+            considered congested
+        max_consumer_backlog: Messages held back by streams considered
+            congested
+        max_buffered_bytes: Outbound bytes waiting in the data channel
+            considered congested
+        headroom: Fraction of each limit a signal must stay below for a
+            sample to count as clear
+        step_down_after: Congested samples in a row before stepping down
+        step_up_after: Clear samples in a row before stepping up
+        min_dwell: Minimum seconds between two level changes
+        interval: Seconds between samples
+
+    Raises:
+        ValueError: If a step is unknown or repeated, or a limit is invalid
+    """
+
+    def __init__(self, steps: Sequence[str] = STEPS,
+                 max_inbound_bps: Optional[float] = None,
+                 max_decode_backlog: int = 2,
+                 max_consumer_backlog: int = 32,
+                 max_buffered_bytes: int = 1 << 20,
+                 headroom: float = 0.7,
+                 step_down_after: int = 2,
+                 step_up_after: int = 10,
+                 min_dwell: float = 5.0,
+                 interval: float = 1.0) -> None:
+        """Validate and store the policy."""
+        unknown = [step for step in steps if step not in STEPS]
+        if unknown:
+            raise ValueError(f"Unknown steps {unknown}. Choose from {', '.join(STEPS)}.")
+        if len(set(steps)) != len(steps):
+            raise ValueError("steps must not repeat")
+        if max_inbound_bps is not None and max_inbound_bps <= 0:
+            raise ValueError("max_inbound_bps must be positive or None")
+        if max_decode_backlog < 1 or max_consumer_backlog < 1 or max_buffered_bytes < 1:
+            raise ValueError("Backlog and buffer limits must be at least 1")
+        if not 0 < headroom <= 1:
+            raise ValueError("headroom must be in (0, 1]")
+        if step_down_after < 1 or step_up_after < 1:
+            raise ValueError("step_down_after and step_up_after must be at least 1")
+        if min_dwell < 0 or interval <= 0:
+            raise ValueError("min_dwell must not be negative and interval must be positive")
+
+        self.steps = tuple(steps)
+        self.max_inbound_bps = max_inbound_bps
+        self.max_decode_backlog = max_decode_backlog
+        self.max_consumer_backlog = max_consumer_backlog
+        self.max_buffered_bytes = max_buffered_bytes
+        self.headroom = headroom
+        self.step_down_after = step_down_after
+        self.step_up_after = step_up_after
+        self.min_dwell = min_dwell
+        self.interval = interval
+
+    def __repr__(self) -> str:
+        return (f"BandwidthPolicy(steps={self.steps}, max_inbound_bps={self.max_inbound_bps}, "
+                f"headroom={self.headroom}, step_down_after={self.step_down_after}, "
+                f"step_up_after={self.step_up_after}, min_dwell={self.min_dwell})")
+
+
+class BandwidthGovernor:
+    """
+    Steps robot streams down under congestion and back up when it clears.
+
+    Args:
+        conn: Go2WebRTCConnection (or any object with a ``datachannel``);
+            read on every sample, so the governor follows reconnects and
+            re-applies its current level to a new data channel
+        policy: Limits and hysteresis, defaults if None
+        on_change: Optional function called with (level, step, degraded)
+            after every level change
+
+    Attributes:
+        policy: Active BandwidthPolicy
+        level: Number of steps currently applied (0 = everything normal)
+        step_downs: Number of level decreases
+        step_ups: Number of level increases
+        flaps: Step ups undone within a minute (raises the clear samples
+            needed for the next step up)
+        last_sample: Signals of the most recent sample
+    """
+
+    FLAP_WINDOW = 60.0  # Seconds after a step up in which a step down counts as a flap
+
+    def __init__(self, conn, policy: Optional[BandwidthPolicy] = None,
+                 on_change: Optional[Callable[[int, str, bool], None]] = None) -> None:
+        """Initialize at level 0 without sampling."""
+        self.conn = conn
+        self.policy = policy if policy is not None else BandwidthPolicy()
+        self.on_change = on_change
+        self.level = 0
+        self.step_downs = 0
+        self.step_ups = 0
+        self.flaps = 0
+        self.last_sample: Dict[str, Any] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._congested = 0
+        self._clear = 0
+        self._last_change = float("-inf")
+        self._last_step_up = float("-inf")
+        self._datachannel: Any = None
+        self._inbound_bytes: Optional[int] = None
+        self._decode_dropped = 0
+        self._stream_dropped = 0
+        self._sampled_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        """True while the sampling task is running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def applied_steps(self) -> Sequence[str]:
+        """Steps currently in their degraded state."""
+        return self.policy.steps[:self.level]
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self.running:
+            return
+        datachannel = self.conn.datachannel
+        if datachannel is not None:
+            datachannel.metrics.register_gauge(
+                "bandwidth_level", lambda: self.level,
+                "Degradation steps applied by the bandwidth governor.")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, restore: bool = True) -> None:
+        """
+        Stop sampling.
+
+        Args:
+            restore: Step back up to level 0, undoing every applied step
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if restore:
+            while self.level > 0:
+                await self._step_up()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.policy.interval)
+            try:
+                await self.evaluate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Bandwidth governor error: {e}")
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Read the congestion signals once.
+
+        Returns:
+            Dict[str, Any]: inbound_bps, decode_backlog, decode_dropped,
+            consumer_backlog, consumer_dropped (both since the previous
+            sample) and buffered_bytes
+        """
+        datachannel = self.conn.datachannel
+        now = time.monotonic()
+
+        inbound = sum(counter.bytes for (direction, _, _), counter
+                      in datachannel.metrics.traffic.items() if direction == "in")
+        inbound_bps = 0.0
+        if self._inbound_bytes is not None and self._sampled_at is not None and now > self._sampled_at:
+            # Negative after metrics.reset(); treat as no traffic
+            inbound_bps = max(inbound - self._inbound_bytes, 0) / (now - self._sampled_at)
+        self._inbound_bytes = inbound
+        self._sampled_at = now
+
+        executor = datachannel.decode_executor
+        decode_backlog = executor.pending_count() if executor is not None else 0
+        dropped = executor.dropped_frames if executor is not None else 0
+        decode_dropped = max(dropped - self._decode_dropped, 0)
+        self._decode_dropped = dropped
+
+        streams = list(datachannel.pub_sub.streams)
+        consumer_backlog = sum(stream.backlog for stream in streams)
+        dropped = sum(stream.dropped for stream in streams)
+        # Closed streams leave the set, so the total can shrink
+        consumer_dropped = max(dropped - self._stream_dropped, 0)
+        self._stream_dropped = dropped
+
+        self.last_sample = {
+            "inbound_bps": inbound_bps,
+            "decode_backlog": decode_backlog,
+            "decode_dropped": decode_dropped,
+            "consumer_backlog": consumer_backlog,
+            "consumer_dropped": consumer_dropped,
+            "buffered_bytes": datachannel.pub_sub.outbound.buffered_amount(),
+        }
+        return self.last_sample
+
+    def classify(self, sample: Dict[str, Any]) -> int:
+        """
+        Classify a sample.
+
+        Args:
+            sample: Result of sample()
+
+        Returns:
+            int: 1 if congested, -1 if clear, 0 if in the hysteresis band
+        """
+        policy = self.policy
+        headroom = policy.headroom
+        ratios = [
+            sample["decode_backlog"] / policy.max_decode_backlog,
+            sample["consumer_backlog"] / policy.max_consumer_backlog,
+            sample["buffered_bytes"] / policy.max_buffered_bytes,
+        ]
+        if policy.max_inbound_bps is not None:
+            ratios.append(sample["inbound_bps"] / policy.max_inbound_bps)
+        worst = max(ratios)
+        if worst >= 1.0 or sample["decode_dropped"] or sample["consumer_dropped"]:
+            return 1
+        return -1 if worst < headroom else 0
+
+    async def evaluate(self) -> int:
+        """
+        Take one sample and change the level if the policy says so.
+
+        Returns:
+            int: The level after this sample
+        """
+        datachannel = self.conn.datachannel
+        if datachannel is None or not datachannel.is_open():
+            return self.level
+        if datachannel is not self._datachannel:
+            # New data channel after a reconnect starts with everything on
+            self._inbound_bytes = None
+            self._decode_dropped = 0
+            self._stream_dropped = 0
+            if self._datachannel is not None:
+                for step in self.applied_steps:
+                    await self._apply(step, True)
+            self._datachannel = datachannel
+
+        state = self.classify(self.sample())
+        if state > 0:
+            self._congested += 1
+            self._clear = 0
+        elif state < 0:
+            self._clear += 1
+            self._congested = 0
+        else:
+            self._congested = 0
+            self._clear = 0
+
+        policy = self.policy
+        now = time.monotonic()
+        if self.level == 0 and self.flaps and now - self._last_change > self.FLAP_WINDOW:
+            self.flaps = 0
+        if now - self._last_change < policy.min_dwell:
+            return self.level
+
+        if self._congested >= policy.step_down_after and self.level < len(policy.steps):
+            if now - self._last_step_up < self.FLAP_WINDOW:
+                self.flaps += 1
+            await self._step_down()
+        elif self._clear >= policy.step_up_after << min(self.flaps, 4) and self.level > 0:
+            await self._step_up()
+            self._last_step_up = now
+        return self.level
+
+    async def _step_down(self) -> None:
+        step = self.policy.steps[self.level]
+        self.level += 1
+        self.step_downs += 1
+        logging.warning(f"Link congested {self.last_sample}, degrading: {step}")
+        await self._changed(step, True)
+
+    async def _step_up(self) -> None:
+        self.level -= 1
+        step = self.policy.steps[self.level]
+        self.step_ups += 1
+        logging.info(f"Bandwidth headroom back, restoring: {step}")
+        await self._changed(step, False)
+
+    async def _changed(self, step: str, degraded: bool) -> None:
+        self._congested = 0
+        self._clear = 0
+        self._last_change = time.monotonic()
+        await self._apply(step, degraded)
+        if self.on_change is not None:
+            try:
+                self.on_change(self.level, step, degraded)
+            except Exception as e:
+                logging.error(f"Error in bandwidth governor callback: {e}")
+
+    async def _apply(self, step: str, degraded: bool) -> None:
+        """Switch one stream to its degraded or normal state."""
+        datachannel = self.conn.datachannel
+        if datachannel is None or not datachannel.is_open():
+            return
+        try:
+            if step == "video":
+                datachannel.switchVideoChannel(not degraded)
+            elif step == "traffic_saving":
+                await datachannel.disableTrafficSaving(not degraded)
+            elif step == "lidar":
+                datachannel.pub_sub.publish_without_callback(
+                    RTC_TOPIC["ULIDAR_SWITCH"], "off" if degraded else "on")
+        except Exception as e:
+            logging.error(f"Failed to switch {step}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the governor state.
+
+        Returns:
+            Dict[str, Any]: level, applied_steps, step_downs, step_ups,
+            flaps and the last sample
+        """
+        return {
+            "level": self.level,
+            "applied_steps": list(self.applied_steps),
+            "step_downs": self.step_downs,
+            "step_ups": self.step_ups,
+            "flaps": self.flaps,
+            "last_sample": dict(self.last_sample),
+        }
+
+    async def __aenter__(self) -> "BandwidthGovernor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
@@ -0,0 +1,212 @@
+"""
+LiDAR Decode Executor
+
+This module moves LiDAR voxel decoding off the asyncio event loop. Compressed
+frames are handed to a thread or process pool, each worker owning its own
+decoder instance, and the decoded messages are delivered back on the event
+loop strictly in arrival order.
+
+When decoding falls behind, the executor keeps at most ``max_pending`` frames
+in flight and drops the oldest undelivered frame to make room for a new one,
+so the data channel never accumulates a backlog of stale point clouds.
+
+Decoded frames always own their arrays: a worker decodes the next frame
+before the previous one is delivered, so ``zero_copy`` is ignored here.
+
+Example:
+    >>> executor = LidarDecodeExecutor("libvoxel", executor="process", max_workers=2)
+    >>> executor.submit(header, compressed_data, pub_sub.run_resolve)
+    >>> ...
+    >>> executor.shutdown()
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .lidar_decoder_unified import UnifiedLidarDecoder
+
+
+# Per-worker decoder storage. Thread pool workers each get their own slot; a
+# process pool worker runs tasks on its main thread, so this works for both.
+_worker_state = threading.local()
+
+
+def _init_worker(decoder_type: str, decoder_options: Dict[str, Any]) -> None:
+    """Create the decoder owned by the current worker.
+
+    zero_copy is dropped: a view of the worker's buffers would be overwritten
+    by the next frame before the previous one is delivered.
+    """
+    options = {key: value for key, value in decoder_options.items() if key != "zero_copy"}
+    _worker_state.decoder = UnifiedLidarDecoder(decoder_type, **options)
+
+
+def _decode_in_worker(compressed_data: bytes, metadata: Dict[str, Any]) -> Tuple[Any, float]:
+    """Decode one frame with the decoder owned by the current worker.
+
+    Returns the decoded frame and the time spent decoding it in seconds.
+    """
+    start = time.perf_counter()
+    decoded = _worker_state.decoder.decode(compressed_data, metadata)
+    return decoded, time.perf_counter() - start
+
+
+class _PendingFrame:
+    """A frame submitted for decoding that has not been delivered yet."""
+
+    __slots__ = ("message", "future", "on_decoded")
+
+    def __init__(self, message: Dict[str, Any], future: asyncio.Future,
+                 on_decoded: Callable[[Dict[str, Any]], None]) -> None:
+        self.message = message
+        self.future = future
+        self.on_decoded = on_decoded
+
+
+class LidarDecodeExecutor:
+    """
+    Decodes LiDAR frames in a worker pool and delivers them in order.
+
+    Attributes:
+        decoder_type: Decoder used by the workers ("libvoxel" or "native")
+        decoder_options: Extra keyword arguments of each worker's decoder
+        executor_type: Kind of pool ("thread" or "process")
+        max_workers: Number of pool workers
+        max_pending: Maximum number of undelivered frames, None for unbounded
+        dropped_frames: Number of frames dropped because decoding fell behind
+        failed_frames: Number of frames whose decoding raised an error
+        on_decode_time: Optional callback receiving (topic, seconds) for every
+            delivered frame, with the time measured inside the worker
+    """
+
+    def __init__(self, decoder_type: str = "libvoxel", executor: str = "thread",
+                 max_workers: int = 1, max_pending: Optional[int] = 2,
+                 decoder_options: Optional[Dict[str, Any]] = None,
+                 on_decode_time: Optional[Callable[[str, float], None]] = None) -> None:
+        """
+        Initialize the decode executor.
+
+        Args:
+            decoder_type: Decoder used by the workers ("libvoxel" or "native")
+            executor: "thread" for a thread pool or "process" for a process pool
+            max_workers: Number of pool workers
+            max_pending: Maximum number of frames decoding or waiting for delivery.
+                When exceeded the oldest undelivered frame is dropped. None
+                disables dropping.
+            decoder_options: Extra keyword arguments for each worker's decoder;
+                zero_copy is ignored, delivered frames always own their arrays
+            on_decode_time: Optional callback receiving (topic, seconds) for
+                each delivered frame
+
+        Raises:
+            ValueError: If executor is not "thread" or "process", or max_pending < 1
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError("Invalid executor type. Choose 'thread' or 'process'.")
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be at least 1 or None")
+
+        self.decoder_type = decoder_type
+        self.decoder_options = dict(decoder_options or {})
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.dropped_frames = 0
+        self.failed_frames = 0
+        self.on_decode_time = on_decode_time
+
+        initargs = (decoder_type, self.decoder_options)
+        if executor == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                            initargs=initargs)
+        else:
+            # Forking a process that already runs wasmtime and event loop threads
+            # can deadlock the child, so workers are always spawned fresh
+            self._pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                             initargs=initargs,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._pending: Deque[_PendingFrame] = deque()
+        self._drain_task: Optional[asyncio.Task] = None
+
+    def submit(self, message: Dict[str, Any], compressed_data: bytes,
+               on_decoded: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Queue a frame for decoding.
+
+        The decoded payload is stored in ``message['data']['data']`` and the
+        message is passed to ``on_decoded`` on the event loop, in the same order
+        frames were submitted.
+
+        Args:
+            message: Parsed JSON header of the frame; ``message['data']`` holds
+                the decoder metadata
+            compressed_data: Compressed voxel payload
+            on_decoded: Callback receiving the completed message
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(self._pool, _decode_in_worker,
+                                      compressed_data, message["data"])
+        self._pending.append(_PendingFrame(message, future, on_decoded))
+
+        # Drop the oldest undelivered frames when decoding falls behind
+        while self.max_pending is not None and len(self._pending) > self.max_pending:
+            dropped = self._pending.popleft()
+            dropped.future.cancel()
+            self.dropped_frames += 1
+            logging.debug(f"LiDAR decoder behind, dropped frame ({self.dropped_frames} total)")
+
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        """Deliver decoded frames in submission order until none are pending."""
+        while self._pending:
+            frame = self._pending[0]
+            await asyncio.wait([frame.future])
+
+            # The frame may have been dropped while it was decoding
+            if not self._pending or self._pending[0] is not frame:
+                continue
+            self._pending.popleft()
+
+            if frame.future.cancelled():
+                continue
+            error = frame.future.exception()
+            if error is not None:
+                self.failed_frames += 1
+                logging.error(f"Error decoding LiDAR frame: {error}")
+                continue
+
+            decoded, decode_time = frame.future.result()
+            frame.message["data"]["data"] = decoded
+            if self.on_decode_time is not None:
+                self.on_decode_time(frame.message.get("topic"), decode_time)
+            try:
+                frame.on_decoded(frame.message)
+            except Exception as e:
+                logging.error(f"Error delivering decoded LiDAR frame: {e}")
+
+    def pending_count(self) -> int:
+        """
+        Get the number of frames that are decoding or waiting for delivery.
+
+        Returns:
+            int: Number of undelivered frames
+        """
+        return len(self._pending)
+
+    def shutdown(self) -> None:
+        """Drop all undelivered frames and stop the worker pool."""
+        for frame in self._pending:
+            frame.future.cancel()
+        self._pending.clear()
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        self._pool.shutdown(wait=False)
@@ -31,6 +31,8 @@ The LibVoxel decoder offers advanced features:
 - Comprehensive mesh generation (vertices, UVs, indices)
 - Advanced decompression and voxel-to-mesh conversion
 - Memory-efficient processing with pre-allocated buffers
+- Bulk (memcpy/memmove) transfers between Python and WebAssembly memory
+- Optional zero-copy NumPy views onto the output buffers
 - Support for complex 3D reconstruction algorithms
 
 Key Components:
@@ -70,6 +72,9 @@ Usage Example:
 Performance Considerations:
 - WebAssembly provides near-native performance
 - Pre-allocated memory buffers reduce allocation overhead
+- Input data and the copy_memory_region callback use bulk memory copies
+- With zero_copy=True the returned arrays are views into WebAssembly memory
+  and are only valid until the next decode() call
 - Optimized for large-scale point cloud processing
 - Memory-efficient handling of mesh data
 
@@ -85,6 +90,7 @@ Version: 1.0
 
 import math
 import ctypes
+import logging
 import numpy as np
 import os
 from typing import Dict, Any, List, Union
@@ -140,7 +146,7 @@ class LidarDecoder:
         ```
     """
     
-    def __init__(self) -> None:
+    def __init__(self, zero_copy: bool = False) -> None:
         """
         Initialize the LibVoxel WebAssembly decoder
         
@@ -148,6 +154,12 @@ class LidarDecoder:
         and initializes memory buffers for processing. It creates callback functions
         for memory management and sets up typed arrays for efficient data access.
         
+        Args:
+            zero_copy (bool): If True, decode() returns NumPy views onto the
+                WebAssembly output buffers instead of copies. The views are
+                read-only and overwritten by the next decode() call, so consumers that keep
+                frames must copy them. Default: False
+        
         The initialization process:
         1. Configures WebAssembly engine with multi-value support
         2. Loads libvoxel.wasm module from the same directory
@@ -197,20 +209,12 @@ class LidarDecoder:
         self.free = self.instance.exports(self.store)["g"]      # Memory deallocation
         self.wasm_memory = self.instance.exports(self.store)["c"]  # Memory object
 
-        # Map WebAssembly memory to Python
-        self.buffer = self.wasm_memory.data_ptr(self.store)
-        self.memory_size = self.wasm_memory.data_len(self.store)
-        self.buffer_ptr = int.from_bytes(self.buffer, "little")
+        self.zero_copy = zero_copy
 
-        # Create typed arrays for efficient memory access
-        self.HEAP8 = (ctypes.c_int8 * self.memory_size).from_address(self.buffer_ptr)
-        self.HEAP16 = (ctypes.c_int16 * (self.memory_size // 2)).from_address(self.buffer_ptr)
-        self.HEAP32 = (ctypes.c_int32 * (self.memory_size // 4)).from_address(self.buffer_ptr)
-        self.HEAPU8 = (ctypes.c_uint8 * self.memory_size).from_address(self.buffer_ptr)
-        self.HEAPU16 = (ctypes.c_uint16 * (self.memory_size // 2)).from_address(self.buffer_ptr)
-        self.HEAPU32 = (ctypes.c_uint32 * (self.memory_size // 4)).from_address(self.buffer_ptr)
-        self.HEAPF32 = (ctypes.c_float * (self.memory_size // 4)).from_address(self.buffer_ptr)
-        self.HEAPF64 = (ctypes.c_double * (self.memory_size // 8)).from_address(self.buffer_ptr)
+        # Map WebAssembly memory to Python
+        self.memory_size = 0
+        self.buffer_ptr = 0
+        self.update_memory_views()
 
         # Allocate memory buffers for processing
         self.input = self.malloc(self.store, 61440)              # 60KB input buffer
@@ -223,24 +227,78 @@ class LidarDecoder:
         self.pointCount = self.malloc(self.store, 4)             # 4B point count storage
         self.decompressBufferSize = 80000
 
+    def update_memory_views(self) -> bool:
+        """
+        (Re)map the typed heap views onto WebAssembly linear memory
+        
+        The HEAP* ctypes arrays are bound to the base address and length of the
+        linear memory at the time they are created. Growing the memory may move
+        it and always changes its length, which leaves previously created views
+        stale. This method compares the current base address and length with the
+        cached ones and rebuilds every view when they differ.
+        
+        Returns:
+            bool: True if the views were rebuilt, False if they were up to date
+            
+        Note:
+            This is called automatically before every decode and from the memory
+            callbacks, so it rarely needs to be called directly.
+        """
+        buffer = self.wasm_memory.data_ptr(self.store)
+        memory_size = self.wasm_memory.data_len(self.store)
+        buffer_ptr = ctypes.cast(buffer, ctypes.c_void_p).value or 0
+
+        if buffer_ptr == self.buffer_ptr and memory_size == self.memory_size:
+            return False
+
+        self.buffer = buffer
+        self.memory_size = memory_size
+        self.buffer_ptr = buffer_ptr
+
+        # Create typed arrays for efficient memory access
+        self.HEAP8 = (ctypes.c_int8 * self.memory_size).from_address(self.buffer_ptr)
+        self.HEAP16 = (ctypes.c_int16 * (self.memory_size // 2)).from_address(self.buffer_ptr)
+        self.HEAP32 = (ctypes.c_int32 * (self.memory_size // 4)).from_address(self.buffer_ptr)
+        self.HEAPU8 = (ctypes.c_uint8 * self.memory_size).from_address(self.buffer_ptr)
+        self.HEAPU16 = (ctypes.c_uint16 * (self.memory_size // 2)).from_address(self.buffer_ptr)
+        self.HEAPU32 = (ctypes.c_uint32 * (self.memory_size // 4)).from_address(self.buffer_ptr)
+        self.HEAPF32 = (ctypes.c_float * (self.memory_size // 4)).from_address(self.buffer_ptr)
+        self.HEAPF64 = (ctypes.c_double * (self.memory_size // 8)).from_address(self.buffer_ptr)
+
+        # Flat byte view used for bulk copies in and out of the heap
+        self.heap = memoryview(self.HEAPU8).cast("B")
+        return True
+
     def adjust_memory_size(self, t: int) -> int:
         """
         Callback function for WebAssembly memory size adjustment
         
-        This callback is called by the WebAssembly module when it needs to
-        query the current memory size. It returns the size of the HEAPU8 array.
+        This callback is called by the WebAssembly module when it needs more
+        linear memory than is currently available. It grows the memory to hold
+        at least the requested number of bytes and re-maps the HEAP views.
         
         Args:
-            t (int): Parameter from WebAssembly (unused)
+            t (int): Requested memory size in bytes
             
         Returns:
-            int: Current memory size in bytes
+            int: Current memory size in bytes on success, 0 if the memory
+                could not be grown
             
         Note:
             This is a callback function used by the WebAssembly runtime.
             It should not be called directly from Python code.
         """
-        return len(self.HEAPU8)
+        self.update_memory_views()
+        if t > self.memory_size:
+            page_size = 65536
+            pages = (t - self.memory_size + page_size - 1) // page_size
+            try:
+                self.wasm_memory.grow(self.store, pages)
+            except Exception as e:
+                logging.error(f"Failed to grow WebAssembly memory to {t} bytes: {e}")
+                return 0
+            self.update_memory_views()
+        return self.memory_size
 
     def copy_within(self, target: int, start: int, end: int) -> None:
         """
@@ -265,15 +323,16 @@ class LidarDecoder:
             
         Note:
             This method operates on the WebAssembly heap memory directly.
-            All addresses are byte offsets within the heap.
+            All addresses are byte offsets within the heap. Overlapping regions
+            are handled like memmove; bytes past the end of the heap are dropped.
         """
-        # Copy the sublist for the specified range [start:end]
-        sublist = self.HEAPU8[start:end]
+        self.update_memory_views()
+        end = min(end, self.memory_size)
+        length = min(end - start, self.memory_size - target)
+        if start < 0 or target < 0 or length <= 0:
+            return
 
-        # Replace elements in the list starting from index 'target'
-        for i in range(len(sublist)):
-            if target + i < len(self.HEAPU8):
-                self.HEAPU8[target + i] = sublist[i]
+        ctypes.memmove(self.buffer_ptr + target, self.buffer_ptr + start, length)
     
     def copy_memory_region(self, t: int, n: int, a: int) -> None:
         """
@@ -371,14 +430,36 @@ class LidarDecoder:
             
         Note:
             This method performs bounds checking to ensure the data fits
-            within the available WebAssembly memory.
+            within the available WebAssembly memory. The data is written with
+            a single bulk copy, so any bytes-like object is accepted.
         """
-        if start + len(value) <= len(self.HEAPU8):
-            for i, byte in enumerate(value):
-                self.HEAPU8[start + i] = byte
+        if start + len(value) <= self.memory_size:
+            self.heap[start:start + len(value)] = value
         else:
             raise ValueError("Not enough space to insert bytes at the specified index.")
 
+    def heap_array(self, start: int, count: int, dtype: Any = np.uint8) -> np.ndarray:
+        """
+        Get a NumPy array backed by WebAssembly memory
+        
+        Args:
+            start (int): Byte offset of the first element within the heap
+            count (int): Number of elements of the given dtype
+            dtype: NumPy dtype of the elements. Default: np.uint8
+            
+        Returns:
+            np.ndarray: Array of the requested type sharing memory with the heap
+                (a read-only view when zero_copy is enabled, otherwise an owned copy)
+            
+        Note:
+            Views are invalidated by the next decode() and by memory growth.
+        """
+        view = np.frombuffer(self.heap, dtype=dtype, count=count, offset=start)
+        if not self.zero_copy:
+            return view.copy()
+        view.flags.writeable = False
+        return view
+
     def decode(self, compressed_data: bytes, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Decode compressed LiDAR voxel data to mesh representation
@@ -400,6 +481,9 @@ class LidarDecoder:
                 - positions (np.ndarray): Vertex positions as uint8 array
                 - uvs (np.ndarray): Texture coordinates as uint8 array
                 - indices (np.ndarray): Face indices as uint32 array
+            
+            When the decoder was created with zero_copy=True the arrays are
+            read-only views into WebAssembly memory that the next call reuses.
                 
         Raises:
             ValueError: If input data is invalid or processing fails
@@ -434,7 +518,7 @@ class LidarDecoder:
         2. Calculate z-offset from origin and resolution
         3. Call WebAssembly generate function with all parameters
         4. Extract processing results (counts and arrays)
-        5. Copy mesh data from WebAssembly to Python arrays
+        5. Copy (or view) mesh data from WebAssembly as NumPy arrays
         6. Return structured mesh data
         
         Note:
@@ -443,6 +527,9 @@ class LidarDecoder:
             The returned arrays are in raw byte format and may need further
             processing for specific applications.
         """
+        # Make sure the heap views still match the WebAssembly memory
+        self.update_memory_views()
+
         # Copy compressed data to WebAssembly input buffer
         self.add_value_arr(self.input, compressed_data)
 
@@ -470,18 +557,13 @@ class LidarDecoder:
         c = self.get_value(self.pointCount, "i32")    # Point count
         u = self.get_value(self.faceCount, "i32")     # Face count
 
-        # Copy mesh data from WebAssembly to Python arrays
-        positions_slice = self.HEAPU8[self.positions:self.positions + u * 12]
-        positions_copy = bytearray(positions_slice)
-        p = np.frombuffer(positions_copy, dtype=np.uint8)
-
-        uvs_slice = self.HEAPU8[self.uvs:self.uvs + u * 8]
-        uvs_copy = bytearray(uvs_slice)
-        r = np.frombuffer(uvs_copy, dtype=np.uint8)
+        # The generate call may have grown the memory through the callbacks
+        self.update_memory_views()
 
-        indices_slice = self.HEAPU8[self.indices:self.indices + u * 24]
-        indices_copy = bytearray(indices_slice)
-        o = np.frombuffer(indices_copy, dtype=np.uint32)
+        # Copy (or view) mesh data from WebAssembly as NumPy arrays
+        p = self.heap_array(self.positions, u * 12, np.uint8)
+        r = self.heap_array(self.uvs, u * 8, np.uint8)
+        o = self.heap_array(self.indices, u * 6, np.uint32)
 
         return {
             "point_count": c,
@@ -32,6 +32,20 @@ The native decoder is a pure Python implementation that:
 - Applies coordinate transformations and scaling
 - Provides efficient point cloud processing
 
+Two interchangeable kernels expand the bit grid into points:
+- "numba": JIT-compiled loop over the occupied bytes, used when numba is
+  installed (``pip install numba``)
+- "numpy": vectorized ``np.unpackbits`` / ``np.nonzero`` with index
+  arithmetic, used automatically without numba (e.g. on ARM images where
+  numba is hard to install)
+
+Both produce identical float32 points in the same order. ``LidarDecoder``
+reuses one point array across frames; pass ``zero_copy=True`` to get views of
+it instead of copies. A ``VoxelROI`` restricts decoding to a box of the grid
+(z slices, y rows, x columns, optional stride) before any voxel is expanded.
+With ``output="grid"`` the decoder returns the packed ``VoxelGrid`` instead,
+with vectorized occupancy lookup, popcount and and/or/xor between frames.
+
 Key Components:
 - LZ4 decompression for compressed voxel data
 - Bit-level parsing of voxel occupancy grid
@@ -68,18 +82,30 @@ Author: Unitree Robotics
 Version: 1.0
 """
 
+import logging
 import numpy as np
 import lz4.block
-from typing import Dict, Any, List, Tuple, Union
-from time import time
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
 
 # Try to import numba for optimization, fall back gracefully if not available
 try:
-    from numba import jit, prange
+    from numba import jit
     NUMBA_AVAILABLE = True
 except ImportError:
     NUMBA_AVAILABLE = False
-    print("Numba not available. Using standard Python implementation.")
+    logging.debug("Numba not available. Using the vectorized NumPy decoder.")
+
+BACKENDS = ("numba", "numpy")
+OUTPUTS = ("points", "grid")
+DEFAULT_BACKEND = "numba" if NUMBA_AVAILABLE else "numpy"
+
+# Grid layout: z slices of 128 rows (y) of 16 bytes, 8 voxels (x) per byte
+SLICE_BYTES = 0x800
+GRID_ROWS = 128
+ROW_BYTES = 16
+GRID_COLUMNS = ROW_BYTES * 8
+
+Bounds = Optional[Tuple[Optional[float], Optional[float]]]
 
 def decompress(compressed_data: bytes, decomp_size: int) -> bytes:
     """
@@ -114,54 +140,344 @@ def decompress(compressed_data: bytes, decomp_size: int) -> bytes:
     return decompressed
 
 
-@jit(nopython=True, cache=True)
-def _bits_to_points_numba(buf_array: np.ndarray) -> np.ndarray:
+class VoxelROI:
+    """
+    Region of interest of the voxel grid, applied before voxels are expanded.
+    
+    The grid is stored z-major (0x800 bytes per slice, 16 bytes per y row),
+    so a z range selects whole slices, a y range selects rows within them
+    and an x range selects byte columns; bytes outside the region are never
+    read. Decode time then scales with the region instead of the full map.
+    
+    Args:
+        x: (min, max) along x, None for the whole axis
+        y: (min, max) along y, None for the whole axis
+        z: (min, max) along z, None for the whole axis
+        stride: Keep every stride-th voxel along each axis, counted from the
+            lower bound of the region
+        metric: Bounds are world coordinates in meters, inclusive on both
+            ends like PointCloudAccumulator.height_filter; they are mapped to
+            voxels per frame because the origin moves with the robot. When
+            False, bounds are voxel indices with a half-open [min, max) range
+            like range(). Either end may be None.
+    
+    Raises:
+        ValueError: If stride is not a positive integer, a bound is not a
+            (min, max) pair, or voxel bounds are not integers
+    
+    Example:
+        ```python
+        # Obstacles between 0.2 m and 1 m height within 2 m left and right
+        roi = VoxelROI(y=(-2.0, 2.0), z=(0.2, 1.0), metric=True)
+        points = bits_to_points(voxel_data, origin, 0.05, roi=roi)
+        
+        # Every second voxel of the lower 20 slices
+        roi = VoxelROI(z=(0, 20), stride=2)
+        ```
+    """
+    
+    def __init__(self, x: Bounds = None, y: Bounds = None, z: Bounds = None,
+                 stride: int = 1, metric: bool = False) -> None:
+        """Validate and store the region."""
+        if not isinstance(stride, (int, np.integer)) or stride < 1:
+            raise ValueError("stride must be a positive integer")
+        for name, bounds in (("x", x), ("y", y), ("z", z)):
+            if bounds is None:
+                continue
+            if len(bounds) != 2:
+                raise ValueError(f"{name} must be a (min, max) pair or None")
+            if not metric and any(bound is not None and not isinstance(bound, (int, np.integer))
+                                  for bound in bounds):
+                raise ValueError(f"{name} bounds must be voxel indices (int) unless metric=True")
+        self.x = tuple(x) if x is not None else None
+        self.y = tuple(y) if y is not None else None
+        self.z = tuple(z) if z is not None else None
+        self.stride = int(stride)
+        self.metric = metric
+    
+    def resolve(self, origin: Sequence[float], resolution: float,
+                slices: int) -> Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]:
+        """
+        Map the region to voxel index ranges of one frame.
+        
+        Args:
+            origin: Frame origin [x, y, z] in meters
+            resolution: Voxel resolution in meters per voxel
+            slices: Number of z slices in the frame
+            
+        Returns:
+            Tuple: Half-open (start, stop) voxel ranges for x, y and z,
+            clipped to the grid; start == stop for an empty range
+        """
+        sizes = (GRID_COLUMNS, GRID_ROWS, slices)
+        ranges = []
+        for axis, (bounds, size) in enumerate(zip((self.x, self.y, self.z), sizes)):
+            if bounds is None:
+                start, stop = 0, size
+            elif self.metric:
+                start, stop = _metric_range(bounds, origin[axis], resolution, size)
+            else:
+                start = 0 if bounds[0] is None else min(max(bounds[0], 0), size)
+                stop = size if bounds[1] is None else min(max(bounds[1], 0), size)
+            ranges.append((start, max(start, stop)))
+        return tuple(ranges)
+    
+    def __repr__(self) -> str:
+        return (f"VoxelROI(x={self.x}, y={self.y}, z={self.z}, stride={self.stride}, "
+                f"metric={self.metric})")
+
+
+def _metric_range(bounds: Tuple[Optional[float], Optional[float]], origin: float,
+                  resolution: float, size: int) -> Tuple[int, int]:
+    """Voxel range whose float32 coordinates lie within inclusive metric bounds."""
+    # Same float32 arithmetic as the decoded points, so the region selects
+    # exactly the points a filter on the decoded cloud would keep
+    coords = np.arange(size, dtype=np.float32)
+    coords *= np.float32(resolution)
+    coords += np.float32(origin)
+    low, high = bounds
+    start = 0 if low is None else int(np.searchsorted(coords, np.float32(low), "left"))
+    stop = size if high is None else int(np.searchsorted(coords, np.float32(high), "right"))
+    return start, stop
+
+
+def _column_mask(x_range: Tuple[int, int], stride: int) -> np.ndarray:
+    """Per byte column, the bits (MSB = lowest x) of the voxels kept along x."""
+    x = np.arange(GRID_COLUMNS)
+    keep = (x >= x_range[0]) & (x < x_range[1]) & ((x - x_range[0]) % stride == 0)
+    return np.packbits(keep)
+
+
+def _grid_view(buf_array: np.ndarray) -> np.ndarray:
+    """View a decompressed buffer as (slices, rows, row bytes); pads a partial last slice."""
+    remainder = len(buf_array) % SLICE_BYTES
+    if remainder:
+        buf_array = np.concatenate([buf_array, np.zeros(SLICE_BYTES - remainder, np.uint8)])
+    return buf_array.reshape(-1, GRID_ROWS, ROW_BYTES)
+
+
+def _bits_to_points_numpy(buf_array: np.ndarray) -> np.ndarray:
     """
-    Numba-optimized version of bits_to_points core logic.
+    Vectorized NumPy version of bits_to_points core logic.
     
-    This function processes the bit-packed voxel data using Numba JIT compilation
-    for significant performance improvements.
+    Only occupied bytes are unpacked: their bits are expanded with
+    np.unpackbits (MSB first, matching the bit order of the grid) and the
+    voxel indices are computed from the byte index with shifts and masks.
     
     Args:
         buf_array: numpy array of uint8 values representing voxel occupancy
         
     Returns:
-        numpy array of 3D points as (x, y, z) coordinates
+        numpy array of voxel indices as (x, y, z) int32 coordinates
+    """
+    occupied = np.flatnonzero(buf_array).astype(np.int32)
+    # Bit k of the unpacked occupied bytes is bit (k & 7) of byte (k >> 3)
+    bits = np.flatnonzero(np.unpackbits(buf_array[occupied])).astype(np.int32)
+    n = occupied[bits >> 3]
+
+    points = np.empty((len(n), 3), dtype=np.int32)
+    points[:, 0] = ((n & 0xF) << 3) | (bits & 7)  # x: byte column * 8 + bit
+    points[:, 1] = (n >> 4) & 0x7F                # y: row within the slice
+    points[:, 2] = n >> 11                        # z: slice (0x800 bytes)
+    return points
+
+
+def _roi_to_points_numpy(grid: np.ndarray, ranges: Tuple[Tuple[int, int], ...],
+                         stride: int) -> np.ndarray:
     """
-    # Pre-allocate arrays for better performance
-    max_points = len(buf_array) * 8  # Maximum possible points
-    points_x = np.empty(max_points, dtype=np.int32)
-    points_y = np.empty(max_points, dtype=np.int32)
-    points_z = np.empty(max_points, dtype=np.int32)
-    
-    point_count = 0
-    
-    for n in range(len(buf_array)):
-        byte_value = buf_array[n]
-        if byte_value == 0:
-            continue  # Skip empty bytes
+    Vectorized NumPy expansion of the voxels of a region.
+    
+    Args:
+        grid: (slices, rows, row bytes) view of the voxel grid
+        ranges: Voxel ranges for x, y and z from VoxelROI.resolve()
+        stride: Voxel stride along each axis
+        
+    Returns:
+        numpy array of voxel indices as (x, y, z) int32 coordinates
+    """
+    (x0, x1), (y0, y1), (z0, z1) = ranges
+    c0, c1 = x0 >> 3, (x1 + 7) >> 3
+    if x0 == x1 or y0 == y1 or z0 == z1:
+        return np.empty((0, 3), dtype=np.int32)
+    # Crop whole slices and rows by slicing, then mask the edge bits of the
+    # byte columns; only the cropped bytes are touched from here on
+    region = grid[z0:z1:stride, y0:y1:stride, c0:c1] & _column_mask((x0, x1), stride)[c0:c1]
+    columns = c1 - c0
+    rows = region.shape[1]
+
+    occupied = np.flatnonzero(region).astype(np.int32)
+    bits = np.flatnonzero(np.unpackbits(region.reshape(-1)[occupied])).astype(np.int32)
+    n = occupied[bits >> 3]
+    row = n // columns
+
+    points = np.empty((len(n), 3), dtype=np.int32)
+    points[:, 0] = ((n - row * columns + c0) << 3) | (bits & 7)
+    points[:, 1] = (row % rows) * stride + y0
+    points[:, 2] = (row // rows) * stride + z0
+    return points
+
+
+if NUMBA_AVAILABLE:
+    @jit(nopython=True, cache=True)
+    def _expand_points_numba(buf_array: np.ndarray, out: np.ndarray, origin: np.ndarray,
+                             resolution: np.float32) -> int:
+        """
+        Numba-optimized bits_to_points core logic writing into a caller buffer.
+        
+        Expands the occupied voxels and applies the resolution and origin in
+        one pass, in float32, without any scratch arrays. Points beyond the
+        capacity of out are counted but not written, so a caller can size the
+        buffer from the returned count and call again.
+        
+        Args:
+            buf_array: numpy array of uint8 values representing voxel occupancy
+            out: float32 array of shape (capacity, 3) receiving the points
+            origin: float32 array [x, y, z]
+            resolution: Voxel resolution as float32
             
-        z = n // 0x800
-        n_slice = n % 0x800
-        y = n_slice // 0x10
-        x_base = (n_slice % 0x10) * 8
-
-        for bit_pos in range(8):
-            if byte_value & (1 << (7 - bit_pos)):
-                x = x_base + bit_pos
-                points_x[point_count] = x
-                points_y[point_count] = y
-                points_z[point_count] = z
-                point_count += 1
-    
-    # Return only the valid points
-    if point_count > 0:
-        return np.column_stack((points_x[:point_count], points_y[:point_count], points_z[:point_count]))
+        Returns:
+            Number of occupied voxels in buf_array
+        """
+        capacity = out.shape[0]
+        ox = origin[0]
+        oy = origin[1]
+        oz = origin[2]
+        point_count = 0
+        
+        for n in range(len(buf_array)):
+            byte_value = buf_array[n]
+            if byte_value == 0:
+                continue  # Skip empty bytes
+                
+            z = np.float32(n >> 11) * resolution + oz
+            y = np.float32((n >> 4) & 0x7F) * resolution + oy
+            x_base = (n & 0xF) << 3
+
+            for bit_pos in range(8):
+                if byte_value & (0x80 >> bit_pos):
+                    if point_count < capacity:
+                        out[point_count, 0] = np.float32(x_base + bit_pos) * resolution + ox
+                        out[point_count, 1] = y
+                        out[point_count, 2] = z
+                    point_count += 1
+        
+        return point_count
+
+    @jit(nopython=True, cache=True)
+    def _expand_roi_numba(grid: np.ndarray, out: np.ndarray, ranges: np.ndarray,
+                          stride: int, column_mask: np.ndarray, origin: np.ndarray,
+                          resolution: np.float32) -> int:
+        """
+        Numba-optimized expansion of the voxels of a region into a caller buffer.
+        
+        Same contract as _expand_points_numba, but only the bytes inside
+        ranges (x0, x1, y0, y1, z0, z1) are read.
+        """
+        capacity = out.shape[0]
+        ox = origin[0]
+        oy = origin[1]
+        oz = origin[2]
+        c0 = ranges[0] >> 3
+        c1 = (ranges[1] + 7) >> 3
+        point_count = 0
+        
+        for z in range(ranges[4], ranges[5], stride):
+            zf = np.float32(z) * resolution + oz
+            for y in range(ranges[2], ranges[3], stride):
+                yf = np.float32(y) * resolution + oy
+                for c in range(c0, c1):
+                    byte_value = grid[z, y, c] & column_mask[c]
+                    if byte_value == 0:
+                        continue
+                    for bit_pos in range(8):
+                        if byte_value & (0x80 >> bit_pos):
+                            if point_count < capacity:
+                                out[point_count, 0] = np.float32((c << 3) + bit_pos) * resolution + ox
+                                out[point_count, 1] = yf
+                                out[point_count, 2] = zf
+                            point_count += 1
+        
+        return point_count
+
+
+# Bits set in each byte value; np.bitwise_count needs NumPy 2.0
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def _count_voxels(bits: np.ndarray, ranges: Optional[Tuple[Tuple[int, int], ...]] = None,
+                  stride: int = 1) -> int:
+    """Count the occupied voxels of a buffer, or of a region of its (slices, rows, row bytes) view."""
+    if ranges is not None:
+        (x0, x1), (y0, y1), (z0, z1) = ranges
+        if x0 == x1 or y0 == y1 or z0 == z1:
+            return 0
+        c0, c1 = x0 >> 3, (x1 + 7) >> 3
+        bits = bits[z0:z1:stride, y0:y1:stride, c0:c1] & _column_mask((x0, x1), stride)[c0:c1]
+    return int(_POPCOUNT[bits].sum(dtype=np.int64))
+
+
+def _as_uint8(buf: Any) -> np.ndarray:
+    """View bytes, bytearray, memoryview or an array as uint8 without copying."""
+    if isinstance(buf, np.ndarray):
+        return buf.view(np.uint8).reshape(-1)
+    return np.frombuffer(buf, dtype=np.uint8)
+
+
+def _expand_points(buf_array: np.ndarray, origin: List[float], resolution: float,
+                   backend: str, arena: Optional[np.ndarray] = None,
+                   roi: Optional[VoxelROI] = None) -> np.ndarray:
+    """
+    Expand a voxel grid into float32 points, reusing arena when it is large enough.
+    
+    Returns:
+        np.ndarray: (N, 3) float32 points; a view of arena if it had room,
+        otherwise a new array (which the caller may keep as the next arena)
+    """
+    resolution32 = np.float32(resolution)
+    origin32 = np.asarray(origin, dtype=np.float32)
+    if roi is not None:
+        grid = _grid_view(buf_array)
+        ranges = roi.resolve(origin, resolution, len(grid))
+
+    if backend == "numba":
+        if roi is None:
+            expand = lambda out: _expand_points_numba(buf_array, out, origin32, resolution32)
+        else:
+            flat_ranges = np.array(ranges, dtype=np.int64).reshape(-1)
+            column_mask = _column_mask(ranges[0], roi.stride)
+            expand = lambda out: _expand_roi_numba(grid, out, flat_ranges, roi.stride,
+                                                   column_mask, origin32, resolution32)
+        if arena is None:
+            # Size the output up front so a one-off expansion is a single pass
+            if roi is None:
+                count = _count_voxels(buf_array)
+            else:
+                count = _count_voxels(grid, ranges, roi.stride)
+            arena = np.empty((count, 3), dtype=np.float32)
+            expand(arena)
+            return arena
+        count = expand(arena)
+        if count > len(arena):
+            arena = np.empty((count, 3), dtype=np.float32)
+            expand(arena)
+        return arena[:count]
+
+    if roi is None:
+        voxels = _bits_to_points_numpy(buf_array)
     else:
-        return np.empty((0, 3), dtype=np.int32)
+        voxels = _roi_to_points_numpy(grid, ranges, roi.stride)
+    count = len(voxels)
+    if arena is None or count > len(arena):
+        arena = np.empty((count, 3), dtype=np.float32)
+    points = arena[:count]
+    points[...] = voxels
+    points *= resolution32
+    points += origin32
+    return points
 
 
-def bits_to_points(buf: bytes, origin: List[float], resolution: float = 0.05) -> np.ndarray:
+def bits_to_points(buf: bytes, origin: List[float], resolution: float = 0.05,
+                   backend: Optional[str] = None, roi: Optional[VoxelROI] = None) -> np.ndarray:
     """
     Convert bit-packed voxel data to 3D point cloud
     
@@ -173,9 +489,17 @@ def bits_to_points(buf: bytes, origin: List[float], resolution: float = 0.05) ->
         buf (bytes): Raw voxel data as bytes where each bit represents voxel occupancy
         origin (List[float]): 3D origin coordinates [x, y, z] in meters
         resolution (float): Voxel resolution in meters per voxel. Default: 0.05 (5cm)
+        backend (Optional[str]): "numba" or "numpy"; None picks numba when
+            it is installed
+        roi (Optional[VoxelROI]): Only expand the voxels inside this region
         
     Returns:
-        np.ndarray: Array of 3D points with shape (N, 3) where N is number of occupied voxels
+        np.ndarray: float32 array of 3D points with shape (N, 3) where N is
+        number of occupied voxels (inside the region)
+        
+    Raises:
+        ValueError: If the backend is unknown or numba is requested but not
+            installed
         
     Example:
         ```python
@@ -199,37 +523,191 @@ def bits_to_points(buf: bytes, origin: List[float], resolution: float = 0.05) ->
         - y = (n % 0x800) // 0x10 (row within slice)
         - x = ((n % 0x800) % 0x10) * 8 + bit_position (column)
     """
-    buf = np.frombuffer(bytearray(buf), dtype=np.uint8)
-    
-    # Use Numba-optimized version if available
-    if NUMBA_AVAILABLE:
-        start_time = time()
-        points = _bits_to_points_numba(buf)
-        end_time = time()
-        #print(f"Time taken (Numba): {end_time - start_time} seconds")
-    else:
-        # Fall back to original implementation
-        nonzero_indices = np.nonzero(buf)[0]
-        points_list = []
-        start_time = time()
-        
-        for n in nonzero_indices:
-            byte_value = buf[n]
-            z = n // 0x800
-            n_slice = n % 0x800
-            y = n_slice // 0x10
-            x_base = (n_slice % 0x10) * 8
+    if backend is None:
+        backend = DEFAULT_BACKEND
+    elif backend not in BACKENDS:
+        raise ValueError(f"Invalid backend '{backend}'. Choose 'numba' or 'numpy'.")
+    elif backend == "numba" and not NUMBA_AVAILABLE:
+        raise ValueError("The numba backend requires numba (pip install numba)")
 
-            for bit_pos in range(8):
-                if byte_value & (1 << (7 - bit_pos)):
-                    x = x_base + bit_pos
-                    points_list.append((x, y, z))
+    return _expand_points(_as_uint8(buf), origin, resolution, backend, roi=roi)
+
+
+class VoxelGrid:
+    """
+    Packed voxel occupancy grid of one LiDAR frame.
+    
+    Keeps the decompressed bitmap as it arrives - 8 voxels per byte, about
+    24x smaller than the (N, 3) float32 points - for occupancy checks,
+    frame differencing and map merging. Points are only expanded on demand.
+    
+    Attributes:
+        bits (np.ndarray): uint8 array of shape (slices, 128, 16): z slice,
+            y row, byte column; bit 7 (MSB) of a byte is its lowest x
+        origin (np.ndarray): float32 world coordinates [x, y, z] of voxel (0, 0, 0)
+        resolution (float): Voxel resolution in meters per voxel
+    
+    Example:
+        ```python
+        decoder = LidarDecoder(output="grid")
+        grid = decoder.decode(compressed_data, metadata)["grid"]
+        print(f"{grid.count()} occupied voxels in a {grid.shape} grid")
+        
+        blocked = grid.occupied_at(footprint_points)   # Metric lookup
+        both = grid & previous_grid                    # Same origin required
+        points = grid.to_points()
+        ```
+    """
+    
+    __slots__ = ("bits", "origin", "resolution")
+    
+    def __init__(self, bits: np.ndarray, origin: Sequence[float], resolution: float) -> None:
+        """
+        Wrap a packed bitmap without copying it.
+        
+        Args:
+            bits: uint8 array of shape (slices, 128, 16)
+            origin: World coordinates [x, y, z] of voxel (0, 0, 0)
+            resolution: Voxel resolution in meters per voxel
+        
+        Raises:
+            ValueError: If bits is not a uint8 array of shape (slices, 128, 16)
+        """
+        if bits.dtype != np.uint8 or bits.ndim != 3 or bits.shape[1:] != (GRID_ROWS, ROW_BYTES):
+            raise ValueError(f"bits must be uint8 with shape (slices, {GRID_ROWS}, {ROW_BYTES})")
+        self.bits = bits
+        self.origin = np.asarray(origin, dtype=np.float32)
+        self.resolution = float(resolution)
+    
+    @classmethod
+    def from_buffer(cls, buf: Any, origin: Sequence[float], resolution: float) -> "VoxelGrid":
+        """
+        Create a grid from decompressed voxel data.
+        
+        Args:
+            buf: Decompressed voxel data (bytes, bytearray or uint8 array)
+            origin: World coordinates [x, y, z] of voxel (0, 0, 0)
+            resolution: Voxel resolution in meters per voxel
+            
+        Returns:
+            VoxelGrid: View of buf (read-only for bytes); a partial last
+            slice is zero-padded, which copies
+        """
+        return cls(_grid_view(_as_uint8(buf)), origin, resolution)
+    
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """Grid size in voxels as (x, y, z)."""
+        return (GRID_COLUMNS, GRID_ROWS, self.bits.shape[0])
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of the packed bitmap in bytes."""
+        return self.bits.nbytes
+    
+    def count(self) -> int:
+        """
+        Count the occupied voxels.
         
-        end_time = time()
-        #print(f"Time taken (Python): {end_time - start_time} seconds")
-        points = np.array(points_list) if points_list else np.empty((0, 3), dtype=np.int32)
+        Returns:
+            int: Number of set bits (the number of points to_points() returns)
+        """
+        bitwise_count = getattr(np, "bitwise_count", None)
+        if bitwise_count is not None:
+            return int(bitwise_count(self.bits).sum(dtype=np.int64))
+        return int(_POPCOUNT[self.bits].sum(dtype=np.int64))
     
-    return points * resolution + origin
+    def occupied(self, x: Any, y: Any, z: Any) -> np.ndarray:
+        """
+        Look up voxels by index.
+        
+        Args:
+            x, y, z: Voxel indices (scalars or broadcastable integer arrays)
+            
+        Returns:
+            np.ndarray: bool array, False for indices outside the grid
+        """
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.int64), np.asarray(y, dtype=np.int64),
+                                      np.asarray(z, dtype=np.int64))
+        size_x, size_y, size_z = self.shape
+        inside = (x >= 0) & (x < size_x) & (y >= 0) & (y < size_y) & (z >= 0) & (z < size_z)
+        result = np.zeros(x.shape, dtype=bool)
+        xi, yi, zi = x[inside], y[inside], z[inside]
+        result[inside] = (self.bits[zi, yi, xi >> 3] & (0x80 >> (xi & 7))) != 0
+        return result
+    
+    def occupied_at(self, points: Any) -> np.ndarray:
+        """
+        Look up the voxels containing world coordinates.
+        
+        Args:
+            points: (N, 3) or (3,) coordinates in meters
+            
+        Returns:
+            np.ndarray: bool array of shape (N,) (or a scalar bool array),
+            False outside the grid
+        """
+        points = np.asarray(points, dtype=np.float64)
+        indices = np.rint((points - self.origin) / self.resolution).astype(np.int64)
+        return self.occupied(indices[..., 0], indices[..., 1], indices[..., 2])
+    
+    def indices(self) -> np.ndarray:
+        """
+        Get the indices of the occupied voxels.
+        
+        Returns:
+            np.ndarray: (N, 3) int32 (x, y, z) voxel indices in decode order
+        """
+        return _bits_to_points_numpy(self.bits.reshape(-1))
+    
+    def to_points(self, backend: Optional[str] = None,
+                  roi: Optional[VoxelROI] = None) -> np.ndarray:
+        """
+        Expand the occupied voxels into points.
+        
+        Args:
+            backend: "numba" or "numpy"; None picks numba when it is installed
+            roi: Only expand the voxels inside this region
+            
+        Returns:
+            np.ndarray: float32 (N, 3) points, identical to bits_to_points()
+        """
+        return bits_to_points(self.bits, self.origin, self.resolution, backend, roi)
+    
+    def _check_compatible(self, other: "VoxelGrid") -> None:
+        if not isinstance(other, VoxelGrid):
+            raise TypeError(f"Expected a VoxelGrid, got {type(other).__name__}")
+        if (self.bits.shape != other.bits.shape or self.resolution != other.resolution
+                or not np.array_equal(self.origin, other.origin)):
+            raise ValueError("Grids must have the same shape, origin and resolution")
+    
+    def _combine(self, other: "VoxelGrid", op: Callable) -> "VoxelGrid":
+        self._check_compatible(other)
+        return VoxelGrid(op(self.bits, other.bits), self.origin, self.resolution)
+    
+    def __and__(self, other: "VoxelGrid") -> "VoxelGrid":
+        """Voxels occupied in both grids."""
+        return self._combine(other, np.bitwise_and)
+    
+    def __or__(self, other: "VoxelGrid") -> "VoxelGrid":
+        """Voxels occupied in either grid."""
+        return self._combine(other, np.bitwise_or)
+    
+    def __xor__(self, other: "VoxelGrid") -> "VoxelGrid":
+        """Voxels occupied in exactly one of the grids."""
+        return self._combine(other, np.bitwise_xor)
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VoxelGrid):
+            return NotImplemented
+        return (self.resolution == other.resolution and np.array_equal(self.origin, other.origin)
+                and np.array_equal(self.bits, other.bits))
+    
+    __hash__ = None  # Mutable contents
+    
+    def __repr__(self) -> str:
+        return (f"VoxelGrid(shape={self.shape}, origin={self.origin.tolist()}, "
+                f"resolution={self.resolution})")
 
 
 class LidarDecoder:
@@ -263,9 +741,58 @@ class LidarDecoder:
         points = result["points"]
         print(f"Decoded {len(points)} points")
         ```
+    
+    Buffer Reuse:
+        The decoder keeps one float32 point array and only grows it (with
+        some slack) when a frame has more points than any before it, so
+        steady-state decoding allocates no point storage. With
+        ``zero_copy=False`` (the default) decode() returns a copy, which is
+        safe to keep; with ``zero_copy=True`` it returns a read-only view
+        that the next decode() overwrites - use it only when each frame is
+        consumed before the next one is decoded.
+    
+    Args:
+        zero_copy (bool): Return views of the reused point array instead of copies
+        backend (Optional[str]): "numba" or "numpy"; None picks numba when
+            it is installed
+        roi (Optional[VoxelROI]): Only decode the voxels inside this region;
+            can be changed between frames through the ``roi`` attribute
+        output (str): "points" for an (N, 3) point cloud, "grid" for the
+            packed VoxelGrid without expanding any voxels
+    
+    Raises:
+        ValueError: If the backend or output is unknown, numba is requested
+            but not installed, or an roi is combined with grid output
     """
     
-    def decode(self, compressed_data: bytes, data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    GROWTH = 1.25  # Slack added when the point array has to grow
+    
+    def __init__(self, zero_copy: bool = False, backend: Optional[str] = None,
+                 roi: Optional[VoxelROI] = None, output: str = "points") -> None:
+        """Initialize the decoder without preallocating; the point array grows on demand."""
+        if output not in OUTPUTS:
+            raise ValueError(f"Invalid output '{output}'. Choose 'points' or 'grid'.")
+        if output == "grid" and roi is not None:
+            raise ValueError("roi applies to points output; pass it to VoxelGrid.to_points()")
+        if backend is None:
+            backend = DEFAULT_BACKEND
+        elif backend not in BACKENDS:
+            raise ValueError(f"Invalid backend '{backend}'. Choose 'numba' or 'numpy'.")
+        elif backend == "numba" and not NUMBA_AVAILABLE:
+            raise ValueError("The numba backend requires numba (pip install numba)")
+        self.zero_copy = zero_copy
+        self.backend = backend
+        self.roi = roi
+        self.output = output
+        self._arena = np.empty((0, 3), dtype=np.float32)
+    
+    @property
+    def capacity(self) -> int:
+        """Number of points the reused point array holds without growing."""
+        return len(self._arena)
+    
+    def decode(self, compressed_data: bytes, data: Dict[str, Any],
+               copy: Optional[bool] = None) -> Dict[str, np.ndarray]:
         """
         Decode compressed LiDAR voxel data to 3D point cloud
         
@@ -278,10 +805,16 @@ class LidarDecoder:
                 - src_size (int): Size of decompressed data in bytes
                 - origin (List[float]): 3D origin coordinates [x, y, z] in meters
                 - resolution (float): Voxel resolution in meters per voxel
+            copy (Optional[bool]): Return a copy of the points; None follows
+                the zero_copy setting of the decoder
                 
         Returns:
             Dict[str, np.ndarray]: Dictionary containing:
-                - points (np.ndarray): 3D point cloud with shape (N, 3)
+                - points (np.ndarray): 3D point cloud with shape (N, 3); a
+                  read-only view of the reused point array unless copied
+                or, with output="grid":
+                - grid (VoxelGrid): Packed occupancy of the frame (a view of
+                  the decompressed data, which is never reused)
                 
         Raises:
             KeyError: If required metadata fields are missing
@@ -313,12 +846,26 @@ class LidarDecoder:
             The returned points are in world coordinates (meters) after applying
             the resolution scaling and origin translation.
         """
-        def points():
-            decompressed = decompress(compressed_data, data["src_size"])
-            points = bits_to_points(decompressed, data["origin"], data["resolution"])
-            return points
+        decompressed = decompress(compressed_data, data["src_size"])
+        if self.output == "grid":
+            return {"grid": VoxelGrid.from_buffer(decompressed, data["origin"], data["resolution"])}
+        points = self._expand(_as_uint8(decompressed), data["origin"], data["resolution"])
+        if copy if copy is not None else not self.zero_copy:
+            points = points.copy()
+        else:
+            points.flags.writeable = False
 
         return {
-            "points": points(),
+            "points": points,
             # "raw": compressed_data,  # Commented out to save memory
         }
+    
+    def _expand(self, buf_array: np.ndarray, origin: List[float], resolution: float) -> np.ndarray:
+        """Expand a decompressed grid into the reused point array, growing it if needed."""
+        points = _expand_points(buf_array, origin, resolution, self.backend, self._arena, self.roi)
+        if points.base is not self._arena:
+            # Too small: keep slack so slowly growing maps don't reallocate every frame
+            self._arena = np.empty((int(len(points) * self.GROWTH) + 1, 3), dtype=np.float32)
+            self._arena[:len(points)] = points
+            points = self._arena[:len(points)]
+        return points
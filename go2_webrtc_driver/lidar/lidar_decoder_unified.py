@@ -46,13 +46,15 @@ class UnifiedLidarDecoder:
         - "native": Pure Python decoder implementation
     """
     
-    def __init__(self, decoder_type="libvoxel"):
+    def __init__(self, decoder_type="libvoxel", **decoder_options):
         """
         Initialize the UnifiedLidarDecoder with the specified decoder type.
 
         Args:
             decoder_type (str): The type of decoder to use. Must be either "libvoxel" 
                               or "native". Defaults to "libvoxel".
+            **decoder_options: Extra keyword arguments passed to the underlying
+                              decoder (e.g. zero_copy=True for "libvoxel").
         
         Raises:
             ValueError: If decoder_type is not "libvoxel" or "native".
@@ -63,12 +65,15 @@ class UnifiedLidarDecoder:
             >>> 
             >>> # Use native decoder
             >>> decoder = UnifiedLidarDecoder(decoder_type="native")
+            >>> 
+            >>> # Return views into WebAssembly memory instead of copies
+            >>> decoder = UnifiedLidarDecoder(decoder_type="libvoxel", zero_copy=True)
         """
         if decoder_type == "libvoxel":
-            self.decoder = LibVoxelDecoder()
+            self.decoder = LibVoxelDecoder(**decoder_options)
             self.decoder_name = "LibVoxelDecoder"
         elif decoder_type == "native":
-            self.decoder = NativeDecoder()
+            self.decoder = NativeDecoder(**decoder_options)
             self.decoder_name = "NativeDecoder"
         else:
             raise ValueError(f"Invalid decoder type '{decoder_type}'. Choose 'libvoxel' or 'native'.")
@@ -0,0 +1,525 @@
+"""
+Raw Data Channel Capture
+
+Records every raw inbound and outbound data channel message to an append-only,
+compressed file, and reads it back. Binary messages are stored exactly as
+received, so LiDAR frames keep their LZ4 voxel payload (a few KB) instead of
+the decoded point cloud (hundreds of KB), and whole sessions can be recorded
+cheaply and decoded later.
+
+File Layout:
+    magic "GO2CAP1\\n", u32 length, JSON file header
+    then a sequence of blocks, each: 4-byte tag, u32 stored length, u32 raw length
+    - "CHNK": compressed batch of records
+    - "INDX": JSON per-topic time index of the preceding CHNK block
+
+    Record (inside a CHNK block):
+        u8 direction (0 = in, 1 = out), u8 kind (0 = text, 1 = binary),
+        f64 monotonic time, f64 robot stamp (NaN if none),
+        u16 topic length, u32 payload length, topic, payload
+
+Blocks are only appended, and a reader stops at the first incomplete block, so
+a capture interrupted by a crash stays readable up to its last complete chunk.
+The index lets a reader select topics and time ranges without decompressing
+unrelated chunks.
+
+Compression:
+- "lz4": default, uses the lz4 package the LiDAR decoder already needs
+- "zstd": smaller files, requires ``pip install zstandard``
+
+Usage:
+    recorder = conn.datachannel.start_capture("session.go2cap")
+    ...
+    conn.datachannel.stop_capture()
+
+    reader = CaptureReader("session.go2cap")
+    for record in reader.read(topics=["rt/utlidar/voxel_map_compressed"]):
+        message = reader.decode(record)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import lz4.block
+
+from . import json_codec
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+CAPTURE_MAGIC = b"GO2CAP1\n"
+CAPTURE_VERSION = 1
+
+_BLOCK_HEADER = struct.Struct("<4sII")
+_RECORD_HEADER = struct.Struct("<BBddHI")
+_LENGTH = struct.Struct("<I")
+
+_CHUNK_TAG = b"CHNK"
+_INDEX_TAG = b"INDX"
+
+DIRECTIONS = ("in", "out")
+
+# Characters of the data object searched for the stamp of an unparsed text message
+STAMP_SCAN_CHARS = 4096
+# A number, or {"sec": <int>, "nanosec": <int>}
+_TEXT_STAMP = re.compile(
+    r'"stamp"\s*:\s*(?:(-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)'
+    r'|\{\s*"sec"\s*:\s*(-?\d+)\s*(?:,\s*"nanosec"\s*:\s*(\d+)\s*)?\})')
+
+
+class CapturedMessage(NamedTuple):
+    """One raw message read from a capture file."""
+
+    direction: str                  # "in" or "out"
+    monotonic: float                # time.monotonic() when recorded
+    robot_stamp: Optional[float]    # Stamp from the message data, if any
+    topic: str
+    payload: Union[str, bytes]      # Text message or raw binary message
+
+
+def robot_stamp(message: Dict[str, Any]) -> Optional[float]:
+    """
+    Extract the robot timestamp of a parsed message, if it carries one.
+
+    Args:
+        message: Parsed message (or binary message header)
+
+    Returns:
+        Optional[float]: ``data.stamp`` in seconds, None if missing
+    """
+    data = message.get("data") if isinstance(message, dict) else None
+    stamp = data.get("stamp") if isinstance(data, dict) else None
+    if isinstance(stamp, (int, float)):
+        return float(stamp)
+    if isinstance(stamp, dict) and "sec" in stamp:
+        return stamp["sec"] + stamp.get("nanosec", 0) * 1e-9
+    return None
+
+
+def text_stamp(text: str, limit: int = STAMP_SCAN_CHARS) -> Optional[float]:
+    """
+    Extract ``data.stamp`` from the JSON text of a message without parsing it.
+
+    Scans at most limit characters of the data object for a top-level
+    "stamp" field, so recording an unparsed text message stays cheap.
+
+    Args:
+        text: JSON text of the message
+        limit: Characters after the start of the data object to search
+
+    Returns:
+        Optional[float]: The stamp in seconds, None if not found in the window
+    """
+    start = text.find('"data"')
+    if start < 0:
+        return None
+    start = text.find("{", start, start + 32)
+    if start < 0:
+        return None
+    end = start + limit
+    position = text.find('"stamp"', start, end)
+    # Skip stamps of nested objects: the data object must be the only one open
+    while position >= 0 and text.count("{", start, position) - text.count("}", start, position) != 1:
+        position = text.find('"stamp"', position + 7, end)
+    if position < 0:
+        return None
+    match = _TEXT_STAMP.match(text, position)
+    if match is None:
+        return None
+    number, sec, nanosec = match.groups()
+    if number is not None:
+        return float(number)
+    return int(sec) + int(nanosec or 0) * 1e-9
+
+
+def _compressor(compression: str):
+    if compression == "lz4":
+        return lambda data: lz4.block.compress(data, store_size=False)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        return zstandard.ZstdCompressor(level=3).compress
+    raise ValueError(f"Invalid compression '{compression}'. Choose 'lz4' or 'zstd'.")
+
+
+def _decompressor(compression: str):
+    if compression == "lz4":
+        return lambda data, raw_len: lz4.block.decompress(data, uncompressed_size=raw_len)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("Reading zstd captures requires the zstandard package")
+        decompressor = zstandard.ZstdDecompressor()
+        return lambda data, raw_len: decompressor.decompress(data, max_output_size=raw_len)
+    raise ValueError(f"Unsupported capture compression '{compression}'")
+
+
+def _read_file_header(f) -> Dict[str, Any]:
+    if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+        raise ValueError("Not a Go2 capture file")
+    length, = _LENGTH.unpack(f.read(_LENGTH.size))
+    return json_codec.loads(f.read(length))
+
+
+def _complete_length(f) -> int:
+    """
+    Find the end of the last complete chunk, with f positioned after the header.
+
+    Returns:
+        int: File offset just past the last complete INDX block (or the header)
+    """
+    size = os.fstat(f.fileno()).st_size
+    end = f.tell()
+    while True:
+        block = f.read(_BLOCK_HEADER.size)
+        if len(block) < _BLOCK_HEADER.size:
+            return end
+        tag, stored_length, _ = _BLOCK_HEADER.unpack(block)
+        if f.tell() + stored_length > size:
+            return end
+        f.seek(stored_length, os.SEEK_CUR)
+        if tag == _INDEX_TAG:
+            end = f.tell()
+
+
+class CaptureRecorder:
+    """
+    Append-only writer of raw data channel messages.
+
+    Records are batched in memory and written as one compressed chunk when the
+    batch reaches ``chunk_size`` bytes or is ``flush_interval`` seconds old. The
+    age limit is enforced by an event loop timer armed when a batch starts, so
+    a quiet channel does not keep its last records in memory.
+    Compression and file I/O run on a single background thread, in order, so
+    recording costs the event loop one struct pack per message.
+
+    Args:
+        path: Capture file; appended to if it already exists, after cutting
+            off an incomplete chunk left by an interrupted recording
+        compression: "lz4" or "zstd" (ignored when appending, the file's
+            compression is used)
+        chunk_size: Uncompressed bytes per chunk
+        flush_interval: Maximum age in seconds of unwritten records
+
+    Attributes:
+        path: Capture file path
+        compression: Compression used for the chunks
+        records: Number of recorded messages
+        raw_bytes: Total size of the recorded messages
+        written_bytes: Bytes written to the file
+    """
+
+    def __init__(self, path: str, compression: str = "lz4", chunk_size: int = 1 << 20,
+                 flush_interval: float = 1.0) -> None:
+        """Open the capture file and write its header if it is new."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, "r+b") as f:
+                compression = _read_file_header(f)["compression"]
+                end = _complete_length(f)
+                size = os.fstat(f.fileno()).st_size
+                if end < size:
+                    logging.warning(f"Capture {path} ends with an incomplete chunk, "
+                                    f"dropping its last {size - end} bytes before appending")
+                    f.truncate(end)
+        self._compress = _compressor(compression)
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.records = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+
+        self._file = open(path, "ab")
+        if not exists:
+            header = json_codec.dumps({
+                "version": CAPTURE_VERSION,
+                "compression": compression,
+                "wall_time": time.time(),
+                "monotonic": time.monotonic(),
+            }).encode("utf-8")
+            self._file.write(CAPTURE_MAGIC + _LENGTH.pack(len(header)) + header)
+            self.written_bytes += len(CAPTURE_MAGIC) + _LENGTH.size + len(header)
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="go2-capture")
+        self._buffer = bytearray()
+        self._index: Dict[str, List[float]] = {}
+        self._chunk_started = 0.0
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """True once the recorder has been closed."""
+        return self._closed
+
+    def record(self, direction: str, payload: Union[str, bytes], topic: Optional[str] = None,
+               stamp: Optional[float] = None) -> None:
+        """
+        Append one raw message.
+
+        Args:
+            direction: "in" for received, "out" for sent messages
+            payload: Raw text or binary message as sent over the channel
+            topic: Message topic, used for the index
+            stamp: Robot timestamp of the message, if known
+        """
+        if self._closed:
+            return
+        now = time.monotonic()
+        if isinstance(payload, str):
+            kind, data = 0, payload.encode("utf-8")
+        else:
+            kind, data = 1, payload
+        topic_bytes = (topic or "").encode("utf-8")
+
+        if not self._buffer:
+            self._chunk_started = now
+            self._schedule_flush()
+        self._buffer += _RECORD_HEADER.pack(
+            DIRECTIONS.index(direction), kind, now,
+            math.nan if stamp is None else stamp, len(topic_bytes), len(data))
+        self._buffer += topic_bytes
+        self._buffer += data
+
+        entry = self._index.get(topic or "")
+        if entry is None:
+            self._index[topic or ""] = [now, now, 1]
+        else:
+            entry[1] = now
+            entry[2] += 1
+
+        self.records += 1
+        self.raw_bytes += len(data)
+        if len(self._buffer) >= self.chunk_size or now - self._chunk_started >= self.flush_interval:
+            self.flush()
+
+    def _schedule_flush(self) -> None:
+        """Arm the timer that flushes the batch started now."""
+        if self._flush_timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop: the age is only checked by record()
+            return
+        self._flush_timer = loop.call_later(self.flush_interval, self._on_flush_timer)
+
+    def _on_flush_timer(self) -> None:
+        self._flush_timer = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Hand the buffered records to the writer thread as one chunk."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._buffer or self._closed:
+            return
+        chunk, self._buffer = bytes(self._buffer), bytearray()
+        index, self._index = self._index, {}
+        self._writer.submit(self._write_chunk, chunk, index)
+
+    def _write_chunk(self, chunk: bytes, index: Dict[str, List[float]]) -> None:
+        """Compress and append one chunk and its index (writer thread)."""
+        try:
+            compressed = self._compress(chunk)
+            index_data = json_codec.dumps(index).encode("utf-8")
+            self._file.write(_BLOCK_HEADER.pack(_CHUNK_TAG, len(compressed), len(chunk)))
+            self._file.write(compressed)
+            self._file.write(_BLOCK_HEADER.pack(_INDEX_TAG, len(index_data), len(index_data)))
+            self._file.write(index_data)
+            self._file.flush()
+            self.written_bytes += 2 * _BLOCK_HEADER.size + len(compressed) + len(index_data)
+        except Exception as e:
+            logging.error(f"Error writing capture chunk to {self.path}: {e}")
+
+    def close(self) -> None:
+        """Write the remaining records and close the file."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._writer.shutdown(wait=True)
+        self._file.close()
+        logging.info(f"Capture {self.path}: {self.records} messages, "
+                     f"{self.raw_bytes} bytes raw, {self.written_bytes} bytes written")
+
+    def __enter__(self) -> "CaptureRecorder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class CaptureChunk(NamedTuple):
+    """Location and per-topic index of one chunk in a capture file."""
+
+    offset: int                         # File offset of the compressed data
+    stored_length: int
+    raw_length: int
+    topics: Dict[str, List[float]]      # topic -> [first time, last time, count]
+
+
+class CaptureReader:
+    """
+    Reader for capture files written by CaptureRecorder.
+
+    Opening the file scans only block headers and indexes; chunks are
+    decompressed when their records are read.
+
+    Args:
+        path: Capture file
+        decoder_type: LiDAR decoder used by decode() ("libvoxel" or "native")
+
+    Attributes:
+        header: File header (version, compression, wall_time, monotonic)
+        chunks: Chunks in file order
+    """
+
+    def __init__(self, path: str, decoder_type: str = "libvoxel") -> None:
+        """Open the file and load its index."""
+        self.path = path
+        self.decoder_type = decoder_type
+        self._decoder = None
+        self.chunks: List[CaptureChunk] = []
+
+        with open(path, "rb") as f:
+            self.header = _read_file_header(f)
+            self._decompress = _decompressor(self.header["compression"])
+            size = os.fstat(f.fileno()).st_size
+            chunk = None
+            while True:
+                block = f.read(_BLOCK_HEADER.size)
+                if len(block) < _BLOCK_HEADER.size:
+                    break
+                tag, stored_length, raw_length = _BLOCK_HEADER.unpack(block)
+                offset = f.tell()
+                if offset + stored_length > size:
+                    logging.warning(f"Capture {path} ends with an incomplete block")
+                    break
+                if tag == _CHUNK_TAG:
+                    chunk = (offset, stored_length, raw_length)
+                    f.seek(stored_length, os.SEEK_CUR)
+                elif tag == _INDEX_TAG and chunk is not None:
+                    self.chunks.append(CaptureChunk(*chunk, json_codec.loads(f.read(stored_length))))
+                    chunk = None
+                else:
+                    f.seek(stored_length, os.SEEK_CUR)
+
+    def topics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the recorded topics.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Per topic, "count", "first" and "last"
+            monotonic times
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        for chunk in self.chunks:
+            for topic, (first, last, count) in chunk.topics.items():
+                entry = summary.setdefault(topic, {"count": 0, "first": first, "last": last})
+                entry["count"] += count
+                entry["first"] = min(entry["first"], first)
+                entry["last"] = max(entry["last"], last)
+        return summary
+
+    def read(self, topics: Optional[Iterable[str]] = None, start: Optional[float] = None,
+             end: Optional[float] = None, direction: Optional[str] = None
+             ) -> Iterator[CapturedMessage]:
+        """
+        Iterate over recorded messages in recording order.
+
+        Args:
+            topics: Only these topics (all if None)
+            start: Only messages recorded at or after this monotonic time
+            end: Only messages recorded at or before this monotonic time
+            direction: Only "in" or "out" messages (both if None)
+
+        Yields:
+            CapturedMessage: Matching records
+        """
+        wanted = set(topics) if topics is not None else None
+        with open(self.path, "rb") as f:
+            for chunk in self.chunks:
+                if not self._chunk_matches(chunk, wanted, start, end):
+                    continue
+                f.seek(chunk.offset)
+                data = self._decompress(f.read(chunk.stored_length), chunk.raw_length)
+                for record in self._records(data):
+                    if wanted is not None and record.topic not in wanted:
+                        continue
+                    if start is not None and record.monotonic < start:
+                        continue
+                    if end is not None and record.monotonic > end:
+                        continue
+                    if direction is not None and record.direction != direction:
+                        continue
+                    yield record
+
+    @staticmethod
+    def _chunk_matches(chunk: CaptureChunk, wanted: Optional[set], start: Optional[float],
+                       end: Optional[float]) -> bool:
+        for topic, (first, last, _) in chunk.topics.items():
+            if wanted is not None and topic not in wanted:
+                continue
+            if (start is None or last >= start) and (end is None or first <= end):
+                return True
+        return False
+
+    @staticmethod
+    def _records(data: bytes) -> Iterator[CapturedMessage]:
+        view = memoryview(data)
+        pos = 0
+        while pos < len(data):
+            direction, kind, monotonic, stamp, topic_len, payload_len = \
+                _RECORD_HEADER.unpack_from(data, pos)
+            pos += _RECORD_HEADER.size
+            topic = str(view[pos:pos + topic_len], "utf-8")
+            pos += topic_len
+            payload = bytes(view[pos:pos + payload_len])
+            pos += payload_len
+            yield CapturedMessage(
+                DIRECTIONS[direction], monotonic, None if math.isnan(stamp) else stamp, topic,
+                payload.decode("utf-8") if kind == 0 else payload)
+
+    def decode(self, record: CapturedMessage) -> Dict[str, Any]:
+        """
+        Parse a recorded message the way the data channel would.
+
+        Text messages are parsed as JSON. Binary messages are split into their
+        header and payload and the payload is decoded into ``data['data']``.
+
+        Args:
+            record: Record returned by read()
+
+        Returns:
+            Dict[str, Any]: Parsed message, empty if the binary message is malformed
+        """
+        if isinstance(record.payload, str):
+            return json_codec.loads(record.payload)
+
+        from ..webrtc_datachannel import WebRTCDataChannel
+        from ..lidar.lidar_decoder_unified import UnifiedLidarDecoder
+
+        split = WebRTCDataChannel.split_array_buffer(record.payload)
+        if split is None:
+            return {}
+        message, payload = split
+        if self._decoder is None:
+            self._decoder = UnifiedLidarDecoder(decoder_type=self.decoder_type)
+        message["data"]["data"] = self._decoder.decode(payload, message["data"])
+        return message
@@ -0,0 +1,267 @@
+"""
+Chunked Message Reassembly
+
+Large responses (static files, map data) arrive as numbered chunks. Instead of
+collecting chunks in a list and concatenating them at the end (two full
+copies), each transfer is written into one buffer preallocated from the first
+regular chunk: chunk ``i`` of ``n`` lands at offset ``(i - 1) * chunk_size``, so
+chunks may arrive in any order and duplicates are ignored. The completed
+message is handed over as that ``bytearray`` itself, without copying.
+
+All transfers share a memory budget. When a new allocation would exceed it,
+the least recently active transfers are evicted; a transfer larger than the
+whole budget is rejected.
+
+Usage:
+    assembler = ChunkAssembler(budget=64 << 20, on_evict=fail_waiters)
+    data = assembler.add(key, chunk_index, total_chunks, chunk)
+    if data is not None:
+        ...  # bytes or bytearray of the complete payload
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Union
+
+DEFAULT_CHUNK_BUDGET = 128 << 20  # Bytes shared by all transfers in progress
+
+
+class ChunkAssembly:
+    """
+    Reassembly state of one chunked transfer.
+
+    Chunks are numbered 1..total. All chunks but the last are expected to have
+    the size of the first one received; if they do not, the assembly falls
+    back to keeping the chunks separately and joining them once at the end.
+
+    Attributes:
+        total: Number of chunks in the transfer
+        received: Number of distinct chunks received
+        chunk_size: Size of a regular chunk, None until one has arrived
+        nbytes: Memory held by the assembly
+    """
+
+    __slots__ = ("total", "received", "chunk_size", "nbytes", "_buffer", "_seen",
+                 "_final", "_pieces")
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.received = 0
+        self.chunk_size: Optional[int] = None
+        self.nbytes = 0
+        self._buffer: Optional[bytearray] = None
+        self._seen = bytearray(total + 1)           # 1 if chunk i arrived, 2 once in the buffer
+        self._final: Optional[bytes] = None          # Final chunk seen before the size is known
+        self._pieces: Optional[Dict[int, bytes]] = None  # Irregular chunk sizes
+
+    @property
+    def complete(self) -> bool:
+        """True once every chunk has been received."""
+        return self.received == self.total
+
+    def add(self, index: int, data: bytes) -> None:
+        """
+        Store one chunk.
+
+        Args:
+            index: Chunk number, 1..total
+            data: Chunk payload
+
+        Raises:
+            ValueError: If index is out of range
+        """
+        if not 1 <= index <= self.total:
+            raise ValueError(f"Chunk index {index} out of range 1..{self.total}")
+        if self._seen[index]:
+            return  # Duplicate
+        self._seen[index] = 1
+        self.received += 1
+
+        if self._pieces is not None:
+            self._pieces[index] = data
+            self.nbytes += len(data)
+            return
+
+        final = index == self.total
+        if self._buffer is None:
+            if final and self.total > 1:
+                # Chunk size unknown until a regular chunk arrives
+                self._final = data
+                self.nbytes = len(data)
+                return
+            self.chunk_size = len(data)
+            self._buffer = bytearray(self.chunk_size * self.total)
+            self.nbytes = len(self._buffer)
+            pending, self._final = self._final, None
+            if pending is not None:
+                self._place(self.total, pending)
+                if self._pieces is not None:
+                    self._pieces[index] = data
+                    self.nbytes += len(data)
+                    return
+
+        self._place(index, data)
+
+    def _place(self, index: int, data: bytes) -> None:
+        size = self.chunk_size
+        final = index == self.total
+        if len(data) > size or (not final and len(data) != size):
+            self._to_pieces()
+            self._pieces[index] = data
+            self.nbytes += len(data)
+            return
+        offset = (index - 1) * size
+        memoryview(self._buffer)[offset:offset + len(data)] = data
+        self._seen[index] = 2
+        if final:
+            # Trim the unused tail once the real length is known
+            del self._buffer[offset + len(data):]
+            self.nbytes = len(self._buffer)
+
+    def _to_pieces(self) -> None:
+        """Switch to separate chunks after an irregular chunk size."""
+        buffer, size = self._buffer, self.chunk_size
+        self._pieces = {}
+        self.nbytes = 0
+        for index in range(1, self.total + 1):
+            if self._seen[index] != 2:
+                continue
+            end = len(buffer) if index == self.total else index * size
+            piece = bytes(buffer[(index - 1) * size:end])
+            self._pieces[index] = piece
+            self.nbytes += len(piece)
+        self._buffer = None
+
+    def result(self) -> Union[bytes, bytearray]:
+        """
+        Get the reassembled payload.
+
+        Returns:
+            Union[bytes, bytearray]: Complete payload; the assembly buffer
+            itself unless the chunks had irregular sizes
+        """
+        if self._pieces is not None:
+            return b"".join(self._pieces[i] for i in range(1, self.total + 1))
+        if self._buffer is None:
+            return bytes(self._final or b"")
+        return self._buffer
+
+
+class ChunkAssembler:
+    """
+    Reassembles chunked transfers by key within a shared memory budget.
+
+    Args:
+        budget: Maximum bytes held by all transfers in progress
+        on_evict: Called with (key, reason) when a transfer is dropped to stay
+            within the budget
+
+    Attributes:
+        transfers: Transfers in progress by key, least recently active first
+        evicted: Number of transfers dropped because of the budget
+    """
+
+    def __init__(self, budget: int = DEFAULT_CHUNK_BUDGET,
+                 on_evict: Optional[Callable[[str, str], None]] = None) -> None:
+        """Initialize an empty assembler."""
+        if budget < 1:
+            raise ValueError("budget must be positive")
+        self.budget = budget
+        self.on_evict = on_evict
+        self.transfers: "OrderedDict[str, ChunkAssembly]" = OrderedDict()
+        self.evicted = 0
+        self._nbytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.transfers
+
+    def __len__(self) -> int:
+        return len(self.transfers)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by all transfers in progress."""
+        return self._nbytes
+
+    def add(self, key: str, index: int, total: int,
+            data: Union[bytes, bytearray, memoryview, str]) -> Optional[Union[bytes, bytearray]]:
+        """
+        Store one chunk of a transfer.
+
+        Args:
+            key: Transfer key
+            index: Chunk number, 1..total
+            total: Number of chunks in the transfer
+            data: Chunk payload; text is encoded as UTF-8
+
+        Returns:
+            Optional[Union[bytes, bytearray]]: The complete payload once all
+            chunks arrived, otherwise None
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        elif data is None:
+            data = b""
+
+        assembly = self.transfers.get(key)
+        if assembly is None or assembly.total != total:
+            if assembly is not None:
+                self.discard(key)
+            assembly = self.transfers[key] = ChunkAssembly(total)
+        else:
+            self.transfers.move_to_end(key)
+
+        before = assembly.nbytes
+        try:
+            assembly.add(index, data)
+        except ValueError as e:
+            logging.warning(f"Ignoring chunk of '{key}': {e}")
+            return None
+        self._nbytes += assembly.nbytes - before
+
+        if assembly.complete:
+            self._nbytes -= assembly.nbytes
+            del self.transfers[key]
+            return assembly.result()
+
+        if self._nbytes > self.budget:
+            self._enforce_budget(key)
+        return None
+
+    def _enforce_budget(self, key: str) -> None:
+        """Evict the least recently active transfers until within budget."""
+        for other in list(self.transfers):
+            if self._nbytes <= self.budget:
+                return
+            if other != key:
+                self._evict(other, "chunk reassembly memory budget exceeded")
+        if self._nbytes > self.budget:
+            self._evict(key, f"transfer larger than the {self.budget} byte reassembly budget")
+
+    def _evict(self, key: str, reason: str) -> None:
+        self.discard(key)
+        self.evicted += 1
+        logging.warning(f"Dropped chunked message '{key}': {reason}")
+        if self.on_evict is not None:
+            self.on_evict(key, reason)
+
+    def discard(self, key: str) -> bool:
+        """
+        Drop a transfer in progress.
+
+        Args:
+            key: Transfer key
+
+        Returns:
+            bool: True if a transfer was dropped
+        """
+        assembly = self.transfers.pop(key, None)
+        if assembly is None:
+            return False
+        self._nbytes -= assembly.nbytes
+        return True
+
+    def clear(self) -> None:
+        """Drop all transfers in progress."""
+        self.transfers.clear()
+        self._nbytes = 0
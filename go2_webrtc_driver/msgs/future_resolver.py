@@ -13,6 +13,11 @@ The FutureResolver handles:
 - Unique message identification and routing
 - File transfer with chunked data support
 - Automatic cleanup of completed operations
+- Request deadlines: unanswered futures fail with asyncio.TimeoutError and
+  their partial chunk buffers are purged
+- Chunk reassembly into preallocated buffers within a shared memory budget
+- An O(1) wants() check so streaming messages skip the resolver unless a
+  future could match them
 
 Key Features:
 - Future-based asynchronous operation management
@@ -28,6 +33,8 @@ Message Flow:
 3. FutureResolver processes chunks and reassembles data
 4. Complete message resolves the future and triggers callback
 5. Pending operation is cleaned up automatically
+6. If no (further) response arrives before the deadline, the future fails with
+   asyncio.TimeoutError and everything stored for it is released
 
 Usage Example:
     ```python
@@ -57,20 +64,39 @@ Usage Example:
 
 Chunking Support:
 - Handles large messages split into multiple chunks
-- Automatic reassembly of chunked data
+- Chunks are written into one preallocated buffer per transfer (see
+  chunk_assembler.py); they may arrive out of order and duplicates are ignored
+- The complete payload is handed over as the assembly buffer (a bytearray),
+  without a final copy
 - Support for both binary and text data
 - Robust error handling for missing or malformed chunks
-- Memory-efficient processing of large transfers
+- All transfers share a memory budget (chunk_budget); when it is exceeded the
+  least recently active transfer is dropped and its futures fail with MemoryError
+- Each received chunk extends the deadline, so long transfers only time out
+  when they stall
+
+Deadlines:
+- Every saved future gets a deadline (default_timeout, or the timeout passed
+  to save_resolve); math.inf disables it for a single request
+- Deadlines are kept in a heap served by a single event loop timer
+- Chunk buffers nobody waits for expire after default_timeout without a chunk
 
 Author: Unitree Robotics
 Version: 1.0
 """
 
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Any, Optional, Union, Callable
+import math
+from typing import Dict, List, Any, Optional, Tuple, Callable
 import asyncio
 from ..constants import DATA_CHANNEL_TYPE
 from ..util import get_nested_field
+from .chunk_assembler import ChunkAssembler, DEFAULT_CHUNK_BUDGET
+
+
+DEFAULT_REQUEST_TIMEOUT = 30.0  # Seconds without a response before a request fails
 
 
 class FutureResolver:
@@ -97,7 +123,13 @@ class FutureResolver:
     Attributes:
         pending_responses (Dict): Storage for pending response tracking (currently unused)
         pending_callbacks (Dict[str, List]): Mapping of message keys to pending futures
-        chunk_data_storage (Dict[str, List]): Storage for assembling chunked messages
+        chunk_assembler (ChunkAssembler): Reassembles chunked messages
+        chunk_data_storage (Dict[str, ChunkAssembly]): Chunked messages in
+            progress by key (the assembler's transfers)
+        default_timeout (Optional[float]): Deadline in seconds for requests
+            without an explicit timeout, None for no deadline
+        timed_out (int): Number of futures failed because their deadline passed
+        purged_chunk_buffers (int): Number of partial chunk buffers discarded
     
     Example:
         ```python
@@ -116,25 +148,54 @@ class FutureResolver:
         ```
     """
     
-    def __init__(self) -> None:
+    def __init__(self, default_timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+                 chunk_budget: int = DEFAULT_CHUNK_BUDGET) -> None:
         """
         Initialize the Future Resolver
         
         Sets up the internal data structures for managing pending operations,
         callbacks, and chunked data storage.
         
+        Args:
+            default_timeout (Optional[float]): Seconds to wait for a response
+                before failing the future with asyncio.TimeoutError. None
+                disables the default deadline.
+            chunk_budget (int): Maximum bytes held by partial chunked messages
+        
         Example:
             ```python
             resolver = FutureResolver()
             print("Future resolver initialized")
             ```
         """
+        if default_timeout is not None and default_timeout <= 0:
+            raise ValueError("default_timeout must be positive or None")
+
         self.pending_responses = {}      # Storage for pending response tracking
         self.pending_callbacks = {}     # Mapping of message keys to pending futures
-        self.chunk_data_storage = {}    # Storage for assembling chunked messages
+        self.chunk_assembler = ChunkAssembler(chunk_budget, on_evict=self._fail_key)
+        self.chunk_data_storage = self.chunk_assembler.transfers  # Chunked messages in progress
+        self.default_timeout = default_timeout
+        self.timed_out = 0
+        self.purged_chunk_buffers = 0
+
+        # Deadline heap of (deadline, seq, key, future or None for chunk buffers).
+        # Entries are never removed early; stale ones are skipped when popped.
+        self._deadlines: List[Tuple[float, int, str, Optional[asyncio.Future]]] = []
+        self._deadline_of: Dict[Any, float] = {}   # Current deadline per future / chunk key
+        self._timeout_of: Dict[Any, float] = {}    # Timeout used to extend on progress
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = math.inf
+
+        # Futures waiting for MSG-type (streaming) messages, for wants():
+        # by topic when matched by type and topic, counted when matched by ID
+        self._msg_waiter_topic: Dict[asyncio.Future, Optional[str]] = {}
+        self._msg_topic_waiters: Dict[str, int] = {}
+        self._msg_id_waiters = 0
 
     def save_resolve(self, message_type: str, topic: str, future: asyncio.Future, 
-                    identifier: Optional[str]) -> None:
+                    identifier: Optional[str], timeout: Optional[float] = None) -> None:
         """
         Register a future for message resolution
         
@@ -147,6 +208,8 @@ class FutureResolver:
             topic (str): Message topic (e.g., "rt/api/sport")
             future (asyncio.Future): Future to resolve when response arrives
             identifier (Optional[str]): Unique message identifier
+            timeout (Optional[float]): Seconds to wait for the response; None
+                uses default_timeout, math.inf waits forever
             
         Example:
             ```python
@@ -162,6 +225,9 @@ class FutureResolver:
         Note:
             Multiple futures can be registered for the same message key.
             All registered futures will be resolved when the response arrives.
+            When the deadline passes first, the future fails with
+            asyncio.TimeoutError; each received chunk of the response
+            restarts its deadline.
         """
         key = self.generate_message_key(message_type, topic, identifier)
         if key in self.pending_callbacks:
@@ -169,6 +235,210 @@ class FutureResolver:
         else:
             self.pending_callbacks[key] = [future]
 
+        if message_type == DATA_CHANNEL_TYPE["MSG"]:
+            if identifier:
+                self._msg_waiter_topic[future] = None
+                self._msg_id_waiters += 1
+            else:
+                self._msg_waiter_topic[future] = topic
+                self._msg_topic_waiters[topic] = self._msg_topic_waiters.get(topic, 0) + 1
+
+        if timeout is None:
+            timeout = self.default_timeout
+        if timeout is not None and timeout != math.inf:
+            if timeout <= 0:
+                raise ValueError("timeout must be positive")
+            self._timeout_of[future] = timeout
+            self._set_deadline(key, future, future.get_loop(), timeout)
+
+    def wants(self, message_type: Optional[str], topic: Optional[str]) -> bool:
+        """
+        Check in O(1) whether a message could resolve a pending future
+        
+        Streaming (MSG) messages only need the resolver when a future waits
+        for a message of that topic, or for a MSG message by ID. Other
+        message types are checked whenever any future is pending.
+        
+        Args:
+            message_type (Optional[str]): Type of the incoming message
+            topic (Optional[str]): Topic of the incoming message
+            
+        Returns:
+            bool: False if run_resolve_for_topic() would do nothing
+        """
+        if not self.pending_callbacks:
+            return False
+        if message_type != DATA_CHANNEL_TYPE["MSG"]:
+            return True
+        return self._msg_id_waiters > 0 or topic in self._msg_topic_waiters
+
+    def _release(self, future: asyncio.Future) -> None:
+        """Forget the deadline and wants() bookkeeping of a future."""
+        self._deadline_of.pop(future, None)
+        self._timeout_of.pop(future, None)
+        if future in self._msg_waiter_topic:
+            topic = self._msg_waiter_topic.pop(future)
+            if topic is None:
+                self._msg_id_waiters -= 1
+            elif self._msg_topic_waiters[topic] > 1:
+                self._msg_topic_waiters[topic] -= 1
+            else:
+                del self._msg_topic_waiters[topic]
+
+    def _set_deadline(self, key: str, future: Optional[asyncio.Future],
+                      loop: asyncio.AbstractEventLoop, timeout: float) -> None:
+        """Push a (new) deadline for a future, or for the chunk buffer of key."""
+        deadline = loop.time() + timeout
+        self._deadline_of[future if future is not None else key] = deadline
+        heapq.heappush(self._deadlines, (deadline, next(self._seq), key, future))
+        if deadline < self._timer_at:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = loop.call_at(deadline, self._expire_deadlines, loop)
+            self._timer_at = deadline
+
+    def _extend_deadlines(self, key: str) -> None:
+        """Restart the deadlines of everything waiting on key after a chunk arrived."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        waiting = self.pending_callbacks.get(key)
+        if waiting:
+            # The buffer lives as long as its requests and is purged with the last one
+            for future in waiting:
+                timeout = self._timeout_of.get(future)
+                if timeout is not None and not future.done():
+                    self._set_deadline(key, future, loop, timeout)
+        elif self.default_timeout is not None and key in self.chunk_assembler:
+            self._set_deadline(key, None, loop, self.default_timeout)
+
+    def _expire_deadlines(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Fail futures and purge chunk buffers whose deadline has passed."""
+        self._timer = None
+        self._timer_at = math.inf
+        now = loop.time()
+        heap = self._deadlines
+
+        while heap and heap[0][0] <= now:
+            deadline, _, key, future = heapq.heappop(heap)
+            owner = future if future is not None else key
+            if self._deadline_of.get(owner) != deadline:
+                continue  # Resolved, or the deadline was extended
+            del self._deadline_of[owner]
+
+            if future is None:
+                self._purge_chunks(key)
+                continue
+
+            timeout = self._timeout_of.get(future)
+            self._release(future)
+            waiting = self.pending_callbacks.get(key)
+            if waiting is not None and future in waiting:
+                waiting.remove(future)
+                if not waiting:
+                    del self.pending_callbacks[key]
+                    self._purge_chunks(key)
+            if not future.done():
+                self.timed_out += 1
+                future.set_exception(asyncio.TimeoutError(
+                    f"No response for '{key}' within {timeout} seconds"))
+                logging.warning(f"Request '{key}' timed out after {timeout} seconds")
+
+        # Drop stale entries in bulk when resolved requests dominate the heap
+        if len(heap) > 64 and len(heap) > 4 * len(self._deadline_of):
+            self._deadlines = heap = [entry for entry in heap
+                                      if self._deadline_of.get(entry[3] if entry[3] is not None
+                                                               else entry[2]) == entry[0]]
+            heapq.heapify(heap)
+
+        if heap:
+            self._timer = loop.call_at(heap[0][0], self._expire_deadlines, loop)
+            self._timer_at = heap[0][0]
+
+    def _purge_chunks(self, key: str) -> None:
+        """Discard the partial chunk buffer of key, if any."""
+        self._deadline_of.pop(key, None)
+        if self.chunk_assembler.discard(key):
+            self.purged_chunk_buffers += 1
+            logging.warning(f"Discarded incomplete chunked message '{key}'")
+
+    def _resolve_key(self, key: str, message: Dict[str, Any]) -> None:
+        """Resolve every future waiting on key with the complete message."""
+        self._deadline_of.pop(key, None)
+        futures = self.pending_callbacks.pop(key, None)
+        if futures is None:
+            return
+        for future in futures:
+            if future:
+                self._release(future)
+                if not future.done():
+                    future.set_result(message)
+
+    def _fail_key(self, key: str, reason: str) -> None:
+        """Fail every future waiting on key after its chunk buffer was evicted."""
+        self._deadline_of.pop(key, None)
+        futures = self.pending_callbacks.pop(key, None)
+        if futures is None:
+            return
+        for future in futures:
+            if future:
+                self._release(future)
+                if not future.done():
+                    future.set_exception(MemoryError(f"Chunked response '{key}' dropped: {reason}"))
+
+    def in_flight(self) -> int:
+        """
+        Get the number of futures waiting for a response
+        
+        Returns:
+            int: Number of pending futures
+        """
+        return sum(len(futures) for futures in self.pending_callbacks.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get gauges describing the pending state
+        
+        Returns:
+            Dict[str, Any]: in_flight (pending futures), pending_keys,
+            chunk_buffers (partial chunked messages), chunk_buffer_bytes,
+            timed_out, purged_chunk_buffers and evicted_chunk_buffers totals
+        """
+        return {
+            "in_flight": self.in_flight(),
+            "pending_keys": len(self.pending_callbacks),
+            "chunk_buffers": len(self.chunk_assembler),
+            "chunk_buffer_bytes": self.chunk_assembler.nbytes,
+            "timed_out": self.timed_out,
+            "purged_chunk_buffers": self.purged_chunk_buffers,
+            "evicted_chunk_buffers": self.chunk_assembler.evicted,
+        }
+
+    def cancel_all(self, reason: str = "Data channel closed") -> None:
+        """
+        Fail every pending future and drop all chunk buffers
+        
+        Args:
+            reason (str): Message of the ConnectionError set on the futures
+        """
+        pending, self.pending_callbacks = self.pending_callbacks, {}
+        self.chunk_assembler.clear()
+        self._deadlines.clear()
+        self._deadline_of.clear()
+        self._timeout_of.clear()
+        self._msg_waiter_topic.clear()
+        self._msg_topic_waiters.clear()
+        self._msg_id_waiters = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_at = math.inf
+        for futures in pending.values():
+            for future in futures:
+                if future and not future.done():
+                    future.set_exception(ConnectionError(reason))
+
     def run_resolve_for_topic(self, message: Dict[str, Any]) -> None:
         """
         Process incoming messages and resolve matching futures
@@ -221,7 +491,8 @@ class FutureResolver:
         Note:
             - Messages without type are ignored
             - File transfer messages are handled separately
-            - Chunked messages are reassembled before future resolution
+            - Chunked messages are reassembled before future resolution; the
+              reassembled data is a bytearray
             - All matching futures are resolved simultaneously
         """
         if not message.get("type"):
@@ -255,66 +526,16 @@ class FutureResolver:
             if chunk_index is None:
                 raise ValueError("Chunk index is missing")
 
-            data_chunk = message["data"].get("data")
-            
-            # Store intermediate chunks
-            if chunk_index < total_chunks:
-                if key in self.chunk_data_storage:
-                    self.chunk_data_storage[key].append(data_chunk)
-                else:
-                    self.chunk_data_storage[key] = [data_chunk]
+            # Store the chunk; chunks may arrive in any order
+            data = self.chunk_assembler.add(key, chunk_index, total_chunks,
+                                            message["data"].get("data"))
+            if data is None:
+                self._extend_deadlines(key)
                 return
-            else:
-                # Final chunk - assemble complete message
-                self.chunk_data_storage[key].append(data_chunk)
-                message["data"]["data"] = self.merge_array_buffers(self.chunk_data_storage[key])
-                del self.chunk_data_storage[key]
+            message["data"]["data"] = data
 
         # Resolve pending futures with the complete message
-        if key in self.pending_callbacks:
-            for future in self.pending_callbacks[key]:
-                if future:
-                    future.set_result(message)
-            del self.pending_callbacks[key]
-
-    def merge_array_buffers(self, buffers: List[Union[bytes, bytearray]]) -> bytes:
-        """
-        Merge multiple data buffers into a single byte array
-        
-        This method concatenates multiple data chunks into a single continuous
-        byte array. It's used to reassemble chunked messages into their original form.
-        
-        Args:
-            buffers (List[Union[bytes, bytearray]]): List of data buffers to merge
-            
-        Returns:
-            bytes: Merged data as a single byte array
-            
-        Example:
-            ```python
-            # Merge multiple chunks
-            chunks = [b"chunk1", b"chunk2", b"chunk3"]
-            merged = resolver.merge_array_buffers(chunks)
-            print(merged)  # b"chunk1chunk2chunk3"
-            
-            # Merge mixed types
-            chunks = [bytearray(b"data1"), b"data2", bytearray(b"data3")]
-            merged = resolver.merge_array_buffers(chunks)
-            ```
-            
-        Note:
-            The method handles both bytes and bytearray objects efficiently
-            by calculating total length first to avoid repeated reallocations.
-        """
-        total_length = sum(len(buf) for buf in buffers)
-        merged_buffer = bytearray(total_length)
-
-        current_position = 0
-        for buffer in buffers:
-            merged_buffer[current_position:current_position + len(buffer)] = buffer
-            current_position += len(buffer)
-
-        return bytes(merged_buffer)
+        self._resolve_key(key, message)
 
     def run_resolve_for_topic_for_file(self, message: Dict[str, Any]) -> None:
         """
@@ -362,7 +583,8 @@ class FutureResolver:
         Note:
             - Handles both string and binary file data
             - String data is encoded to UTF-8 before storage
-            - Final chunk triggers future resolution
+            - Futures are resolved once every chunk has arrived, with the
+              file data as a bytearray
             - Automatic cleanup of completed transfers
         """
         # Generate message key for lookup
@@ -387,29 +609,16 @@ class FutureResolver:
             if chunk_index is None:
                 raise ValueError("Chunk index is missing")
 
-            # Extract and process chunk data
-            data_chunk = file_info.get("data")
-
-            # Initialize chunk storage for this key
-            if key not in self.chunk_data_storage:
-                self.chunk_data_storage[key] = []
-
-            # Store chunk data (encode strings to bytes)
-            chunk_bytes = data_chunk.encode('utf-8') if isinstance(data_chunk, str) else data_chunk
-            self.chunk_data_storage[key].append(chunk_bytes)
-
-            # Check if this is the final chunk
-            if chunk_index == total_chunks:
-                # Assemble complete file data
-                message["info"]["file"]["data"] = b''.join(self.chunk_data_storage[key])
-                del self.chunk_data_storage[key]
+            # Store the chunk (strings are encoded to bytes)
+            data = self.chunk_assembler.add(key, chunk_index, total_chunks, file_info.get("data"))
+            if data is None:
+                # Resolve only once the whole file has arrived
+                self._extend_deadlines(key)
+                return
+            message["info"]["file"]["data"] = data
 
         # Resolve pending futures with the complete message
-        if key in self.pending_callbacks:
-            for future in self.pending_callbacks[key]:
-                if future:
-                    future.set_result(message)
-            del self.pending_callbacks[key]
+        self._resolve_key(key, message)
 
     def generate_message_key(self, message_type: str, topic: str, 
                            identifier: Optional[str]) -> str:
@@ -0,0 +1,192 @@
+"""
+Pluggable JSON Codec for the Data Channel
+
+Every text message on the data channel is JSON, and at lowstate rates the
+encoder/decoder shows up in profiles. This module picks the fastest available
+JSON library once and exposes it through ``loads``/``dumps``:
+
+- orjson: used when installed (fastest)
+- msgspec: used when installed and orjson is not
+- json: standard library fallback
+
+``dumps`` always returns ``str`` so the result is sent as a text message, and
+falls back to the standard library for objects the fast encoder rejects (for
+example NumPy scalars), so switching codecs never changes what can be sent.
+``loads`` raises ``json.JSONDecodeError`` for invalid input regardless of the
+codec in use. Lazily parsed messages (lazy_message.py) are encoded in full
+by every codec, even though orjson and msgspec read dicts at the C level.
+
+Usage:
+    from go2_webrtc_driver.msgs import json_codec
+
+    message = json_codec.loads(text)
+    text = json_codec.dumps(message)
+
+    json_codec.set_json_codec("stdlib")   # Force the standard library
+    print(json_codec.get_json_codec())    # "orjson", "msgspec" or "stdlib"
+
+The codec can also be chosen with the GO2_JSON_CODEC environment variable
+("auto", "orjson", "msgspec" or "stdlib").
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def _stdlib_loads(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj)
+
+
+def _orjson_loads(data: Union[str, bytes]) -> Any:
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+    return orjson.loads(data)
+
+
+def _plain_dict(obj: Dict[Any, Any]) -> Dict[Any, Any]:
+    """Copy a dict subclass into a plain dict, parsing a LazyMessage first."""
+    materialize = getattr(obj, "materialize", None)
+    return dict(materialize() if materialize is not None else obj)
+
+
+def _orjson_default(obj: Any) -> Any:
+    # Subclasses are passed through to this hook so that a LazyMessage is
+    # materialized instead of serialized from its unparsed dict storage;
+    # other subclasses are encoded as their base type like json.dumps does
+    if isinstance(obj, dict):
+        return _plain_dict(obj)
+    if isinstance(obj, str):
+        return str.__str__(obj)
+    if isinstance(obj, int):
+        return int.__int__(obj)
+    if isinstance(obj, float):
+        return float.__float__(obj)
+    if isinstance(obj, (list, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _orjson_dumps(obj: Any) -> str:
+    try:
+        return orjson.dumps(obj, default=_orjson_default,
+                            option=orjson.OPT_PASSTHROUGH_SUBCLASS).decode("utf-8")
+    except TypeError:
+        return json.dumps(obj)
+
+
+_msgspec_decoder = msgspec.json.Decoder() if msgspec is not None else None
+_msgspec_encoder = msgspec.json.Encoder() if msgspec is not None else None
+
+
+def _msgspec_loads(data: Union[str, bytes]) -> Any:
+    try:
+        return _msgspec_decoder.decode(data)
+    except msgspec.DecodeError as e:
+        doc = data if isinstance(data, str) else data.decode("utf-8", "replace")
+        raise JSONDecodeError(str(e), doc, 0) from e
+
+
+def _materialize_lazy(obj: Any) -> Any:
+    """Replace LazyMessage dicts (msgspec encodes dict subclasses natively) with plain dicts."""
+    if isinstance(obj, dict):
+        if type(obj) is not dict:
+            obj = _plain_dict(obj)
+        return {key: _materialize_lazy(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_materialize_lazy(value) for value in obj]
+    return obj
+
+
+def _msgspec_dumps(obj: Any) -> str:
+    if isinstance(obj, (dict, list, tuple)):
+        obj = _materialize_lazy(obj)
+    try:
+        return _msgspec_encoder.encode(obj).decode("utf-8")
+    except (TypeError, msgspec.EncodeError):
+        return json.dumps(obj)
+
+
+_CODECS: Dict[str, Tuple[Any, Callable[[Union[str, bytes]], Any], Callable[[Any], str]]] = {
+    "orjson": (orjson, _orjson_loads, _orjson_dumps),
+    "msgspec": (msgspec, _msgspec_loads, _msgspec_dumps),
+    "stdlib": (json, _stdlib_loads, _stdlib_dumps),
+}
+
+# Active codec, rebound by set_json_codec()
+loads: Callable[[Union[str, bytes]], Any] = _stdlib_loads
+dumps: Callable[[Any], str] = _stdlib_dumps
+_codec_name = "stdlib"
+
+
+def available_json_codecs() -> Tuple[str, ...]:
+    """
+    Get the JSON codecs that can be used in this environment.
+
+    Returns:
+        Tuple[str, ...]: Codec names, fastest first
+    """
+    return tuple(name for name, (module, _, _) in _CODECS.items() if module is not None)
+
+
+def set_json_codec(name: str = "auto") -> str:
+    """
+    Select the JSON codec used by the data channel.
+
+    Args:
+        name: "auto" (fastest available), "orjson", "msgspec" or "stdlib"
+
+    Returns:
+        str: Name of the selected codec
+
+    Raises:
+        ValueError: If the codec name is unknown or the library is not installed
+    """
+    global loads, dumps, _codec_name
+
+    if name == "auto":
+        name = available_json_codecs()[0]
+    if name not in _CODECS:
+        raise ValueError(f"Invalid JSON codec '{name}'. Choose 'auto', 'orjson', 'msgspec' or 'stdlib'.")
+
+    module, codec_loads, codec_dumps = _CODECS[name]
+    if module is None:
+        raise ValueError(f"JSON codec '{name}' is not installed")
+
+    loads, dumps, _codec_name = codec_loads, codec_dumps, name
+    logging.debug(f"JSON codec: {name}")
+    return name
+
+
+def get_json_codec() -> str:
+    """
+    Get the name of the JSON codec in use.
+
+    Returns:
+        str: "orjson", "msgspec" or "stdlib"
+    """
+    return _codec_name
+
+
+try:
+    set_json_codec(os.getenv("GO2_JSON_CODEC", "auto"))
+except ValueError as e:
+    logging.warning(f"{e}; using the standard library JSON codec")
+    set_json_codec("stdlib")
@@ -0,0 +1,177 @@
+"""
+Lazily Parsed Text Messages
+
+Text messages on the data channel are JSON envelopes of the form
+``{"type": ..., "topic": ..., "data": {...}}``. Routing only needs ``type`` and
+``topic``, but ``json.loads`` materializes the whole nested ``data`` object
+for every message - including lowstate frames that a ``keep_last`` mailbox
+overwrites, a stream drops, or nobody subscribes to.
+
+``LazyMessage`` is the message dict of such a message. ``type`` and ``topic``
+are read with a prefix match when the message arrives; the rest of the JSON is
+parsed with the active codec the first time anything else is accessed, and
+cached. Messages that do not start with the usual envelope are parsed eagerly,
+so behaviour never depends on the key order the robot uses.
+
+Example:
+    >>> message = LazyMessage.parse(text)
+    >>> message.topic                 # No JSON parsing
+    >>> message["data"]["imu_state"]  # Parses once, cached afterwards
+"""
+
+import re
+from typing import Any, Dict, Iterator, Optional
+
+from . import json_codec
+
+# {"type":"<type>","topic":"<topic>", - strings without escapes only
+_ENVELOPE = re.compile(r'\{\s*"type"\s*:\s*"([^"\\]*)"\s*,\s*"topic"\s*:\s*"([^"\\]*)"\s*[,}]')
+
+
+class LazyMessage(dict):
+    """
+    Message dict whose JSON body is parsed on first access beyond type/topic.
+
+    Key access, ``get``, ``in``, iteration and the view methods parse the
+    message when they need more than ``type`` and ``topic``. ``type`` and
+    ``topic`` are also available as read-only attributes.
+
+    Note:
+        Code that bypasses dict methods at the C level (``dict(...)``
+        copies, ``orjson.dumps`` called directly) only sees the full message
+        after ``materialize()`` has been called. ``json_codec.dumps`` and
+        ``json.dumps`` encode the full message, and pickling (also used to
+        hand messages to worker processes) produces a plain dict.
+    """
+
+    __slots__ = ("_text",)
+
+    def __init__(self, text: str, msg_type: str, topic: str) -> None:
+        """
+        Initialize the envelope.
+
+        Args:
+            text: Complete JSON text of the message
+            msg_type: Value of the "type" field
+            topic: Value of the "topic" field
+        """
+        super().__init__(type=msg_type, topic=topic)
+        self._text: Optional[str] = text
+
+    @classmethod
+    def parse(cls, text: str) -> Dict[str, Any]:
+        """
+        Wrap a text message, parsing eagerly if it has no standard envelope.
+
+        Args:
+            text: JSON text received on the data channel
+
+        Returns:
+            Dict[str, Any]: A LazyMessage, or a plain dict for messages that
+            do not start with the "type" and "topic" fields
+
+        Raises:
+            json.JSONDecodeError: If a message without the standard envelope
+                is not valid JSON
+        """
+        match = _ENVELOPE.match(text)
+        if match is None:
+            return json_codec.loads(text)
+        return cls(text, match.group(1), match.group(2))
+
+    @property
+    def type(self) -> str:
+        """Message type (read-only)."""
+        return dict.__getitem__(self, "type")
+
+    @property
+    def topic(self) -> str:
+        """Message topic (read-only)."""
+        return dict.__getitem__(self, "topic")
+
+    @property
+    def is_parsed(self) -> bool:
+        """True once the full message has been parsed."""
+        return self._text is None
+
+    @property
+    def raw_text(self) -> Optional[str]:
+        """The JSON text, or None once it has been parsed."""
+        return self._text
+
+    def materialize(self) -> "LazyMessage":
+        """
+        Parse the full message now if it has not been parsed yet.
+
+        Returns:
+            LazyMessage: This dict, with every field populated
+
+        Raises:
+            json.JSONDecodeError: If the message is not valid JSON
+        """
+        text = self._text
+        if text is not None:
+            parsed = json_codec.loads(text)
+            self._text = None
+            dict.update(self, parsed)
+        return self
+
+    def __missing__(self, key: Any) -> Any:
+        if self._text is not None:
+            return dict.__getitem__(self.materialize(), key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        dict.__setitem__(self.materialize(), key, value)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if self._text is not None and key != "type" and key != "topic":
+            self.materialize()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        if self._text is not None and key != "type" and key != "topic":
+            self.materialize()
+        return dict.__contains__(self, key)
+
+    def __iter__(self) -> Iterator[Any]:
+        return dict.__iter__(self.materialize())
+
+    def __len__(self) -> int:
+        return dict.__len__(self.materialize())
+
+    def __eq__(self, other: Any) -> bool:
+        return dict.__eq__(self.materialize(), other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def keys(self):  # type: ignore[override]
+        return dict.keys(self.materialize())
+
+    def values(self):  # type: ignore[override]
+        return dict.values(self.materialize())
+
+    def items(self):  # type: ignore[override]
+        return dict.items(self.materialize())
+
+    def pop(self, *args: Any) -> Any:  # type: ignore[override]
+        return dict.pop(self.materialize(), *args)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:  # type: ignore[override]
+        return dict.setdefault(self.materialize(), key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[override]
+        dict.update(self.materialize(), *args, **kwargs)
+
+    def copy(self) -> Dict[str, Any]:  # type: ignore[override]
+        return dict(self.materialize())
+
+    def __reduce__(self) -> Any:
+        # Unpickling a dict subclass sets items before the slots exist
+        return (dict, (dict(self.materialize()),))
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self.materialize())
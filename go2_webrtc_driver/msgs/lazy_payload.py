@@ -0,0 +1,137 @@
+"""
+Lazily Decoded Binary Payloads
+
+Binary data channel messages carry a small JSON header and a compressed payload
+(LiDAR voxels, etc.). Decoding the payload is by far the most expensive part of
+handling such a message, yet many messages are never looked at: frames still
+in flight after ``unsubscribe()``, topics only used for futures, or frames a
+consumer skips.
+
+``LazyDecodedData`` is the ``message['data']`` dict of such a message. It holds
+every header field immediately but only runs the decoder when ``'data'`` is
+first accessed, and caches the result, so ignored frames cost a header parse.
+
+Example:
+    >>> data = LazyDecodedData(header["data"], decoder.decode, payload)
+    >>> data["resolution"]          # Header field, no decoding
+    >>> points = data["data"]       # Decodes once, cached afterwards
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class LazyDecodedData(dict):
+    """
+    Message data dict whose ``'data'`` entry is decoded on first access.
+
+    The decoder is called as ``decode(payload, metadata)`` where ``metadata``
+    is this dict, matching the ``LidarDecoder.decode`` signature. Key access,
+    ``get``, ``in``, iteration and the view methods all trigger decoding when
+    they need ``'data'``; header-only access never does. ``json.dumps``,
+    ``dict(...)`` copies and pickling go through these methods too, so they
+    see the decoded payload.
+
+    If decoding fails, the error is logged once and every later access to
+    ``'data'`` raises a ValueError chained to it, so each subscriber sees the
+    same failure.
+    """
+
+    __slots__ = ("_decode", "_payload", "_error")
+
+    def __init__(self, header: Dict[str, Any], decode: Callable[[bytes, Dict[str, Any]], Any],
+                 payload: bytes) -> None:
+        """
+        Initialize the lazy data dict.
+
+        Args:
+            header: Header fields of the message data (origin, resolution, ...)
+            decode: Decoder function called as decode(payload, metadata)
+            payload: Undecoded binary payload
+        """
+        super().__init__(header)
+        self._decode: Optional[Callable[[bytes, Dict[str, Any]], Any]] = decode
+        self._payload: Optional[bytes] = payload
+        self._error: Optional[Exception] = None
+
+    @property
+    def is_decoded(self) -> bool:
+        """True once the payload has been decoded (or replaced)."""
+        return self._decode is None and self._error is None
+
+    @property
+    def raw_payload(self) -> Optional[bytes]:
+        """The undecoded binary payload, or None once it has been decoded."""
+        return self._payload
+
+    def materialize(self) -> "LazyDecodedData":
+        """
+        Decode the payload now if it has not been decoded yet.
+
+        Returns:
+            LazyDecodedData: This dict, with ``'data'`` populated
+
+        Raises:
+            ValueError: If the payload could not be decoded (now or earlier)
+        """
+        decode = self._decode
+        if decode is not None:
+            payload, self._decode, self._payload = self._payload, None, None
+            try:
+                dict.__setitem__(self, "data", decode(payload, self))
+            except Exception as e:
+                logging.error(f"Error decoding binary payload: {e}")
+                self._error = e
+        if self._error is not None:
+            raise ValueError(f"Binary payload could not be decoded: {self._error}") from self._error
+        return self
+
+    def __missing__(self, key: Any) -> Any:
+        if key == "data" and (self._decode is not None or self._error is not None):
+            return dict.__getitem__(self.materialize(), key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        # Assigning the payload explicitly replaces the pending decode
+        if key == "data":
+            self._decode = None
+            self._payload = None
+            self._error = None
+        dict.__setitem__(self, key, value)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key == "data":
+            self.materialize()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return (key == "data" and self._decode is not None) or dict.__contains__(self, key)
+
+    def __iter__(self) -> Iterator[Any]:
+        return dict.__iter__(self.materialize())
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + (1 if self._decode is not None else 0)
+
+    def keys(self):  # type: ignore[override]
+        return dict.keys(self.materialize())
+
+    def values(self):  # type: ignore[override]
+        return dict.values(self.materialize())
+
+    def items(self):  # type: ignore[override]
+        return dict.items(self.materialize())
+
+    def copy(self) -> Dict[str, Any]:  # type: ignore[override]
+        return dict(self.materialize())
+
+    def __reduce__(self) -> Any:
+        # Unpickling a dict subclass sets items before the slots exist
+        return (dict, (dict(self.materialize()),))
+
+    def __repr__(self) -> str:
+        if self._decode is not None:
+            return f"LazyDecodedData({dict.__repr__(self)}, data=<not decoded>)"
+        if self._error is not None:
+            return f"LazyDecodedData({dict.__repr__(self)}, data=<decode failed>)"
+        return dict.__repr__(self)
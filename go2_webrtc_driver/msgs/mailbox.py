@@ -0,0 +1,143 @@
+"""
+Latest-Value Mailboxes for High-Rate Subscriptions
+
+Provides a bounded "keep last N" slot that the data channel writes into and a
+consumer reads from at its own pace. Writing never blocks and never grows the
+mailbox: once it is full, each new message overwrites the oldest one. A mailbox
+of size 1 always holds only the latest message.
+
+Features:
+- O(1) put from the data channel message handler
+- Non-blocking reads (latest, oldest, drain) and awaitable reads
+- Counter of messages overwritten before they were read
+
+Usage:
+    mailbox = pub_sub.subscribe("rt/lf/lowstate", keep_last=1)
+    ...
+    state = mailbox.latest()          # Poll from a UI or control loop
+    message = await mailbox.get()     # Or wait for the next message
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+
+class SubscriptionMailbox:
+    """
+    Bounded mailbox holding the last N messages of a subscription.
+
+    Args:
+        topic: Topic the mailbox is attached to
+        keep_last: Number of messages to keep; 1 keeps only the latest
+
+    Attributes:
+        topic: Topic the mailbox is attached to
+        keep_last: Capacity of the mailbox
+        received: Total number of messages put into the mailbox
+        overwritten: Number of messages overwritten before they were read
+        handle: Router subscription feeding the mailbox, set by subscribe()
+    """
+
+    def __init__(self, topic: str, keep_last: int = 1) -> None:
+        """Initialize an empty mailbox."""
+        if keep_last < 1:
+            raise ValueError("keep_last must be at least 1")
+        self.topic = topic
+        self.keep_last = keep_last
+        self.received = 0
+        self.overwritten = 0
+        self._messages: Deque[Dict[str, Any]] = deque(maxlen=keep_last)
+        self._ready: Optional[asyncio.Event] = None
+        self._closed = False
+        self.handle: Any = None
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def closed(self) -> bool:
+        """True once the subscription owning the mailbox has been removed."""
+        return self._closed
+
+    def put(self, message: Dict[str, Any]) -> None:
+        """
+        Store a message, overwriting the oldest one if the mailbox is full.
+
+        Args:
+            message: Message received for the topic
+        """
+        if self._closed:
+            return
+        if len(self._messages) == self.keep_last:
+            self.overwritten += 1
+        self._messages.append(message)
+        self.received += 1
+        if self._ready is not None:
+            self._ready.set()
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the newest message without removing it.
+
+        Returns:
+            The newest message, or None if the mailbox is empty
+        """
+        return self._messages[-1] if self._messages else None
+
+    def get_nowait(self) -> Optional[Dict[str, Any]]:
+        """
+        Remove and return the oldest message.
+
+        Returns:
+            The oldest message, or None if the mailbox is empty
+        """
+        if not self._messages:
+            return None
+        message = self._messages.popleft()
+        if not self._messages and self._ready is not None:
+            self._ready.clear()
+        return message
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """
+        Remove and return all messages, oldest first.
+
+        Returns:
+            List of buffered messages (possibly empty)
+        """
+        messages = list(self._messages)
+        self._messages.clear()
+        if self._ready is not None:
+            self._ready.clear()
+        return messages
+
+    async def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for a message and remove it from the mailbox.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            The oldest buffered message
+
+        Raises:
+            asyncio.TimeoutError: If no message arrives within the timeout
+            RuntimeError: If the mailbox is closed while waiting
+        """
+        while not self._messages:
+            if self._closed:
+                raise RuntimeError(f"Mailbox for {self.topic} is closed")
+            if self._ready is None:
+                self._ready = asyncio.Event()
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        return self.get_nowait()
+
+    def close(self) -> None:
+        """Stop accepting messages, remove the subscription and wake up any waiting consumer."""
+        self._closed = True
+        if self._ready is not None:
+            self._ready.set()
+        if self.handle is not None:
+            self.handle.remove()  # No-op when the router is closing the mailbox
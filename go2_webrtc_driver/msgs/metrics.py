@@ -0,0 +1,417 @@
+"""
+Data Channel Traffic Metrics
+
+Counters and histograms describing what the data channel carries, maintained
+by the message handler and the publish methods:
+
+- messages and bytes per direction, topic and message type (totals and the
+  rate over the last completed window)
+- decode time per binary message
+- subscriber callback execution time per topic
+- request -> response latency per topic and api_id
+- gauges read from other components when the metrics are collected
+  (for example in-flight requests of the future resolver)
+
+Everything is kept in plain dicts updated on the event loop, so recording a
+sample costs a dict lookup and a few additions. The metrics can be read from
+Python with ``snapshot()`` or rendered in the Prometheus text exposition format
+and served by a small local HTTP server.
+
+Usage:
+    metrics = conn.datachannel.metrics
+    print(metrics.snapshot()["traffic"])
+
+    server = await start_metrics_server(metrics, port=9108)
+    # curl http://127.0.0.1:9108/metrics
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds, from 100 us (decode, callbacks) to 10 s (requests)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+METRIC_PREFIX = "go2_datachannel"
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket bounds, Prometheus style.
+
+    Attributes:
+        buckets: Upper bounds of the buckets in seconds
+        count: Number of observations
+        sum: Sum of all observed values
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """
+        Get the cumulative count for each bucket bound.
+
+        Returns:
+            List[Tuple[float, int]]: (upper bound, count) pairs ending with +Inf
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile as the upper bound of the bucket containing it.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Optional[float]: Estimated value, None if nothing was observed
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summarize the histogram for snapshot()."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class TrafficCounter:
+    """
+    Message and byte totals for one (direction, topic, type) key.
+
+    Rates are computed over windows of ``interval`` seconds: the rate reported
+    is that of the last completed window, so it is stable between updates and
+    falls to zero once traffic stops.
+    """
+
+    __slots__ = ("messages", "bytes", "message_rate", "byte_rate",
+                 "_interval", "_window_start", "_window_messages", "_window_bytes")
+
+    def __init__(self, interval: float, now: float) -> None:
+        self.messages = 0
+        self.bytes = 0
+        self.message_rate = 0.0
+        self.byte_rate = 0.0
+        self._interval = interval
+        self._window_start = now
+        self._window_messages = 0
+        self._window_bytes = 0
+
+    def add(self, size: int, now: float) -> None:
+        """Count one message of size bytes."""
+        if now - self._window_start >= self._interval:
+            self.roll(now)
+        self.messages += 1
+        self.bytes += size
+        self._window_messages += 1
+        self._window_bytes += size
+
+    def roll(self, now: float) -> None:
+        """Close the current window if it is complete and update the rates."""
+        elapsed = now - self._window_start
+        if elapsed < self._interval:
+            return
+        self.message_rate = self._window_messages / elapsed
+        self.byte_rate = self._window_bytes / elapsed
+        self._window_start = now
+        self._window_messages = 0
+        self._window_bytes = 0
+
+
+class DataChannelMetrics:
+    """
+    Per-topic traffic counters and timing histograms for one connection.
+
+    Args:
+        rate_interval: Window in seconds over which rates are computed
+        buckets: Histogram bucket bounds in seconds
+
+    Attributes:
+        enabled: Set to False to stop recording (reads keep working)
+        traffic: TrafficCounter per (direction, topic, type)
+        decode_time: Histogram of binary payload decode time per topic
+        callback_time: Histogram of subscriber callback time per topic
+        request_latency: Histogram of request latency per (topic, api_id)
+        gauges: Registered gauge callbacks by name
+    """
+
+    def __init__(self, rate_interval: float = 1.0,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize empty metrics."""
+        if rate_interval <= 0:
+            raise ValueError("rate_interval must be positive")
+        self.enabled = True
+        self.rate_interval = rate_interval
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self.traffic: Dict[Tuple[str, str, str], TrafficCounter] = {}
+        self.decode_time: Dict[str, Histogram] = {}
+        self.callback_time: Dict[str, Histogram] = {}
+        self.request_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.gauges: Dict[str, Tuple[str, str, Callable[[], float]]] = {}
+
+    def record_message(self, direction: str, topic: Optional[str], msg_type: Optional[str],
+                       size: int) -> None:
+        """
+        Count a message sent or received on the data channel.
+
+        Args:
+            direction: "in" for received, "out" for sent messages
+            topic: Message topic ("" if it has none)
+            msg_type: Message type ("" if it has none)
+            size: Message size in bytes (characters for text messages)
+        """
+        if not self.enabled:
+            return
+        key = (direction, topic or "", msg_type or "")
+        now = time.monotonic()
+        counter = self.traffic.get(key)
+        if counter is None:
+            counter = self.traffic[key] = TrafficCounter(self.rate_interval, now)
+        counter.add(size, now)
+
+    def _observe(self, table: Dict[Any, Histogram], key: Any, seconds: float) -> None:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def observe_decode(self, topic: Optional[str], seconds: float) -> None:
+        """Record the time spent decoding one binary payload."""
+        if self.enabled:
+            self._observe(self.decode_time, topic or "", seconds)
+
+    def observe_callback(self, topic: Optional[str], seconds: float) -> None:
+        """Record the time spent in one subscriber callback."""
+        if self.enabled:
+            self._observe(self.callback_time, topic or "", seconds)
+
+    def observe_request_latency(self, topic: str, api_id: Any, seconds: float) -> None:
+        """Record the time between sending a request and receiving its response."""
+        if self.enabled:
+            self._observe(self.request_latency,
+                          (topic, "" if api_id is None else str(api_id)), seconds)
+
+    def register_gauge(self, name: str, func: Callable[[], float], help_text: str = "",
+                       kind: str = "gauge") -> None:
+        """
+        Register a value that is read whenever the metrics are collected.
+
+        Args:
+            name: Metric name without the prefix (e.g. "in_flight_requests")
+            func: Returns the current value
+            help_text: Description shown in the Prometheus output
+            kind: "gauge", or "counter" for monotonically increasing totals
+        """
+        self.gauges[name] = (kind, help_text, func)
+
+    def _read_gauges(self) -> Dict[str, float]:
+        values = {}
+        for name, (_, _, func) in self.gauges.items():
+            try:
+                values[name] = func()
+            except Exception as e:
+                logging.error(f"Error reading gauge {name}: {e}")
+        return values
+
+    def reset(self) -> None:
+        """Clear all counters and histograms."""
+        self.started_at = time.time()
+        self.traffic.clear()
+        self.decode_time.clear()
+        self.callback_time.clear()
+        self.request_latency.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current metrics as plain Python data.
+
+        Returns:
+            Dict[str, Any]: Dictionary with "traffic", "decode_time",
+            "callback_time" and "request_latency" lists, each entry holding its
+            labels and values
+
+        Example:
+            ```python
+            hot = sorted(metrics.snapshot()["traffic"],
+                         key=lambda t: t["bytes_per_second"], reverse=True)[:5]
+            ```
+        """
+        now = time.monotonic()
+        traffic = []
+        for (direction, topic, msg_type), counter in self.traffic.items():
+            counter.roll(now)
+            traffic.append({
+                "direction": direction,
+                "topic": topic,
+                "type": msg_type,
+                "messages": counter.messages,
+                "bytes": counter.bytes,
+                "messages_per_second": counter.message_rate,
+                "bytes_per_second": counter.byte_rate,
+            })
+        return {
+            "uptime": time.time() - self.started_at,
+            "traffic": traffic,
+            "decode_time": [dict(topic=topic, **h.as_dict())
+                            for topic, h in self.decode_time.items()],
+            "callback_time": [dict(topic=topic, **h.as_dict())
+                              for topic, h in self.callback_time.items()],
+            "request_latency": [dict(topic=topic, api_id=api_id, **h.as_dict())
+                                for (topic, api_id), h in self.request_latency.items()],
+            "gauges": self._read_gauges(),
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text, one sample per line
+        """
+        now = time.monotonic()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            full = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        for counter in self.traffic.values():
+            counter.roll(now)
+
+        for name, kind, help_text, attr in (
+            ("messages_total", "counter", "Messages sent or received.", "messages"),
+            ("bytes_total", "counter", "Bytes sent or received.", "bytes"),
+            ("messages_per_second", "gauge", "Message rate over the last window.", "message_rate"),
+            ("bytes_per_second", "gauge", "Byte rate over the last window.", "byte_rate"),
+        ):
+            full = family(name, kind, help_text)
+            for (direction, topic, msg_type), counter in self.traffic.items():
+                labels = _labels(direction=direction, topic=topic, type=msg_type)
+                lines.append(f"{full}{labels} {_number(getattr(counter, attr))}")
+
+        for name, help_text, table, label_names in (
+            ("decode_seconds", "Binary payload decode time.", self.decode_time, ("topic",)),
+            ("callback_seconds", "Subscriber callback execution time.", self.callback_time, ("topic",)),
+            ("request_latency_seconds", "Request to response latency.", self.request_latency,
+             ("topic", "api_id")),
+        ):
+            full = family(name, "histogram", help_text)
+            for key, histogram in table.items():
+                values = key if isinstance(key, tuple) else (key,)
+                base = dict(zip(label_names, values))
+                for bound, total in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    lines.append(f"{full}_bucket{_labels(**base, le=le)} {total}")
+                lines.append(f"{full}_sum{_labels(**base)} {_number(histogram.sum)}")
+                lines.append(f"{full}_count{_labels(**base)} {histogram.count}")
+
+        for name, value in self._read_gauges().items():
+            kind, help_text, _ = self.gauges[name]
+            full = family(name, kind, help_text or name)
+            lines.append(f"{full} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+async def start_metrics_server(metrics: DataChannelMetrics, host: str = "127.0.0.1",
+                               port: int = 9108) -> asyncio.AbstractServer:
+    """
+    Serve the metrics at ``http://host:port/metrics`` for Prometheus scraping.
+
+    The server runs on the current event loop, so it reads the metrics on the
+    same thread that updates them.
+
+    Args:
+        metrics: Metrics to serve
+        host: Interface to listen on (local only by default)
+        port: TCP port to listen on
+
+    Returns:
+        asyncio.AbstractServer: The running server; call close() to stop it
+
+    Example:
+        ```python
+        server = await start_metrics_server(conn.datachannel.metrics, port=9108)
+        ...
+        server.close()
+        ```
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            # Skip the request headers
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) > 1 else ""
+            if len(parts) > 1 and parts[0] == "GET" and path in ("/metrics", "/"):
+                status = "200 OK"
+                body = metrics.render_prometheus().encode("utf-8")
+            else:
+                status = "404 Not Found"
+                body = b"Not Found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logging.error(f"Error serving metrics: {e}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logging.info(f"Serving data channel metrics on http://{host}:{port}/metrics")
+    return server
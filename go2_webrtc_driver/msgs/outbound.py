@@ -0,0 +1,257 @@
+"""
+Outbound Message Scheduler with Priority Lanes
+
+Every message to the robot shares one SCTP stream, which is strictly FIFO:
+once a message is handed to ``RTCDataChannel.send`` it waits behind every
+byte already buffered (``bufferedAmount``). Without scheduling, a Move or
+StopMove issued during an audio or file upload sits behind megabytes of
+base64 chunks.
+
+The scheduler sorts outbound messages into three lanes:
+
+- LANE_CONTROL: motion commands (sport, obstacle avoidance, wireless
+  controller, low-level commands). Always sent immediately.
+- LANE_REQUEST: other requests, subscriptions and messages. Sent immediately
+  while ``bufferedAmount`` is below ``request_limit``, otherwise queued.
+- LANE_BULK: upload chunks. Sent only while ``bufferedAmount`` is below
+  ``bulk_limit``, so only a small amount of bulk data is ever buffered ahead
+  of a control command. Producers await ``send()`` and are paced by the
+  channel instead of by fixed sleeps.
+
+Queued messages are drained in lane order when the channel signals
+``bufferedamountlow`` (with a short polling fallback), so control latency
+during uploads is bounded by ``bulk_limit`` bytes of transmission time. The
+event fires when ``bufferedAmount`` falls to half of ``bulk_limit``; bulk
+sends alone never buffer more than ``bulk_limit``, so a threshold at the
+limit itself would never be crossed.
+
+Usage:
+    scheduler = OutboundScheduler(channel)
+    scheduler.send_nowait(message)                          # Lane from topic
+    await scheduler.send(chunk_message, LANE_BULK)          # Waits for room
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+
+from ..constants import RTC_TOPIC
+
+LANE_CONTROL = 0
+LANE_REQUEST = 1
+LANE_BULK = 2
+LANE_NAMES = ("control", "request", "bulk")
+
+CONTROL_TOPICS = frozenset((
+    RTC_TOPIC["SPORT_MOD"],
+    RTC_TOPIC["OBSTACLES_AVOID"],
+    RTC_TOPIC["WIRELESS_CONTROLLER"],
+    RTC_TOPIC["LOW_CMD"],
+))
+
+DEFAULT_REQUEST_LIMIT = 1 << 20   # Bytes buffered before requests queue
+DEFAULT_BULK_LIMIT = 64 << 10     # Bytes buffered before bulk chunks queue
+POLL_INTERVAL = 0.02              # Seconds between drain attempts without the event
+
+Message = Union[str, bytes]
+
+
+def lane_for_topic(topic: str) -> int:
+    """
+    Get the default lane of a topic.
+
+    Args:
+        topic: Message topic
+
+    Returns:
+        int: LANE_CONTROL for motion command topics, otherwise LANE_REQUEST
+    """
+    return LANE_CONTROL if topic in CONTROL_TOPICS else LANE_REQUEST
+
+
+class OutboundScheduler:
+    """
+    Sends messages to a data channel in priority order with backpressure.
+
+    Args:
+        channel: RTCDataChannel (or any object with send(), readyState and
+            bufferedAmount)
+        request_limit: Buffered bytes above which requests are queued
+        bulk_limit: Buffered bytes above which bulk messages are queued
+
+    Attributes:
+        sent: Messages sent per lane
+        queued_total: Messages that had to wait in a lane queue, per lane
+        max_buffered: Largest bufferedAmount seen when sending
+    """
+
+    def __init__(self, channel, request_limit: int = DEFAULT_REQUEST_LIMIT,
+                 bulk_limit: int = DEFAULT_BULK_LIMIT) -> None:
+        """Initialize empty lanes and hook the channel's bufferedamountlow event."""
+        if bulk_limit < 1 or request_limit < bulk_limit:
+            raise ValueError("limits must satisfy 1 <= bulk_limit <= request_limit")
+
+        self.channel = channel
+        self.request_limit = request_limit
+        self.bulk_limit = bulk_limit
+        self.sent = [0, 0, 0]
+        self.queued_total = [0, 0, 0]
+        self.max_buffered = 0
+        # Lane queues of (message, future or None); control is never queued
+        self._lanes: Tuple[Deque, Deque, Deque] = (deque(), deque(), deque())
+        self._poll: Optional[asyncio.TimerHandle] = None
+
+        try:
+            channel.bufferedAmountLowThreshold = bulk_limit // 2
+            channel.on("bufferedamountlow", self._drain)
+        except AttributeError:
+            pass  # Channel without the event; rely on polling
+
+    def buffered_amount(self) -> int:
+        """
+        Get the bytes buffered by the channel but not yet transmitted.
+
+        Returns:
+            int: The channel's bufferedAmount
+        """
+        return getattr(self.channel, "bufferedAmount", 0) or 0
+
+    def _has_room(self, lane: int, size: int) -> bool:
+        if lane == LANE_CONTROL:
+            return True
+        buffered = self.buffered_amount()
+        # An idle channel always takes one message, however large
+        return buffered == 0 or buffered + size <= (
+            self.request_limit if lane == LANE_REQUEST else self.bulk_limit)
+
+    def _transmit(self, message: Message, lane: int) -> None:
+        self.channel.send(message)
+        self.sent[lane] += 1
+        buffered = self.buffered_amount()
+        if buffered > self.max_buffered:
+            self.max_buffered = buffered
+
+    def send_nowait(self, message: Message, lane: Optional[int] = None,
+                    topic: str = "") -> None:
+        """
+        Send a message now, or queue it behind its lane.
+
+        Args:
+            message: Serialized message
+            lane: LANE_CONTROL, LANE_REQUEST or LANE_BULK; derived from the
+                topic if None
+            topic: Message topic, used to pick the lane
+        """
+        if lane is None:
+            lane = lane_for_topic(topic)
+        if not any(self._lanes[:lane + 1]) and self._has_room(lane, len(message)):
+            self._transmit(message, lane)
+            return
+        self._lanes[lane].append((message, None))
+        self.queued_total[lane] += 1
+        self._schedule_poll()
+
+    async def send(self, message: Message, lane: Optional[int] = None, topic: str = "") -> None:
+        """
+        Send a message, waiting until it has been handed to the channel.
+
+        Bulk producers should await this for every chunk so they are paced by
+        the channel's drain rate.
+
+        Args:
+            message: Serialized message
+            lane: LANE_CONTROL, LANE_REQUEST or LANE_BULK; derived from the
+                topic if None
+            topic: Message topic, used to pick the lane
+
+        Raises:
+            ConnectionError: If the channel closes before the message is sent
+        """
+        if lane is None:
+            lane = lane_for_topic(topic)
+        if not any(self._lanes[:lane + 1]) and self._has_room(lane, len(message)):
+            self._transmit(message, lane)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._lanes[lane].append((message, future))
+        self.queued_total[lane] += 1
+        self._schedule_poll()
+        await future
+
+    def _drain(self) -> None:
+        """Send queued messages in lane order while the channel has room."""
+        if self._poll is not None:
+            self._poll.cancel()
+            self._poll = None
+        if getattr(self.channel, "readyState", "open") != "open":
+            self.cancel_all()
+            return
+        for lane, queue in enumerate(self._lanes):
+            while queue:
+                message, future = queue[0]
+                if future is not None and future.done():
+                    queue.popleft()  # Sender gave up (cancelled)
+                    continue
+                if not self._has_room(lane, len(message)):
+                    self._schedule_poll()
+                    return
+                queue.popleft()
+                try:
+                    self._transmit(message, lane)
+                except Exception as e:
+                    logging.error(f"Failed to send queued {LANE_NAMES[lane]} message: {e}")
+                    if future is not None:
+                        future.set_exception(e)
+                    continue
+                if future is not None:
+                    future.set_result(None)
+
+    def _schedule_poll(self) -> None:
+        if self._poll is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._poll = loop.call_later(POLL_INTERVAL, self._drain)
+
+    def queued(self) -> int:
+        """
+        Get the number of queued messages.
+
+        Returns:
+            int: Messages waiting in all lanes
+        """
+        return sum(len(queue) for queue in self._lanes)
+
+    def cancel_all(self, reason: str = "Data channel closed") -> None:
+        """
+        Drop all queued messages, failing their senders.
+
+        Args:
+            reason: Message of the ConnectionError set on waiting senders
+        """
+        if self._poll is not None:
+            self._poll.cancel()
+            self._poll = None
+        for queue in self._lanes:
+            while queue:
+                _, future = queue.popleft()
+                if future is not None and not future.done():
+                    future.set_exception(ConnectionError(reason))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-lane counters.
+
+        Returns:
+            Dict[str, Any]: buffered_amount, max_buffered and per-lane sent,
+            queued (now) and queued_total
+        """
+        lanes: Dict[str, Dict[str, int]] = {}
+        for lane, name in enumerate(LANE_NAMES):
+            lanes[name] = {"sent": self.sent[lane], "queued": len(self._lanes[lane]),
+                           "queued_total": self.queued_total[lane]}
+        return {"buffered_amount": self.buffered_amount(), "max_buffered": self.max_buffered,
+                "lanes": lanes}
@@ -0,0 +1,221 @@
+"""
+Pre-serialized Request Templates
+
+Control loops send the same few API calls (Move, BalanceStand, StopMove)
+thousands of times per session. ``publish_request_new`` rebuilds the nested
+request dicts, JSON-encodes the parameter and the whole message, and walks the
+result again to find the request ID - on every call.
+
+A ``PreparedRequest`` compiles a topic, ``api_id`` and parameter layout into
+one format string once. Per call it only encodes the parameter values (in a
+single call of the active JSON codec) and the request ID into that string;
+the response future is registered directly under the request ID.
+
+The message has the same structure as what ``publish_request_new`` sends (the
+parameter is a JSON string inside the JSON message), always in compact form:
+with the orjson or msgspec codec the text is identical, with the stdlib codec
+it only lacks the whitespace after separators. Non-finite floats are rejected
+on every codec.
+
+Usage:
+    move = pub_sub.prepare_request(RTC_TOPIC["SPORT_MOD"], SPORT_CMD["Move"],
+                                   parameter_keys=("x", "y", "z"))
+    await move(0.3, 0.0, 0.1)               # Waits for the response
+    move.send_nowait(0.3, 0.0, 0.1)         # Fire-and-forget
+
+    stop = pub_sub.prepare_request(RTC_TOPIC["SPORT_MOD"], SPORT_CMD["StopMove"])
+    await stop()
+"""
+
+import json
+import math
+import numbers
+from typing import Any, Optional, Sequence
+
+from ..constants import DATA_CHANNEL_TYPE
+from . import json_codec
+
+
+def _escape(text: str) -> str:
+    """Escape text for use inside a JSON string literal (without the quotes)."""
+    return json.dumps(text)[1:-1]
+
+
+def _literal(text: str) -> str:
+    """Protect text from %-formatting."""
+    return text.replace("%", "%%")
+
+
+def _format_value(value: Any) -> str:
+    """
+    Format one parameter value as JSON, escaped for the parameter string.
+
+    Raises:
+        ValueError: If value is a non-finite float
+    """
+    kind = type(value)
+    if kind is float:
+        if value - value != 0.0:  # inf or nan
+            raise ValueError(f"Parameter value {value} is not valid JSON")
+        return float.__repr__(value)
+    if kind is int:
+        return int.__repr__(value)
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    if isinstance(value, numbers.Integral):
+        return int.__repr__(int(value))
+    if isinstance(value, numbers.Real):
+        value = float(value)  # Also NumPy scalars
+        if not math.isfinite(value):
+            raise ValueError(f"Parameter value {value} is not valid JSON")
+        return float.__repr__(value)
+    return _escape(json_codec.dumps(value))
+
+
+class PreparedRequest:
+    """
+    A request to one topic and api_id, serialized from cached fragments.
+
+    Args:
+        pub_sub: WebRTCDataChannelPubSub the request is sent through
+        topic: API request topic
+        api_id: API identifier
+        parameter_keys: Names of the parameter fields supplied positionally
+            on every call, in order; None for requests with a fixed parameter
+        parameter: Fixed parameter (dict or pre-encoded string) used when
+            parameter_keys is None
+        priority: Add the robot-side priority policy to the header
+        lane: Outbound lane; derived from the topic if None
+
+    Attributes:
+        topic: API request topic
+        api_id: API identifier
+        parameter_keys: Names of the positional parameter fields
+        calls: Number of requests sent from this template
+    """
+
+    __slots__ = ("pub_sub", "topic", "api_id", "parameter_keys", "lane", "calls", "_template")
+
+    def __init__(self, pub_sub, topic: str, api_id: int,
+                 parameter_keys: Optional[Sequence[str]] = None,
+                 parameter: Any = None, priority: bool = False,
+                 lane: Optional[int] = None) -> None:
+        """Compile the fragments of the request text."""
+        if parameter_keys is not None and parameter is not None:
+            raise ValueError("Pass either parameter_keys or a fixed parameter, not both")
+
+        self.pub_sub = pub_sub
+        self.topic = topic
+        self.api_id = api_id
+        self.parameter_keys = tuple(parameter_keys) if parameter_keys is not None else None
+        self.lane = lane
+        self.calls = 0
+
+        # {"type":"req","topic":T,"data":{"header":{"identity":{"id":ID,"api_id":A}},"parameter":P}}
+        # compiled into one %-format string with a slot for the ID and each value
+        head = _literal(f'{{"type":{json.dumps(DATA_CHANNEL_TYPE["REQUEST"])},'
+                        f'"topic":{json.dumps(topic)},"data":{{"header":{{"identity":{{"id":') + "%d"
+        policy = ',"policy":{"priority":1}' if priority else ""
+        mid = _literal(f',"api_id":{json.dumps(api_id)}}}{policy}}},"parameter":')
+
+        if self.parameter_keys is None:
+            if parameter is None:
+                encoded = ""
+            elif isinstance(parameter, str):
+                encoded = parameter
+            else:
+                encoded = json_codec.dumps(parameter)
+            param = _literal(json.dumps(encoded))
+        else:
+            if not self.parameter_keys:
+                raise ValueError("parameter_keys must not be empty")
+            # "{\"x\":%s,\"y\":%s}" - the parameter is a JSON string holding JSON
+            param = '"{' + ",".join(_literal(_escape(json.dumps(key) + ":")) + "%s"
+                                    for key in self.parameter_keys) + '}"'
+        self._template = head + mid + param + "}}"
+
+    def render(self, request_id: int, *values: Any) -> str:
+        """
+        Build the message text for one call.
+
+        Args:
+            request_id: Request ID for header.identity.id
+            *values: One value per parameter key
+
+        Returns:
+            str: Serialized message
+
+        Raises:
+            ValueError: If the number of values does not match parameter_keys
+        """
+        keys = self.parameter_keys
+        if len(values) != (len(keys) if keys else 0):
+            raise ValueError(f"Request to {self.topic} api_id {self.api_id} takes "
+                             f"{len(keys) if keys else 0} values ({', '.join(keys or ())}), "
+                             f"got {len(values)}")
+        if not values:
+            return self._template % request_id
+        # Fast path: encode all values in one call of the active codec. Plain
+        # numbers need no escaping inside the parameter string and contain no
+        # commas, so the array text splits into one piece per value. Text with
+        # an "n" or "N" may hold null, NaN or Infinity (orjson and msgspec
+        # write non-finite floats as null), which _format_value checks.
+        try:
+            text = json_codec.dumps(values)
+        except (TypeError, ValueError):
+            text = '"'
+        if not any(c in text for c in '"\\nN'):
+            pieces = text[1:-1].split(",")
+            if len(pieces) == len(values):
+                return self._template % (request_id, *map(str.strip, pieces))
+        return self._template % (request_id, *map(_format_value, values))
+
+    async def __call__(self, *values: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Send the request and wait for the response.
+
+        Args:
+            *values: One value per parameter key
+            timeout: Seconds to wait for the response; None uses the
+                resolver's default deadline
+
+        Returns:
+            Any: API response from the robot
+        """
+        pub_sub = self.pub_sub
+        async with pub_sub.request_mux.request(self.topic, None, self.api_id) as request_id:
+            message = self.render(request_id, *values)
+            self.calls += 1
+            return await pub_sub.publish_serialized(
+                self.topic, message, DATA_CHANNEL_TYPE["REQUEST"], request_id,
+                timeout, self.lane, self.api_id)
+
+    def send_nowait(self, *values: Any) -> int:
+        """
+        Send the request without waiting for a response.
+
+        Args:
+            *values: One value per parameter key
+
+        Returns:
+            int: Request ID used
+        """
+        pub_sub = self.pub_sub
+        request_id = pub_sub.request_mux.next_id()
+        message = self.render(request_id, *values)
+        if pub_sub.channel.readyState != "open":
+            raise ConnectionError("Data channel is not open")
+        pub_sub.outbound.send_nowait(message, self.lane, self.topic)
+        pub_sub.metrics.record_message("out", self.topic, DATA_CHANNEL_TYPE["REQUEST"], len(message))
+        if pub_sub.recorder is not None:
+            pub_sub.recorder.record("out", message, self.topic)
+        self.calls += 1
+        return request_id
+
+    def __repr__(self) -> str:
+        keys = ", ".join(self.parameter_keys) if self.parameter_keys else ""
+        return f"PreparedRequest({self.topic!r}, api_id={self.api_id}, ({keys}))"
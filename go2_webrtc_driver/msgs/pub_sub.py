@@ -9,6 +9,15 @@ The pub-sub system supports:
 - Topic-based message routing
 - Asynchronous request-response communication
 - Subscription management with callbacks
+- Multiple independent subscribers per topic and wildcard patterns
+- Reference-counted robot-side subscriptions, restored after reconnects,
+  see subscription_manager.py
+- Latest-value mailboxes ("keep last N") for high-rate topics
+- Async-iterator streams with bounded queues and explicit overflow policies
+- Per-subscription decimation (every_nth, max_rate_hz) decided before the
+  payload is parsed or decoded
+- Outbound priority lanes (control > requests > bulk) with backpressure from
+  the channel's bufferedAmount, see outbound.py
 - Future-based result handling
 - Automatic message serialization/deserialization
 - Connection state management
@@ -18,7 +27,7 @@ Key Features:
 - Request-response pattern with automatic ID generation
 - Priority-based message handling
 - Robust error handling and connection monitoring
-- JSON message serialization
+- JSON message serialization (orjson/msgspec when installed, see json_codec)
 - Flexible subscription management
 
 Usage Example:
@@ -62,13 +71,20 @@ Version: 1.0
 """
 
 import asyncio
-import json
 import time
-import random
 import logging
-from typing import Dict, Any, Optional, Callable, Awaitable
+from typing import Dict, Any, Optional, Callable, Awaitable, Sequence, Tuple, Union
 from ..constants import DATA_CHANNEL_TYPE
+from . import json_codec
 from .future_resolver import FutureResolver
+from .mailbox import SubscriptionMailbox
+from .topic_router import SubscriptionHandle
+from .subscription_manager import SubscriptionManager
+from .metrics import DataChannelMetrics
+from .stream import MessageStream
+from .request_mux import RequestMultiplexer
+from .outbound import OutboundScheduler, LANE_BULK
+from .prepared_request import PreparedRequest
 from ..util import get_nested_field
 
 
@@ -92,7 +108,16 @@ class WebRTCDataChannelPubSub:
     Attributes:
         channel: WebRTC data channel for communication
         future_resolver (FutureResolver): Manages pending async operations
-        subscriptions (Dict[str, Callable]): Topic-to-callback mappings
+        request_mux (RequestMultiplexer): Request IDs, in-flight table and
+            per-topic concurrency windows for publish_request_new()
+        subscriptions (SubscriptionManager): Robot-side subscriptions,
+            reference-counted by local consumer
+        router (TopicRouter): Local subscribers (callbacks and mailboxes) by
+            topic, owned by the subscription manager
+        streams (Set[MessageStream]): Streams opened with stream()
+        recorder (Optional[CaptureRecorder]): Capture receiving sent messages
+        outbound (OutboundScheduler): Priority lanes all messages are sent through
+        metrics (DataChannelMetrics): Traffic counters and timing histograms
     
     Example:
         ```python
@@ -116,12 +141,17 @@ class WebRTCDataChannelPubSub:
         ```
     """
 
-    def __init__(self, channel) -> None:
+    def __init__(self, channel, metrics: Optional[DataChannelMetrics] = None,
+                 subscriptions: Optional[SubscriptionManager] = None) -> None:
         """
         Initialize the WebRTC Data Channel Pub-Sub system
         
         Args:
             channel: WebRTC data channel instance for communication
+            metrics: Metrics to record traffic and timings in (a new instance
+                is created if not given)
+            subscriptions: Subscription manager shared across reconnects, with
+                the local subscribers (a new instance if not given)
             
         Example:
             ```python
@@ -130,19 +160,56 @@ class WebRTCDataChannelPubSub:
             ```
         """
         self.channel = channel
+        self.outbound = OutboundScheduler(channel)
         self.future_resolver = FutureResolver()
-        self.subscriptions = {}  # Dictionary to hold callbacks keyed by topic
+        self.request_mux = RequestMultiplexer()
+        self.metrics = metrics if metrics is not None else DataChannelMetrics()
+        self.subscriptions = subscriptions if subscriptions is not None else SubscriptionManager(self.metrics)
+        self.subscriptions.attach(self._send_subscription)
+        self.router = self.subscriptions.router  # Local subscribers keyed by topic or pattern
+        self._register_gauges()
+        self.streams = set()  # Open MessageStreams, closed with the channel
+        self.recorder = None  # CaptureRecorder set by WebRTCDataChannel.start_capture()
     
-    def run_resolve(self, message: Dict[str, Any]) -> None:
+    def _register_gauges(self) -> None:
+        """Expose the future resolver's pending state through the metrics."""
+        resolver = self.future_resolver
+        self.metrics.register_gauge("in_flight_requests", resolver.in_flight,
+                                    "Requests waiting for a response.")
+        self.metrics.register_gauge("chunk_buffers", lambda: len(resolver.chunk_assembler),
+                                    "Partially received chunked messages.")
+        self.metrics.register_gauge("chunk_buffer_bytes", lambda: resolver.chunk_assembler.nbytes,
+                                    "Memory held by partially received chunked messages.")
+        self.metrics.register_gauge("chunk_evictions_total", lambda: resolver.chunk_assembler.evicted,
+                                    "Chunked messages dropped to stay within the memory budget.",
+                                    "counter")
+        self.metrics.register_gauge("queued_requests", self.request_mux.queued,
+                                    "Requests waiting for a per-topic window slot.")
+        self.metrics.register_gauge("request_timeouts_total", lambda: resolver.timed_out,
+                                    "Requests failed because their deadline passed.", "counter")
+        self.metrics.register_gauge("outbound_queued", self.outbound.queued,
+                                    "Outbound messages waiting in a priority lane.")
+        self.metrics.register_gauge("outbound_buffered_bytes", self.outbound.buffered_amount,
+                                    "Bytes buffered by the data channel (bufferedAmount).")
+        self.metrics.register_gauge("robot_subscriptions", lambda: len(self.subscriptions.topics()),
+                                    "Topics the robot is subscribed to for local consumers.")
+
+    def run_resolve(self, message: Dict[str, Any],
+                    handles: Optional[Tuple[SubscriptionHandle, ...]] = None) -> None:
         """
         Process incoming messages and route them to appropriate handlers
         
         This method handles message resolution by:
-        1. Resolving pending futures for request-response patterns
-        2. Routing messages to subscribed topic callbacks
+        1. Resolving pending futures for request-response patterns; the
+           resolver is only entered when its O(1) wants() check says a
+           future could match, so streaming topics skip it entirely
+        2. Routing messages to every subscriber (callback or mailbox) whose
+           topic or pattern matches
         
         Args:
             message (Dict[str, Any]): Incoming message from WebRTC data channel
+            handles (Optional[Tuple]): Subscribers chosen by select_consumers()
+                before the message was decoded; chosen now if None
             
         Example:
             ```python
@@ -154,18 +221,63 @@ class WebRTCDataChannelPubSub:
             This method is called automatically by the WebRTC message handler
             and should not be called directly in most cases.
         """
-        self.future_resolver.run_resolve_for_topic(message)
+        resolver = self.future_resolver
+        if resolver.pending_callbacks and resolver.wants(message.get("type"), message.get("topic")):
+            resolver.run_resolve_for_topic(message)
 
-        # Extract the topic from the message
-        topic = message.get("topic")
-        if topic in self.subscriptions:
-            # Call the registered callback with the message
-            callback = self.subscriptions[topic]
-            callback(message)
+        # Deliver the message to all matching subscribers
+        self.router.dispatch(message, handles)
+
+    def select_consumers(self, topic: str, msg_type: Optional[str] = None
+                         ) -> Optional[Tuple[SubscriptionHandle, ...]]:
+        """
+        Apply subscription decimation to an incoming message before decoding it
+        
+        Must be called once per message, and the result passed to
+        run_resolve() when the message has been decoded.
+        
+        Args:
+            topic (str): Topic of the incoming message
+            msg_type (Optional[str]): Type of the incoming message
+            
+        Returns:
+            Optional[Tuple[SubscriptionHandle, ...]]: Subscribers that take the
+            message, or None if neither a subscriber nor a future does (the
+            message can be dropped without decoding)
+        """
+        handles = self.router.select(topic)
+        if handles:
+            return handles
+        if msg_type is None:
+            wanted = bool(self.future_resolver.pending_callbacks)
+        else:
+            wanted = self.future_resolver.wants(msg_type, topic)
+        return handles if wanted else None
+
+    def has_consumers(self, topic: str, msg_type: Optional[str] = None) -> bool:
+        """
+        Check whether an incoming message on a topic would be used locally
+        
+        A message is used if any callback or mailbox subscription matches the
+        topic, or if a future could be waiting for it.
         
+        Args:
+            topic (str): Topic of the incoming message
+            msg_type (Optional[str]): Type of the incoming message; if None,
+                any pending future counts as a consumer
+            
+        Returns:
+            bool: True if the message has at least one consumer
+        """
+        if self.router.has_subscribers(topic):
+            return True
+        if msg_type is None:
+            return bool(self.future_resolver.pending_callbacks)
+        return self.future_resolver.wants(msg_type, topic)
 
     async def publish(self, topic: str, data: Optional[Dict[str, Any]] = None, 
-                     msg_type: Optional[str] = None) -> Any:
+                     msg_type: Optional[str] = None, timeout: Optional[float] = None,
+                     lane: Optional[int] = None) -> Any:
         """
         Publish a message to a topic and wait for response
         
@@ -177,12 +289,18 @@ class WebRTCDataChannelPubSub:
             topic (str): Target topic for the message
             data (Optional[Dict[str, Any]]): Message payload data
             msg_type (Optional[str]): Message type (defaults to MSG)
+            timeout (Optional[float]): Seconds to wait for the response; None
+                uses the resolver's default deadline, math.inf waits forever
+            lane (Optional[int]): Outbound lane (LANE_CONTROL, LANE_REQUEST,
+                LANE_BULK); derived from the topic if None. Bulk messages
+                wait for room in the channel before they are sent.
             
         Returns:
             Any: Response from the message recipient
             
         Raises:
-            Exception: If data channel is not open
+            ConnectionError: If the data channel is not open or closes while
+                waiting
             asyncio.TimeoutError: If no response is received within timeout
             
         Example:
@@ -200,42 +318,82 @@ class WebRTCDataChannelPubSub:
             This method will block until a response is received or timeout occurs.
             For fire-and-forget messages, use publish_without_callback().
         """
-        channel = self.channel
-        future = asyncio.get_event_loop().create_future()
-
-        if channel.readyState == "open":
-            message_dict = {
-                "type": msg_type or DATA_CHANNEL_TYPE["MSG"],
-                "topic": topic
-            }
-            # Only include "data" if it's not None
-            if data is not None:
-                message_dict["data"] = data
+        msg_type = msg_type or DATA_CHANNEL_TYPE["MSG"]
+        message_dict = {
+            "type": msg_type,
+            "topic": topic
+        }
+        # Only include "data" if it's not None
+        if data is not None:
+            message_dict["data"] = data
+
+        # Convert the dictionary to a JSON string
+        message = json_codec.dumps(message_dict) if self.channel.readyState == "open" else ""
+
+        # The response is matched by this identifier
+        uuid = (
+            get_nested_field(data, "uuid") or
+            get_nested_field(data, "header", "identity", "id") or 
+            get_nested_field(data, "req_uuid")
+        )
+        return await self.publish_serialized(
+            topic, message, msg_type, uuid, timeout, lane,
+            get_nested_field(data, "header", "identity", "api_id"))
+
+    async def publish_serialized(self, topic: str, message: str, msg_type: str, uuid: Any,
+                                 timeout: Optional[float] = None, lane: Optional[int] = None,
+                                 api_id: Any = None) -> Any:
+        """
+        Send an already serialized message and wait for its response
+        
+        This is the sending half of publish(), for callers that build the
+        JSON text themselves (see PreparedRequest).
+        
+        Args:
+            topic (str): Target topic of the message
+            message (str): Serialized message
+            msg_type (str): Message type, used to match the response
+            uuid (Any): Identifier the response carries (None to match by
+                type and topic)
+            timeout (Optional[float]): Seconds to wait for the response
+            lane (Optional[int]): Outbound lane; derived from the topic if None
+            api_id (Any): API identifier, used to label the latency
             
-            # Convert the dictionary to a JSON string
-            message = json.dumps(message_dict)
+        Returns:
+            Any: Response from the message recipient
+            
+        Raises:
+            ConnectionError: If the data channel is not open or closes while
+                waiting
+            asyncio.TimeoutError: If no response is received within timeout
+        """
+        future = asyncio.get_event_loop().create_future()
 
-            channel.send(message)
+        if self.channel.readyState == "open":
+            if lane == LANE_BULK:
+                await self.outbound.send(message, lane, topic)
+            else:
+                self.outbound.send_nowait(message, lane, topic)
+            self.metrics.record_message("out", topic, msg_type, len(message))
+            if self.recorder is not None:
+                self.recorder.record("out", message, topic)
 
-            # Log the message being published
-            logging.debug(f"> message sent: {message}")
+            # Log the message being published (formatted only when enabled)
+            logging.debug("> message sent: %s", message)
 
             # Store the future so it can be completed when the response is received
-            uuid = (
-                get_nested_field(data, "uuid") or
-                get_nested_field(data, "header", "identity", "id") or 
-                get_nested_field(data, "req_uuid")
-            )
-
-            self.future_resolver.save_resolve(msg_type or DATA_CHANNEL_TYPE["MSG"], topic, future, uuid)
+            self.future_resolver.save_resolve(msg_type, topic, future, uuid, timeout)
         else:
-            future.set_exception(Exception("Data channel is not open"))
+            future.set_exception(ConnectionError("Data channel is not open"))
 
-        return await future
+        sent_at = time.perf_counter()
+        response = await future
+        self.metrics.observe_request_latency(topic, api_id, time.perf_counter() - sent_at)
+        return response
     
 
     def publish_without_callback(self, topic: str, data: Optional[Dict[str, Any]] = None, 
-                                msg_type: Optional[str] = None) -> None:
+                                msg_type: Optional[str] = None, lane: Optional[int] = None) -> None:
         """
         Publish a message without waiting for response (fire-and-forget)
         
@@ -247,6 +405,7 @@ class WebRTCDataChannelPubSub:
             topic (str): Target topic for the message
             data (Optional[Dict[str, Any]]): Message payload data
             msg_type (Optional[str]): Message type (defaults to MSG)
+            lane (Optional[int]): Outbound lane; derived from the topic if None
             
         Raises:
             Exception: If data channel is not open
@@ -277,17 +436,61 @@ class WebRTCDataChannelPubSub:
                 message_dict["data"] = data
             
             # Convert the dictionary to a JSON string
-            message = json.dumps(message_dict)
+            message = json_codec.dumps(message_dict)
                 
-            self.channel.send(message)
+            self.outbound.send_nowait(message, lane, topic)
+            self.metrics.record_message("out", topic, message_dict["type"], len(message))
+            if self.recorder is not None:
+                self.recorder.record("out", message, topic)
 
             # Log the message being published
             logging.debug(f"> message sent: {message}")
         else:
             Exception("Data channel is not open")
+
+    async def publish_bulk(self, topic: str, data: Optional[Dict[str, Any]] = None,
+                           msg_type: Optional[str] = None) -> None:
+        """
+        Send one chunk of a bulk transfer without waiting for a response
+        
+        The message goes through the bulk lane: it is only handed to the
+        channel while little data is buffered, so control commands are never
+        stuck behind an upload. Awaiting each chunk paces the producer.
+        
+        Args:
+            topic (str): Target topic for the message
+            data (Optional[Dict[str, Any]]): Message payload data
+            msg_type (Optional[str]): Message type (defaults to MSG)
+            
+        Raises:
+            ConnectionError: If the data channel is not open or closes while
+                the chunk is queued
+            
+        Example:
+            ```python
+            for chunk_message in chunk_messages:
+                await pubsub.publish_bulk("", chunk_message, DATA_CHANNEL_TYPE["RTC_INNER_REQ"])
+            ```
+        """
+        if self.channel.readyState != "open":
+            raise ConnectionError("Data channel is not open")
+
+        message_dict = {
+            "type": msg_type or DATA_CHANNEL_TYPE["MSG"],
+            "topic": topic
+        }
+        if data is not None:
+            message_dict["data"] = data
+        message = json_codec.dumps(message_dict)
+
+        await self.outbound.send(message, LANE_BULK)
+        self.metrics.record_message("out", topic, message_dict["type"], len(message))
+        if self.recorder is not None:
+            self.recorder.record("out", message, topic)
         
 
-    async def publish_request_new(self, topic: str, options: Optional[Dict[str, Any]] = None) -> Any:
+    async def publish_request_new(self, topic: str, options: Optional[Dict[str, Any]] = None,
+                                  timeout: Optional[float] = None, lane: Optional[int] = None) -> Any:
         """
         Publish a structured API request with automatic ID generation
         
@@ -302,12 +505,17 @@ class WebRTCDataChannelPubSub:
                 - parameter (Union[str, Dict]): Request parameters
                 - id (int): Custom request ID (auto-generated if not provided)
                 - priority (int): Request priority (adds priority policy)
+            timeout (Optional[float]): Seconds to wait for the response; None
+                uses the resolver's default deadline
+            lane (Optional[int]): Outbound lane; derived from the topic if
+                None (LANE_BULK for upload chunks)
                 
         Returns:
             Any: API response from the robot
             
         Raises:
             Exception: If api_id is not provided or data channel is not open
+            ValueError: If a caller-chosen "id" is already in flight
             asyncio.TimeoutError: If no response is received within timeout
             
         Example:
@@ -335,7 +543,8 @@ class WebRTCDataChannelPubSub:
             
         Request Format:
             The method creates a structured request with:
-            - header.identity.id: Unique request identifier
+            - header.identity.id: Request identifier, unique among requests
+              in flight (allocated by request_mux unless "id" is given)
             - header.identity.api_id: API function identifier
             - header.policy.priority: Priority level (if specified)
             - parameter: Request parameters (JSON serialized)
@@ -343,51 +552,126 @@ class WebRTCDataChannelPubSub:
         Note:
             This method is specifically designed for the Unitree Go2 API protocol.
             The api_id parameter is required and must match the target API function.
+            Requests can be pipelined with asyncio.gather(); use
+            request_mux.set_window(topic, n) to bound how many are outstanding
+            per topic.
         """
-        # Generate a unique identifier
-        generated_id = int(time.time() * 1000) % 2147483648 + random.randint(0, 1000)
-        
         # Check if api_id is provided
         if not (options and "api_id" in options):
             print("Error: Please provide app id")
             return asyncio.Future().set_exception(Exception("Please provide app id"))
 
-        # Build the request header and parameter
-        request_payload = {
-            "header": {
-                "identity": {
-                    "id": options.get("id", generated_id),
-                    "api_id": options.get("api_id", 0)
-                }
-            },
-            "parameter": ""
-        }
+        api_id = options.get("api_id", 0)
+
+        # Reserve a slot in the topic's window and a unique request ID
+        async with self.request_mux.request(topic, options.get("id"), api_id) as request_id:
+            # Build the request header and parameter
+            request_payload = {
+                "header": {
+                    "identity": {
+                        "id": request_id,
+                        "api_id": api_id
+                    }
+                },
+                "parameter": ""
+            }
 
-        # Add data to parameter
-        if options and "parameter" in options:
-            request_payload["parameter"] = options["parameter"] if isinstance(options["parameter"], str) else json.dumps(options["parameter"])
+            # Add data to parameter
+            if options and "parameter" in options:
+                request_payload["parameter"] = options["parameter"] if isinstance(options["parameter"], str) else json_codec.dumps(options["parameter"])
 
-        # Add priority if specified
-        if options and "priority" in options:
-            request_payload["header"]["policy"] = {
-                "priority": 1
-            }
+            # Add priority if specified
+            if options and "priority" in options:
+                request_payload["header"]["policy"] = {
+                    "priority": 1
+                }
 
-        # Publish the request
-        return await self.publish(topic, request_payload, DATA_CHANNEL_TYPE["REQUEST"])
+            # Publish the request
+            return await self.publish(topic, request_payload, DATA_CHANNEL_TYPE["REQUEST"], timeout,
+                                      lane)
     
-    def subscribe(self, topic: str, callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+    def prepare_request(self, topic: str, api_id: int,
+                        parameter_keys: Optional[Sequence[str]] = None,
+                        parameter: Any = None, priority: bool = False,
+                        lane: Optional[int] = None) -> PreparedRequest:
+        """
+        Compile a reusable request template for a topic and api_id
+        
+        For API calls repeated at high rates (Move, StopMove, ...). The
+        template caches the serialized message fragments, so each call only
+        formats the request ID and parameter values.
+        
+        Args:
+            topic (str): API endpoint topic
+            api_id (int): API identifier
+            parameter_keys (Optional[Sequence[str]]): Parameter fields whose
+                values are passed positionally on each call
+            parameter (Any): Fixed parameter when parameter_keys is None
+            priority (bool): Add the priority policy to the header
+            lane (Optional[int]): Outbound lane; derived from the topic if None
+            
+        Returns:
+            PreparedRequest: Awaitable template; call it with the values
+            
+        Example:
+            ```python
+            move = pubsub.prepare_request("rt/api/sport/request", 1008, ("x", "y", "z"))
+            response = await move(0.3, 0.0, 0.0)
+            ```
+        """
+        return PreparedRequest(self, topic, api_id, parameter_keys, parameter, priority, lane)
+
+    def subscribe(self, topic: str, callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  keep_last: Optional[int] = None, every_nth: int = 1,
+                  max_rate_hz: Optional[float] = None
+                  ) -> Union[SubscriptionHandle, SubscriptionMailbox, None]:
         """
         Subscribe to a topic with optional callback function
         
         This method subscribes to a topic and registers a callback function
-        to handle incoming messages. The subscription is sent to the robot,
-        and the callback will be called for each received message.
+        to handle incoming messages. The callback will be called for each
+        received message.
+        
+        Every subscriber holds a reference to the robot-side subscription:
+        the first one sends SUBSCRIBE, and removing the last one (through
+        its handle, the mailbox, or unsubscribe()) sends UNSUBSCRIBE. A call
+        without callback or keep_last holds a reference until unsubscribe().
+        Referenced topics are re-subscribed automatically after a reconnect.
+        
+        Any number of callbacks can subscribe to the same topic; each call
+        returns its own handle, which removes only that subscriber. The topic
+        may also be a wildcard pattern ("rt/utlidar/*", "rt/**"), which matches
+        messages of every concrete topic the robot is sending.
+        
+        For high-rate topics, pass keep_last to get a mailbox instead: the data
+        channel overwrites its oldest slot and the consumer reads at its own
+        pace, so a slow consumer never builds a backlog or stalls the handler.
+        
+        Consumers that need a topic at a lower rate than the robot sends it
+        pass every_nth and/or max_rate_hz. Skipped messages are never parsed
+        or decoded for this subscriber, so a 2 Hz LiDAR preview costs a header
+        parse for the other frames instead of a full voxel decode.
         
         Args:
-            topic (str): Topic to subscribe to
+            topic (str): Topic or wildcard pattern to subscribe to
             callback (Optional[Callable]): Function to call when messages arrive
                 The callback receives a single argument: the message dictionary
+            keep_last (Optional[int]): If set, keep the last N messages of the
+                topic in a mailbox (1 = latest only). Cannot be combined with
+                callback.
+            every_nth (int): Deliver only every n-th message of the topic
+            max_rate_hz (Optional[float]): Deliver at most this many messages
+                per second; applied after every_nth
+                
+        Returns:
+            Union[SubscriptionHandle, SubscriptionMailbox, None]: The mailbox if
+            keep_last was given, the subscription handle if a callback was given,
+            otherwise None
+            
+        Raises:
+            ValueError: If both callback and keep_last are given, decimation is
+                requested without either, or the pattern or decimation
+                settings are invalid
                 
         Example:
             ```python
@@ -396,29 +680,91 @@ class WebRTCDataChannelPubSub:
                 state = message.get('data', {})
                 print(f"Robot position: {state.get('position')}")
             
-            pubsub.subscribe("rt/lowstate", handle_robot_state)
+            handle = pubsub.subscribe("rt/lowstate", handle_robot_state)
+            
+            # A second, independent subscriber for the same topic
+            recorder = pubsub.subscribe("rt/lowstate", record_message)
+            
+            # Remove only the first subscriber
+            pubsub.remove_subscription(handle)
+            
+            # Receive every LiDAR topic the robot sends
+            pubsub.subscribe("rt/utlidar/*", handle_lidar)
             
             # Subscribe without callback (for manual processing)
             pubsub.subscribe("rt/sportmode")
+            
+            # Keep only the latest low state and poll it from a UI loop
+            mailbox = pubsub.subscribe("rt/lf/lowstate", keep_last=1)
+            state = mailbox.latest()
+            
+            # LiDAR preview at 2 Hz; other frames are not decoded for it
+            pubsub.subscribe("rt/utlidar/voxel_map_compressed", show_preview,
+                             max_rate_hz=2)
             ```
             
         Note:
             - The callback function should accept one parameter (the message)
-            - Only one callback per topic is supported (new callback overwrites old)
+            - Each subscriber receives every matching message, in registration order
+            - Wildcard patterns are local only: no SUBSCRIBE request is sent to
+              the robot, so subscribe to the concrete topics as well
+            - The robot is only asked to subscribe when the topic has no other
+              local consumer yet
             - If data channel is not open, an error message is printed
             - Messages will be routed to the callback via run_resolve()
         """
         channel = self.channel
 
+        if callback is not None and keep_last is not None:
+            raise ValueError("Use either callback or keep_last, not both")
+        if callback is None and keep_last is None and (every_nth != 1 or max_rate_hz is not None):
+            raise ValueError("every_nth and max_rate_hz need a callback or keep_last")
+
         if not channel or channel.readyState != "open":
             print("Error: Data channel is not open")
-            return
+            return None
         
-        # Register the callback for the topic
-        if callback:
-            self.subscriptions[topic] = callback
+        # Register the subscriber for the topic
+        subscription: Union[SubscriptionHandle, SubscriptionMailbox, None] = None
+        if keep_last is not None:
+            mailbox = SubscriptionMailbox(topic, keep_last)
+            mailbox.handle = self.subscriptions.add(topic, mailbox.put, mailbox,
+                                                    every_nth, max_rate_hz)
+            subscription = mailbox
+        elif callback:
+            subscription = self.subscriptions.add(topic, callback, None, every_nth, max_rate_hz)
+        else:
+            self.subscriptions.acquire(topic)
+        return subscription
+
+    def _send_subscription(self, topic: str, msg_type: str) -> bool:
+        """Send a SUBSCRIBE or UNSUBSCRIBE request for the subscription manager."""
+        channel = self.channel
+        if not channel or channel.readyState != "open":
+            return False
+        self.publish_without_callback(topic=topic, msg_type=msg_type)
+        return True
 
-        self.publish_without_callback(topic=topic, msg_type=DATA_CHANNEL_TYPE["SUBSCRIBE"])
+    def remove_subscription(self, subscription: Union[SubscriptionHandle, SubscriptionMailbox]) -> None:
+        """
+        Remove a single local subscriber
+        
+        Only the given subscriber stops receiving messages; other subscribers
+        of the same topic are unaffected. If it was the topic's last local
+        consumer, the robot is asked to stop sending the topic.
+        
+        Args:
+            subscription: Handle or mailbox returned by subscribe()
+            
+        Example:
+            ```python
+            handle = pubsub.subscribe("rt/lowstate", callback)
+            pubsub.remove_subscription(handle)
+            ```
+        """
+        handle = subscription.handle if isinstance(subscription, SubscriptionMailbox) else subscription
+        if handle is not None:
+            handle.remove()
 
     def unsubscribe(self, topic: str) -> None:
         """
@@ -441,8 +787,11 @@ class WebRTCDataChannelPubSub:
             ```
             
         Note:
-            - The local callback is automatically removed
-            - An unsubscribe message is sent to the robot
+            - All local subscribers registered with exactly this topic or
+              pattern (callbacks, mailboxes and streams) and all references
+              from subscribe() calls without callback are removed
+            - An unsubscribe message is sent to the robot; use
+              remove_subscription() to stop only one consumer
             - If data channel is not open, an error message is printed
             - No error is raised if the topic was not subscribed
         """
@@ -452,10 +801,79 @@ class WebRTCDataChannelPubSub:
             print("Error: Data channel is not open")
             return
 
-        # Remove the callback if it exists
-        if topic in self.subscriptions:
-            del self.subscriptions[topic]
+        # Remove the local subscribers and references if they exist
+        self.subscriptions.drop(topic)
+        
+    
 
-        self.publish_without_callback(topic=topic, msg_type=DATA_CHANNEL_TYPE["UNSUBSCRIBE"])
+    def stream(self, topic: str, maxsize: int = 16, overflow: str = "drop_oldest",
+               every_nth: int = 1, max_rate_hz: Optional[float] = None,
+               backlog_limit: Optional[int] = None) -> MessageStream:
+        """
+        Subscribe to a topic and consume its messages with ``async for``
         
-    
\ No newline at end of file
+        The stream subscribes immediately and unsubscribes when the loop
+        exits, whether by break, exception or close(). Each stream has its
+        own bounded queue, so a slow consumer only affects itself.
+        
+        Args:
+            topic (str): Topic or wildcard pattern to stream
+            maxsize (int): Queue capacity of this stream
+            overflow (str): What happens when the queue is full:
+                - "drop_oldest": discard the oldest queued message
+                - "latest": keep only the newest message (capacity 1)
+                - "block": hold messages back until the consumer catches
+                  up (reported as stream.backlog); only messages beyond
+                  backlog_limit are dropped
+            every_nth (int): Stream only every n-th message of the topic
+            max_rate_hz (Optional[float]): Stream at most this many messages
+                per second
+            backlog_limit (Optional[int]): Held-back messages allowed with
+                "block", None for 64 times maxsize
+                  
+        Returns:
+            MessageStream: Async iterator and async context manager
+            
+        Raises:
+            ValueError: If maxsize, overflow, backlog_limit or the decimation
+                settings are invalid
+            
+        Example:
+            ```python
+            # Always work on the newest state
+            async for message in pubsub.stream("rt/lf/lowstate", overflow="latest"):
+                update_ui(message["data"])
+            
+            # Keep the stream object to read its counters
+            async with pubsub.stream("rt/utlidar/voxel_map_compressed", maxsize=4) as frames:
+                async for frame in frames:
+                    process(frame)
+                    if done:
+                        break
+            print(f"dropped {frames.dropped} frames")
+            ```
+            
+        Note:
+            - The robot is only asked to unsubscribe when no other local
+              subscriber uses exactly the same topic
+            - Streams are closed when the data channel closes
+        """
+        stream = MessageStream(topic, maxsize, overflow, on_close=self._release_stream,
+                               backlog_limit=backlog_limit)
+        stream.handle = self.subscriptions.add(topic, stream.put, stream, every_nth, max_rate_hz)
+        self.streams.add(stream)
+        return stream
+
+    def _release_stream(self, stream: MessageStream) -> None:
+        """Remove a closed stream's subscription, unsubscribing if it was the last one."""
+        self.streams.discard(stream)
+        stream.handle.remove()  # No-op if removed through unsubscribe()
+
+    def close_streams(self) -> None:
+        """
+        Close all open streams, ending their ``async for`` loops
+        
+        Called when the data channel closes so consumers do not wait forever.
+        """
+        for stream in list(self.streams):
+            stream.close()
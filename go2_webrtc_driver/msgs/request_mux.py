@@ -0,0 +1,229 @@
+"""
+Request Multiplexer for Pipelined API Requests
+
+Responses to ``publish_request_new`` are matched to their futures by the
+request ID in ``header.identity.id``. IDs derived from the wall clock can
+repeat when a burst of requests lands in the same millisecond, and two
+requests sharing an ID resolve each other's futures. The multiplexer makes
+pipelining safe:
+
+- IDs come from a monotonic counter (seeded from the clock so they do not
+  repeat across sessions) and skip any ID still in flight
+- In-flight requests are tracked in a dict keyed by ID (O(1) add/remove)
+- Optional per-topic concurrency windows bound how many requests to one API
+  topic are outstanding; further requests wait in FIFO order
+- The age of every in-flight request is known (stats()["oldest_age"]); the
+  response latency itself is recorded in the metrics by publish()
+
+Usage:
+    mux = pub_sub.request_mux
+    mux.set_window("rt/api/sport/request", 4)   # At most 4 sport calls in flight
+
+    await asyncio.gather(*(pub_sub.publish_request_new(topic, {...}) for ...))
+    print(mux.stats())
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+REQUEST_ID_LIMIT = 2 ** 31  # IDs stay positive 32-bit integers
+
+
+class InFlightRequest:
+    """A request sent to the robot that has not been answered yet."""
+
+    __slots__ = ("request_id", "topic", "api_id", "sent_at")
+
+    def __init__(self, request_id: int, topic: str, api_id: Any, sent_at: float) -> None:
+        self.request_id = request_id
+        self.topic = topic
+        self.api_id = api_id
+        self.sent_at = sent_at
+
+
+class _Window:
+    """Resizable FIFO concurrency limit for one topic."""
+
+    __slots__ = ("limit", "active", "waiters")
+
+    def __init__(self, limit: Optional[int]) -> None:
+        self.limit = limit
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    def _has_room(self) -> bool:
+        return self.limit is None or self.active < self.limit
+
+    async def acquire(self) -> None:
+        if self._has_room() and not self.waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot but cancelled before using it
+                self.release()
+            else:
+                self.waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self.wake()
+
+    def wake(self) -> None:
+        while self.waiters and self._has_room():
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+
+class RequestMultiplexer:
+    """
+    Allocates request IDs and tracks in-flight requests per topic.
+
+    Attributes:
+        in_flight: In-flight requests by request ID
+        completed: Number of requests that received a response
+        failed: Number of requests that failed (timeout, closed channel, ...)
+    """
+
+    def __init__(self) -> None:
+        """Initialize the multiplexer with an ID counter seeded from the clock."""
+        self.in_flight: Dict[int, InFlightRequest] = {}
+        self.completed = 0
+        self.failed = 0
+        self._next_id = int(time.time() * 1000) % REQUEST_ID_LIMIT
+        self._windows: Dict[str, _Window] = {}
+        self._default_window: Optional[int] = None
+        self._explicit_windows: Set[str] = set()
+
+    def next_id(self) -> int:
+        """
+        Allocate a request ID that is not currently in flight.
+
+        Returns:
+            int: Positive 32-bit request ID
+        """
+        while True:
+            request_id = self._next_id
+            self._next_id = (request_id + 1) % REQUEST_ID_LIMIT or 1
+            if request_id and request_id not in self.in_flight:
+                return request_id
+
+    def set_window(self, topic: Optional[str], window: Optional[int]) -> None:
+        """
+        Limit the number of concurrent requests to a topic.
+
+        Args:
+            topic: Request topic, or None to set the default for all topics
+                without their own window
+            window: Maximum requests in flight, None for unlimited
+
+        Raises:
+            ValueError: If window is less than 1
+        """
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1 or None")
+        if topic is None:
+            self._default_window = window
+            for name, state in self._windows.items():
+                if name not in self._explicit_windows:
+                    state.limit = window
+                    state.wake()
+            return
+        state = self._window(topic)
+        state.limit = window
+        state.wake()
+        self._explicit_windows.add(topic)
+
+    def _window(self, topic: str) -> _Window:
+        state = self._windows.get(topic)
+        if state is None:
+            state = self._windows[topic] = _Window(self._default_window)
+        return state
+
+    @asynccontextmanager
+    async def request(self, topic: str, request_id: Optional[int] = None,
+                      api_id: Any = None) -> AsyncIterator[int]:
+        """
+        Reserve a window slot and an in-flight entry for one request.
+
+        Waits while the topic's window is full, then yields the request ID to
+        send. The slot is released when the block exits.
+
+        Args:
+            topic: Request topic
+            request_id: Caller-chosen ID, allocated if None
+            api_id: API identifier, used to label the latency
+
+        Yields:
+            int: Request ID to put in ``header.identity.id``
+
+        Raises:
+            ValueError: If a caller-chosen request ID is already in flight
+        """
+        if request_id is not None and request_id in self.in_flight:
+            raise ValueError(f"Request id {request_id} is already in flight")
+
+        window = self._window(topic)
+        await window.acquire()
+        try:
+            if request_id is None:
+                request_id = self.next_id()
+            elif request_id in self.in_flight:
+                raise ValueError(f"Request id {request_id} is already in flight")
+            entry = InFlightRequest(request_id, topic, api_id, time.perf_counter())
+            self.in_flight[request_id] = entry
+            try:
+                yield request_id
+            except BaseException:
+                self.failed += 1
+                raise
+            else:
+                self.completed += 1
+            finally:
+                del self.in_flight[request_id]
+        finally:
+            window.release()
+
+    def queued(self) -> int:
+        """
+        Get the number of requests waiting for a window slot.
+
+        Returns:
+            int: Requests waiting across all topics
+        """
+        return sum(len(state.waiters) for state in self._windows.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-topic and total counters.
+
+        Returns:
+            Dict[str, Any]: in_flight, queued, completed, failed, oldest_age
+            (seconds since the oldest in-flight request was sent) and
+            per-topic in_flight/queued/window
+        """
+        now = time.perf_counter()
+        oldest = min((entry.sent_at for entry in self.in_flight.values()), default=None)
+        return {
+            "in_flight": len(self.in_flight),
+            "queued": self.queued(),
+            "completed": self.completed,
+            "failed": self.failed,
+            "oldest_age": None if oldest is None else now - oldest,
+            "topics": {
+                topic: {"in_flight": state.active, "queued": len(state.waiters),
+                        "window": state.limit}
+                for topic, state in self._windows.items()
+                if state.active or state.waiters or state.limit is not None
+            },
+        }
@@ -391,7 +391,8 @@ class WebRTCDataChannelFileUploader:
     - Progress callbacks for upload monitoring
     - Cancellation support for long uploads
     - Automatic UUID generation for request tracking
-    - Rate limiting to prevent channel overload
+    - Backpressure through the bulk outbound lane, so uploads never delay
+      control commands
     
     Upload Process:
     1. Encode file data to Base64
@@ -435,6 +436,7 @@ class WebRTCDataChannelFileUploader:
         """
         self.channel = channel
         self.publish = pub_sub.publish
+        self.publish_bulk = pub_sub.publish_bulk
         self.cancel_upload = False
     
     def slice_base64_into_chunks(self, data: str, chunk_size: int) -> List[str]:
@@ -482,7 +484,8 @@ class WebRTCDataChannelFileUploader:
         - Data is Base64 encoded for transmission
         - Each chunk includes index and total count
         - Progress is reported as percentage complete
-        - Rate limiting prevents channel overload
+        - Chunks are sent through the bulk lane and paced by the channel's
+          bufferedAmount, so Move/StopMove are not queued behind the upload
         - Cancellation can interrupt upload at any time
         
         Example:
@@ -511,7 +514,7 @@ class WebRTCDataChannelFileUploader:
             - Large files are automatically chunked
             - Progress callback is optional but recommended
             - Upload can be cancelled with cancel() method
-            - Rate limiting prevents overwhelming the channel
+            - Backpressure prevents overwhelming the channel
         """
         # Encode the data to Base64
         encoded_data = base64.b64encode(data).decode('utf-8')
@@ -527,10 +530,6 @@ class WebRTCDataChannelFileUploader:
                 logging.debug("Upload canceled.")
                 return "cancel"
             
-            # Rate limiting: sleep every 5 chunks to prevent overwhelming the channel
-            if i % 5 == 0:
-                await asyncio.sleep(0.5)
-            
             uuid = generate_uuid()
             req_uuid = f"upload_req_{uuid}"
             
@@ -549,7 +548,8 @@ class WebRTCDataChannelFileUploader:
                 }
             }
             
-            self.publish("", message, DATA_CHANNEL_TYPE["RTC_INNER_REQ"])
+            # Waits while the bulk lane is full
+            await self.publish_bulk("", message, DATA_CHANNEL_TYPE["RTC_INNER_REQ"])
             
             # Report progress
             if progress_callback:
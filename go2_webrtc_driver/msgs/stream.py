@@ -0,0 +1,208 @@
+"""
+Async-Iterator Subscription Streams
+
+A ``MessageStream`` is a subscription that is consumed with ``async for``
+instead of a callback. Each stream owns a bounded queue, so a slow consumer
+never causes unbounded buffering or task creation on the data channel, and the
+overflow behaviour is explicit and measurable:
+
+- "drop_oldest": when the queue is full, the oldest queued message is dropped
+- "latest": only the newest message is kept (the queue size is 1), ideal for
+  state topics where stale values are useless
+- "block": messages that arrive while the queue is full are held back in
+  arrival order and released as the consumer catches up. The data channel
+  cannot pause the robot, so the backlog is reported through ``backlog`` and
+  ``max_backlog`` instead of stalling the message handler. The backlog is
+  bounded too (``backlog_limit``, by default ``BLOCK_BACKLOG_FACTOR`` times
+  the queue size); messages arriving beyond it are dropped and counted.
+
+Streams created with ``WebRTCDataChannelPubSub.stream()`` subscribe to the
+topic on creation and unsubscribe when the loop exits (``break``, exception or
+``close()``).
+
+Usage:
+    async for message in pub_sub.stream("rt/lf/lowstate", overflow="latest"):
+        handle(message)
+
+    async with pub_sub.stream("rt/utlidar/voxel_map_compressed", maxsize=4) as frames:
+        async for frame in frames:
+            ...
+        print(frames.dropped)
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+OVERFLOW_POLICIES = ("drop_oldest", "block", "latest")
+BLOCK_BACKLOG_FACTOR = 64  # Default "block" backlog limit, in multiples of maxsize
+
+
+class MessageStream:
+    """
+    Bounded queue of messages for one consumer, iterable with ``async for``.
+
+    Args:
+        topic: Topic or pattern the stream is subscribed to
+        maxsize: Queue capacity (forced to 1 for the "latest" policy)
+        overflow: "drop_oldest", "block" or "latest"
+        backlog_limit: Maximum number of held-back messages ("block" policy),
+            None for BLOCK_BACKLOG_FACTOR * maxsize
+        on_close: Called once when the stream is closed, to unsubscribe
+
+    Attributes:
+        topic: Topic or pattern the stream is subscribed to
+        maxsize: Queue capacity
+        overflow: Overflow policy
+        backlog_limit: Maximum number of held-back messages ("block" policy)
+        received: Number of messages put into the stream
+        delivered: Number of messages returned to the consumer
+        dropped: Number of messages discarded because the queue (or, with
+            "block", the backlog) was full
+        max_backlog: Largest number of held-back messages ("block" policy)
+        handle: Router subscription feeding the stream, set by pub_sub.stream()
+    """
+
+    def __init__(self, topic: str, maxsize: int = 16, overflow: str = "drop_oldest",
+                 on_close: Optional[Callable[["MessageStream"], None]] = None,
+                 backlog_limit: Optional[int] = None) -> None:
+        """Initialize an empty stream."""
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy '{overflow}'. Choose 'drop_oldest', 'block' or 'latest'.")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if backlog_limit is not None and backlog_limit < 0:
+            raise ValueError("backlog_limit must not be negative")
+
+        self.topic = topic
+        self.maxsize = 1 if overflow == "latest" else maxsize
+        self.overflow = overflow
+        self.backlog_limit = backlog_limit if backlog_limit is not None else maxsize * BLOCK_BACKLOG_FACTOR
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_backlog = 0
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._backlog: Deque[Dict[str, Any]] = deque()
+        self._ready: Optional[asyncio.Event] = None
+        self._closed = False
+        self._on_close = on_close
+        self.handle: Any = None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        """True once the stream has been closed."""
+        return self._closed
+
+    @property
+    def backlog(self) -> int:
+        """Number of messages held back because the queue is full ("block")."""
+        return len(self._backlog)
+
+    def put(self, message: Dict[str, Any]) -> None:
+        """
+        Add a message, applying the overflow policy if the queue is full.
+
+        Never blocks; called by the topic router from the message handler.
+
+        Args:
+            message: Message received for the topic
+        """
+        if self._closed:
+            return
+        self.received += 1
+        if len(self._queue) >= self.maxsize:
+            if self.overflow == "block":
+                if len(self._backlog) >= self.backlog_limit:
+                    self.dropped += 1  # Consumer too far behind; drop the newest
+                    return
+                self._backlog.append(message)
+                if len(self._backlog) > self.max_backlog:
+                    self.max_backlog = len(self._backlog)
+                return
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(message)
+        if self._ready is not None:
+            self._ready.set()
+
+    def get_nowait(self) -> Optional[Dict[str, Any]]:
+        """
+        Remove and return the oldest queued message.
+
+        Returns:
+            The oldest message, or None if the queue is empty
+        """
+        if not self._queue:
+            return None
+        message = self._queue.popleft()
+        if self._backlog:
+            self._queue.append(self._backlog.popleft())
+        elif not self._queue and self._ready is not None:
+            self._ready.clear()
+        self.delivered += 1
+        return message
+
+    async def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for the next message.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            The oldest queued message
+
+        Raises:
+            asyncio.TimeoutError: If no message arrives within the timeout
+            StopAsyncIteration: If the stream is closed and empty
+        """
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            if self._ready is None:
+                self._ready = asyncio.Event()
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        return self.get_nowait()
+
+    def close(self) -> None:
+        """Unsubscribe, discard queued messages and end the iteration."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.clear()
+        self._backlog.clear()
+        if self._ready is not None:
+            self._ready.set()
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            on_close(self)
+
+    async def _iterate(self) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            while True:
+                try:
+                    message = await self.get()
+                except StopAsyncIteration:
+                    return
+                yield message
+        finally:
+            # Runs on break/exception too, once the generator is finalized
+            self.close()
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iterate()
+
+    async def __aenter__(self) -> "MessageStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (f"MessageStream({self.topic!r}, {self.overflow}, {len(self._queue)}/{self.maxsize}, "
+                f"dropped={self.dropped}, backlog={self.backlog})")
@@ -0,0 +1,220 @@
+"""
+Reference-Counted Robot-Side Subscriptions
+
+The robot streams a topic from the moment it receives a SUBSCRIBE request
+until it receives an UNSUBSCRIBE, no matter how many local components are
+listening. ``SubscriptionManager`` keeps one reference per local consumer of
+each concrete topic - callbacks, mailboxes and streams registered with the
+topic router, plus bare ``subscribe(topic)`` calls - and talks to the robot
+only on the edges:
+
+- the first consumer of a topic sends SUBSCRIBE
+- removing the last consumer sends UNSUBSCRIBE, so the robot stops sending
+  topics nobody reads (the LiDAR voxel map alone is several hundred kB/s)
+- ``restore()`` re-sends SUBSCRIBE for every referenced topic after a
+  reconnect, because the new data channel starts without subscriptions
+
+The manager owns the topic router and outlives individual data channels: the
+connection creates it once and hands it to every ``WebRTCDataChannelPubSub``,
+so local callbacks and mailboxes keep working across reconnects.
+
+Wildcard patterns are local only and never counted; the robot has no notion
+of them.
+
+Usage:
+    manager = SubscriptionManager()
+    manager.attach(send)                     # send(topic, msg_type)
+    handle = manager.add("rt/lf/lowstate", on_state)   # SUBSCRIBE
+    other = manager.add("rt/lf/lowstate", on_log)      # No request
+    handle.remove()                                    # No request
+    other.remove()                                     # UNSUBSCRIBE
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from ..constants import DATA_CHANNEL_TYPE
+from .topic_router import TopicRouter, SubscriptionHandle, is_pattern
+
+
+class SubscriptionManager:
+    """
+    Keeps the robot subscribed to exactly the topics that have local consumers.
+
+    Args:
+        metrics: Optional DataChannelMetrics passed on to the topic router
+
+    Attributes:
+        router (TopicRouter): Local subscribers; each handle registered with
+            a concrete topic holds one reference to it
+        subscribe_requests: SUBSCRIBE requests sent (including restores)
+        unsubscribe_requests: UNSUBSCRIBE requests sent
+        restores: Number of restore() calls that re-sent subscriptions
+    """
+
+    def __init__(self, metrics: Any = None) -> None:
+        """Initialize without a channel; requests are sent once attach() is called."""
+        self.router = TopicRouter(metrics, on_remove=self._on_remove)
+        self.subscribe_requests = 0
+        self.unsubscribe_requests = 0
+        self.restores = 0
+        self._counts: Dict[str, int] = {}
+        self._send: Optional[Callable[[str, str], bool]] = None
+
+    def attach(self, send: Optional[Callable[[str, str], bool]]) -> None:
+        """
+        Set the function requests are sent with.
+
+        Args:
+            send: Called with (topic, msg_type); returns False if the request
+                could not be sent (channel not open). None detaches.
+        """
+        self._send = send
+
+    def _request(self, topic: str, msg_type: str) -> None:
+        send = self._send
+        if send is None:
+            return
+        try:
+            if not send(topic, msg_type):
+                return
+        except Exception as e:
+            logging.error(f"Failed to send {msg_type} for {topic}: {e}")
+            return
+        if msg_type == DATA_CHANNEL_TYPE["SUBSCRIBE"]:
+            self.subscribe_requests += 1
+        else:
+            self.unsubscribe_requests += 1
+
+    def acquire(self, topic: str) -> None:
+        """
+        Add a reference to a topic, subscribing on the first one.
+
+        Wildcard patterns are ignored.
+
+        Args:
+            topic: Concrete topic
+        """
+        if is_pattern(topic):
+            return
+        count = self._counts.get(topic, 0)
+        self._counts[topic] = count + 1
+        if count == 0:
+            self._request(topic, DATA_CHANNEL_TYPE["SUBSCRIBE"])
+
+    def release(self, topic: str) -> None:
+        """
+        Drop a reference to a topic, unsubscribing when it was the last one.
+
+        Releasing a topic without references does nothing.
+
+        Args:
+            topic: Concrete topic
+        """
+        count = self._counts.get(topic)
+        if count is None:
+            return
+        if count > 1:
+            self._counts[topic] = count - 1
+            return
+        del self._counts[topic]
+        self._request(topic, DATA_CHANNEL_TYPE["UNSUBSCRIBE"])
+
+    def add(self, pattern: str, callback: Callable[[Dict[str, Any]], None],
+            mailbox: Any = None, every_nth: int = 1,
+            max_rate_hz: Optional[float] = None) -> SubscriptionHandle:
+        """
+        Register a local subscriber and reference its topic.
+
+        The reference is released when the handle is removed, by whatever
+        means (handle.remove(), closing a stream, drop()).
+
+        Args:
+            pattern: Exact topic or wildcard pattern
+            callback: Function called with each matching message
+            mailbox: Optional mailbox fed by the callback
+            every_nth: Deliver only every n-th matching message
+            max_rate_hz: Deliver at most this many messages per second
+
+        Returns:
+            SubscriptionHandle: Handle used to remove the subscriber
+        """
+        handle = self.router.add(pattern, callback, mailbox, every_nth, max_rate_hz)
+        self.acquire(pattern)
+        return handle
+
+    def _on_remove(self, handle: SubscriptionHandle) -> None:
+        """Release the reference of a removed router subscription."""
+        self.release(handle.pattern)
+
+    def drop(self, topic: str) -> int:
+        """
+        Remove every local consumer of a topic and unsubscribe the robot.
+
+        UNSUBSCRIBE is sent even if the topic had no references, so topics
+        subscribed by other means can still be stopped explicitly.
+
+        Args:
+            topic: Topic or pattern
+
+        Returns:
+            int: Number of references that were dropped
+        """
+        dropped = self._counts.pop(topic, 0)
+        self.router.remove_pattern(topic)  # Releases are no-ops now
+        if not is_pattern(topic):
+            self._request(topic, DATA_CHANNEL_TYPE["UNSUBSCRIBE"])
+        return dropped
+
+    def restore(self) -> int:
+        """
+        Re-send SUBSCRIBE for every referenced topic.
+
+        Called once a new data channel has been validated.
+
+        Returns:
+            int: Number of topics re-subscribed
+        """
+        topics = list(self._counts)
+        for topic in topics:
+            self._request(topic, DATA_CHANNEL_TYPE["SUBSCRIBE"])
+        if topics:
+            self.restores += 1
+            logging.debug(f"Restored {len(topics)} robot subscriptions")
+        return len(topics)
+
+    def refcount(self, topic: str) -> int:
+        """
+        Get the number of local references to a topic.
+
+        Args:
+            topic: Concrete topic
+
+        Returns:
+            int: References held (0 if the robot is not subscribed)
+        """
+        return self._counts.get(topic, 0)
+
+    def topics(self) -> List[str]:
+        """
+        Get the topics the robot should currently be sending.
+
+        Returns:
+            List[str]: Referenced topics
+        """
+        return list(self._counts)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the reference counts and request counters.
+
+        Returns:
+            Dict[str, Any]: refcounts per topic, subscribe_requests,
+            unsubscribe_requests and restores
+        """
+        return {
+            "refcounts": dict(self._counts),
+            "subscribe_requests": self.subscribe_requests,
+            "unsubscribe_requests": self.unsubscribe_requests,
+            "restores": self.restores,
+        }
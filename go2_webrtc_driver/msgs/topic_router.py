@@ -0,0 +1,394 @@
+"""
+Topic Router for the Publish-Subscribe System
+
+Routes incoming data channel messages to any number of local subscribers per
+topic. Subscriptions are registered by topic or by pattern and removed through
+the handle returned when they were added, so independent components (control,
+monitoring, recording) can share one connection without replacing each
+other's callbacks.
+
+Pattern Syntax (topics are split on "/"):
+- "rt/lf/lowstate"   exact topic
+- "rt/utlidar/*"     "*" matches exactly one segment
+- "rt/**"            a trailing "**" matches any number of remaining segments
+
+Patterns are compiled into a trie, so matching a topic costs O(depth) no matter
+how many patterns are registered, and the list of subscribers for each topic
+is cached until the subscriptions change, so steady-state dispatch is a single
+dict lookup.
+
+Subscriptions can be decimated with ``every_nth`` and/or ``max_rate_hz``.
+The decision is made per subscription when the message arrives, before its
+payload is decoded: a message no subscription admits is never parsed or
+decompressed (see lazy_message.py and lazy_payload.py), and the LiDAR decode
+executor skips it entirely.
+
+Usage:
+    router = TopicRouter()
+    handle = router.add("rt/utlidar/*", on_lidar)
+    router.dispatch(message)
+    router.remove(handle)
+
+    preview = router.add("rt/utlidar/voxel_map_compressed", on_preview, max_rate_hz=2)
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SINGLE_WILDCARD = "*"
+MULTI_WILDCARD = "**"
+
+
+class SubscriptionHandle:
+    """
+    A single local subscription registered with a TopicRouter.
+
+    Attributes:
+        pattern: Topic or pattern the subscription was registered for
+        callback: Function called with each matching message
+        mailbox: Mailbox fed by this subscription, if any
+        active: False once the subscription has been removed
+        every_nth: Deliver only every n-th matching message (1 = all)
+        max_rate_hz: Upper bound on the delivery rate, None for no limit
+        skipped: Matching messages not delivered because of decimation
+    """
+
+    __slots__ = ("pattern", "callback", "mailbox", "active", "every_nth", "max_rate_hz",
+                 "skipped", "_router", "_seq", "_interval", "_count", "_next_due")
+
+    def __init__(self, router: "TopicRouter", pattern: str,
+                 callback: Callable[[Dict[str, Any]], None], mailbox: Any = None,
+                 seq: int = 0, every_nth: int = 1,
+                 max_rate_hz: Optional[float] = None) -> None:
+        if every_nth < 1:
+            raise ValueError("every_nth must be at least 1")
+        if max_rate_hz is not None and not max_rate_hz > 0:
+            raise ValueError("max_rate_hz must be positive")
+        self._router = router
+        self._seq = seq
+        self.pattern = pattern
+        self.callback = callback
+        self.mailbox = mailbox
+        self.active = True
+        self.every_nth = every_nth
+        self.max_rate_hz = max_rate_hz
+        self.skipped = 0
+        self._interval = 1.0 / max_rate_hz if max_rate_hz is not None else 0.0
+        self._count = 0
+        self._next_due = 0.0
+
+    @property
+    def decimated(self) -> bool:
+        """True if every_nth or max_rate_hz is set."""
+        return self.every_nth > 1 or self.max_rate_hz is not None
+
+    def admit(self, now: float) -> bool:
+        """
+        Decide whether the next matching message is delivered.
+
+        Called once per matching message, in arrival order.
+
+        Args:
+            now: Arrival time (time.monotonic())
+
+        Returns:
+            bool: True if the message should be delivered
+        """
+        if self.every_nth > 1:
+            self._count += 1
+            if self._count < self.every_nth:
+                self.skipped += 1
+                return False
+            self._count = 0
+        if self._interval:
+            if now < self._next_due:
+                self.skipped += 1
+                return False
+            # Keep the average rate on schedule despite arrival jitter, but
+            # don't allow a burst after a long gap
+            next_due = self._next_due + self._interval
+            self._next_due = next_due if next_due > now else now + self._interval
+        return True
+
+    def remove(self) -> None:
+        """Remove this subscription from its router (idempotent)."""
+        self._router.remove(self)
+
+    def __repr__(self) -> str:
+        state = "active" if self.active else "removed"
+        return f"SubscriptionHandle({self.pattern!r}, {state})"
+
+
+class _TrieNode:
+    """One topic segment in the pattern trie."""
+
+    __slots__ = ("children", "handles", "tail_handles")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.handles: List[SubscriptionHandle] = []        # Pattern ends here
+        self.tail_handles: List[SubscriptionHandle] = []   # Pattern ends with "**" here
+
+
+def is_pattern(topic: str) -> bool:
+    """
+    Check whether a subscription topic contains wildcards.
+
+    Args:
+        topic: Topic or pattern
+
+    Returns:
+        bool: True if any segment is "*" or "**"
+    """
+    return any(segment in (SINGLE_WILDCARD, MULTI_WILDCARD) for segment in topic.split("/"))
+
+
+class TopicRouter:
+    """
+    Multi-subscriber topic router with wildcard patterns.
+
+    Subscribers for a topic are called in registration order. A callback that
+    raises is logged and does not prevent the remaining subscribers from
+    receiving the message.
+
+    Attributes:
+        metrics: Optional DataChannelMetrics receiving callback execution times
+        on_remove: Optional function called with each handle after it has
+            been removed
+    """
+
+    def __init__(self, metrics: Any = None,
+                 on_remove: Optional[Callable[[SubscriptionHandle], None]] = None) -> None:
+        """
+        Initialize an empty router.
+
+        Args:
+            metrics: Optional DataChannelMetrics to record callback times in
+            on_remove: Optional function called with each removed handle
+        """
+        self.metrics = metrics
+        self.on_remove = on_remove
+        self._root = _TrieNode()
+        self._handles: Dict[str, List[SubscriptionHandle]] = {}
+        self._cache: Dict[str, Tuple[SubscriptionHandle, ...]] = {}
+        self._next_seq = 0
+        self._decimated = 0  # Active handles with every_nth or max_rate_hz
+
+    def add(self, pattern: str, callback: Callable[[Dict[str, Any]], None],
+            mailbox: Any = None, every_nth: int = 1,
+            max_rate_hz: Optional[float] = None) -> SubscriptionHandle:
+        """
+        Register a subscriber for a topic or pattern.
+
+        Args:
+            pattern: Exact topic or wildcard pattern
+            callback: Function called with each matching message
+            mailbox: Optional mailbox fed by the callback, closed on removal
+            every_nth: Deliver only every n-th matching message
+            max_rate_hz: Deliver at most this many messages per second
+
+        Returns:
+            SubscriptionHandle: Handle used to remove the subscription
+
+        Raises:
+            ValueError: If "**" is used anywhere but the last segment, or the
+                decimation settings are invalid
+        """
+        segments = pattern.split("/")
+        if MULTI_WILDCARD in segments[:-1]:
+            raise ValueError(f"'{MULTI_WILDCARD}' is only allowed as the last segment: {pattern}")
+
+        handle = SubscriptionHandle(self, pattern, callback, mailbox, self._next_seq,
+                                    every_nth, max_rate_hz)
+        if handle.decimated:
+            self._decimated += 1
+        self._next_seq += 1
+        node = self._root
+        if segments[-1] == MULTI_WILDCARD:
+            for segment in segments[:-1]:
+                node = node.children.setdefault(segment, _TrieNode())
+            node.tail_handles.append(handle)
+        else:
+            for segment in segments:
+                node = node.children.setdefault(segment, _TrieNode())
+            node.handles.append(handle)
+
+        self._handles.setdefault(pattern, []).append(handle)
+        self._cache.clear()
+        return handle
+
+    def remove(self, handle: SubscriptionHandle) -> None:
+        """
+        Remove a subscriber. Removing an already removed handle does nothing.
+
+        Args:
+            handle: Handle returned by add()
+        """
+        if not handle.active or handle._router is not self:
+            return
+        handle.active = False
+        if handle.decimated:
+            self._decimated -= 1
+
+        segments = handle.pattern.split("/")
+        tail = segments[-1] == MULTI_WILDCARD
+        if tail:
+            segments = segments[:-1]
+
+        # Walk down, remembering the path so empty nodes can be pruned
+        path = [self._root]
+        for segment in segments:
+            path.append(path[-1].children[segment])
+        (path[-1].tail_handles if tail else path[-1].handles).remove(handle)
+        for parent, segment, node in zip(reversed(path[:-1]), reversed(segments),
+                                         reversed(path[1:])):
+            if node.children or node.handles or node.tail_handles:
+                break
+            del parent.children[segment]
+
+        handles = self._handles[handle.pattern]
+        handles.remove(handle)
+        if not handles:
+            del self._handles[handle.pattern]
+        self._cache.clear()
+
+        if handle.mailbox is not None:
+            handle.mailbox.close()
+        if self.on_remove is not None:
+            self.on_remove(handle)
+
+    def remove_pattern(self, pattern: str) -> int:
+        """
+        Remove every subscriber registered with exactly this topic or pattern.
+
+        Args:
+            pattern: Topic or pattern used in add()
+
+        Returns:
+            int: Number of removed subscribers
+        """
+        handles = list(self._handles.get(pattern, ()))
+        for handle in handles:
+            self.remove(handle)
+        return len(handles)
+
+    def handles_for_pattern(self, pattern: str) -> List[SubscriptionHandle]:
+        """
+        Get the subscribers registered with exactly this topic or pattern.
+
+        Args:
+            pattern: Topic or pattern used in add()
+
+        Returns:
+            List[SubscriptionHandle]: Active handles, in registration order
+        """
+        return list(self._handles.get(pattern, ()))
+
+    def patterns(self) -> List[str]:
+        """
+        Get all topics and patterns that currently have subscribers.
+
+        Returns:
+            List[str]: Registered topics and patterns
+        """
+        return list(self._handles)
+
+    def match(self, topic: str) -> Tuple[SubscriptionHandle, ...]:
+        """
+        Get the subscribers for a concrete topic.
+
+        Args:
+            topic: Topic of an incoming message
+
+        Returns:
+            Tuple[SubscriptionHandle, ...]: Matching handles in registration order
+        """
+        handles = self._cache.get(topic)
+        if handles is None:
+            found: List[SubscriptionHandle] = []
+            self._collect(self._root, topic.split("/"), 0, found)
+            # Keep registration order across exact and wildcard matches
+            found.sort(key=lambda h: h._seq)
+            handles = self._cache[topic] = tuple(found)
+        return handles
+
+    def _collect(self, node: _TrieNode, segments: List[str], depth: int,
+                 found: List[SubscriptionHandle]) -> None:
+        """Collect handles of all patterns matching segments[depth:] below node."""
+        if node.tail_handles and depth < len(segments):
+            found.extend(node.tail_handles)
+        if depth == len(segments):
+            found.extend(node.handles)
+            return
+        child = node.children.get(segments[depth])
+        if child is not None:
+            self._collect(child, segments, depth + 1, found)
+        wildcard = node.children.get(SINGLE_WILDCARD)
+        if wildcard is not None and segments[depth] != SINGLE_WILDCARD:
+            self._collect(wildcard, segments, depth + 1, found)
+
+    def has_subscribers(self, topic: Optional[str]) -> bool:
+        """
+        Check whether a concrete topic has at least one subscriber.
+
+        Args:
+            topic: Topic of an incoming message
+
+        Returns:
+            bool: True if any exact or wildcard subscription matches
+        """
+        return topic is not None and bool(self.match(topic))
+
+    def select(self, topic: str) -> Tuple[SubscriptionHandle, ...]:
+        """
+        Get the subscribers that take the next message of a topic.
+
+        Applies decimation, so it must be called exactly once per incoming
+        message: either through dispatch(), or before decoding with the result
+        passed on to dispatch().
+
+        Args:
+            topic: Topic of an incoming message
+
+        Returns:
+            Tuple[SubscriptionHandle, ...]: Matching handles that admit the
+            message, in registration order
+        """
+        handles = self.match(topic)
+        if self._decimated and handles:
+            now = time.monotonic()
+            handles = tuple(handle for handle in handles
+                            if not handle.decimated or handle.admit(now))
+        return handles
+
+    def dispatch(self, message: Dict[str, Any],
+                 handles: Optional[Tuple[SubscriptionHandle, ...]] = None) -> int:
+        """
+        Deliver a message to every subscriber of its topic.
+
+        Args:
+            message: Incoming message with a "topic" field
+            handles: Subscribers selected with select() when the message
+                arrived; selected now if None
+
+        Returns:
+            int: Number of subscribers the message was delivered to
+        """
+        topic = message.get("topic")
+        if topic is None:
+            return 0
+        if handles is None:
+            handles = self.select(topic)
+        metrics = self.metrics
+        for handle in handles:
+            if not handle.active:
+                continue  # Removed while the message was being decoded
+            start = time.perf_counter()
+            try:
+                handle.callback(message)
+            except Exception as e:
+                logging.error(f"Error in subscriber callback for {topic}: {e}")
+            if metrics is not None:
+                metrics.observe_callback(topic, time.perf_counter() - start)
+        return len(handles)
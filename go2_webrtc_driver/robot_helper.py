@@ -13,6 +13,7 @@ Key Features:
 - Simplified command execution with error handling
 - Async context manager for proper resource cleanup
 - Obstacle detection control and status querying
+- Coalescing velocity channel with deadman stop for high-rate control loops
 
 Example Usage:
     ```python
@@ -43,7 +44,8 @@ from typing import Optional, Dict, Any, Callable, Union, List
 from enum import Enum
 
 from .webrtc_driver import Go2WebRTCConnection, WebRTCConnectionMethod
-from .constants import RTC_TOPIC, SPORT_CMD, MCF_CMD, DATA_CHANNEL_TYPE
+from .constants import RTC_TOPIC, SPORT_CMD, MCF_CMD
+from .velocity_coalescer import VelocityCoalescer
 
 logging.getLogger('aioice.ice').setLevel(logging.CRITICAL)
 
@@ -218,6 +220,9 @@ class Go2RobotHelper:
         self._movement_prepared: bool = False  # Prepare joystick/speed once before first Move
         self._obstacle_remote_enabled: bool = False
         self._obstacle_keepalive_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None  # Shared by all callers, see _start_reconnect()
+        self._velocity_channel: Optional[VelocityCoalescer] = None
+        self._prepared_requests: Dict[str, Any] = {}  # PreparedRequest per command, see _prepared()
         # Track simple posture readiness for Move commands
         self._is_standing: bool = True
         # Require a BalanceStand before next Move after certain posture changes
@@ -296,6 +301,8 @@ class Go2RobotHelper:
         """Disconnect from the robot cleanly"""
         if self.conn and self.is_connected:
             try:
+                # Stop the robot and the velocity channel if running
+                await self.stop_velocity_channel()
                 # Stop obstacle keepalive if running
                 await self.set_obstacle_remote_commands(False)
                 # Disable state monitoring first
@@ -585,12 +592,18 @@ class Go2RobotHelper:
                 except Exception as e:
                     self.logger.error(f"Error parsing multiplestate data: {e}")
 
-            self.conn.datachannel.pub_sub.subscribe(RTC_TOPIC['MULTIPLE_STATE'], multiplestate_callback)
+            pub_sub = self.conn.datachannel.pub_sub
+            handle = pub_sub.subscribe(RTC_TOPIC['MULTIPLE_STATE'], multiplestate_callback)
 
-            wait_time = 0
-            while not status_received and wait_time < 5.0:
-                await asyncio.sleep(0.1)
-                wait_time += 0.1
+            try:
+                wait_time = 0
+                while not status_received and wait_time < 5.0:
+                    await asyncio.sleep(0.1)
+                    wait_time += 0.1
+            finally:
+                # Drop this one-shot consumer; unsubscribes if nobody else listens
+                if handle is not None:
+                    pub_sub.remove_subscription(handle)
 
             if status_received:
                 status_text = "🟢 ENABLED" if current_status else "🔴 DISABLED"
@@ -659,12 +672,23 @@ class Go2RobotHelper:
         except Exception:
             return False
 
+    def _start_reconnect(self) -> asyncio.Task:
+        """Start a reconnect in its own task, or return the one in progress."""
+        if self._reconnect_task is None or self._reconnect_task.done():
+            async def _runner():
+                try:
+                    await self.conn.reconnect()  # type: ignore[union-attr]
+                except Exception as e:
+                    self.logger.debug(f"Reconnect failed: {e}")
+
+            self._reconnect_task = asyncio.create_task(_runner())
+        return self._reconnect_task
+
     async def _ensure_connection(self) -> None:
         if not self._connection_ready() and self.conn:
-            try:
-                await self.conn.reconnect()
-            except Exception as e:
-                self.logger.debug(f"Reconnect failed: {e}")
+            # Shielded: cancelling the caller must not abort signaling or ICE
+            # halfway and leave a half-built peer connection behind
+            await asyncio.shield(self._start_reconnect())
 
     async def prepare_programmatic_control(self) -> None:
         """Disable joystick/free-walk, set speed level, and stop motion."""
@@ -755,56 +779,138 @@ class Go2RobotHelper:
 
     async def avoid_move(self, x: float, y: float, yaw: float, mode: int = 0) -> bool:
         """Send obstacle-aware velocity (api_id=1003)."""
-        await self._ensure_connection()
-        try:
-            # Ensure locomotion is enabled (BalanceStand) after StandDown/Sit/StandUp
-            if self._needs_balance_stand:
-                try:
-                    await self.execute_command("BalanceStand", wait_time=0.3)
-                except Exception:
-                    pass
-                self._needs_balance_stand = False
+        return await self._send_velocity(x, y, yaw, obstacle_avoidance=True, mode=mode)
 
-            payload = {"api_id": 1003, "parameter": {"x": x, "y": y, "yaw": yaw, "mode": mode}}
-            await self.conn.datachannel.pub_sub.publish_request_new(  # type: ignore[union-attr]
-                RTC_TOPIC['OBSTACLES_AVOID'], payload
-            )
-            return True
-        except Exception:
-            # Fallback: fire-and-forget
+    async def sport_move(self, x: float, y: float, z: float) -> bool:
+        return await self._send_velocity(x, y, z, obstacle_avoidance=False)
+
+    async def move(self, x: float, y: float, z: float, obstacle_avoidance: bool = False) -> bool:
+        if obstacle_avoidance:
+            return await self.avoid_move(x, y, z, 0)
+        return await self.sport_move(x, y, z)
+
+    def start_velocity_channel(self, period: float = 0.05, deadman_timeout: Optional[float] = 0.5,
+                               obstacle_avoidance: bool = False) -> VelocityCoalescer:
+        """
+        Start a coalescing velocity channel for high-rate control
+        
+        Unlike move(), which awaits a full request round trip per call, the
+        channel accepts targets at any rate through set(x, y, yaw) and sends
+        at most one command per period, always the newest. If no target
+        arrives within deadman_timeout, a zero velocity is sent.
+        
+        Args:
+            period: Seconds between commands (0.05 = 20 Hz)
+            deadman_timeout: Seconds without set() before stopping, None to disable
+            obstacle_avoidance: Send obstacle-aware velocity (api_id=1003)
+                instead of sport Move
+            
+        Returns:
+            VelocityCoalescer: The running channel
+            
+        Example:
+            ```python
+            velocity = robot.start_velocity_channel()
+            velocity.set(0.3, 0.0, 0.0)
+            ```
+        """
+        if self._velocity_channel is not None and self._velocity_channel.running:
+            return self._velocity_channel
+
+        async def send(x: float, y: float, yaw: float) -> None:
+            # Fire-and-forget: a lost response must not hold back the next
+            # command or the deadman's stop
+            if not await self._send_velocity(x, y, yaw, obstacle_avoidance, wait=False):
+                raise ConnectionError("Velocity command could not be sent")
+
+        self._velocity_channel = VelocityCoalescer(send, period, deadman_timeout)
+        self._velocity_channel.start()
+        return self._velocity_channel
+
+    async def stop_velocity_channel(self) -> None:
+        """Stop the velocity channel, sending a final zero velocity."""
+        channel, self._velocity_channel = self._velocity_channel, None
+        if channel is not None:
+            await channel.stop()
+
+    async def _send_velocity(self, x: float, y: float, yaw: float, obstacle_avoidance: bool,
+                             mode: int = 0, wait: bool = True) -> bool:
+        """
+        Send one velocity command (sport Move or obstacle-aware api_id=1003).
+        
+        Shared by avoid_move(), sport_move() and the velocity channel:
+        reconnects if the connection was lost (in the background with
+        wait=False) and sends BalanceStand first after a posture change
+        (except for a zero velocity, which must not be delayed). A command
+        that could not be sent because the data channel was not open is
+        retried once fire-and-forget; a command that was sent is never
+        re-sent, so a late or failed response cannot put a stale velocity on
+        the wire.
+        
+        Args:
+            x: Forward velocity
+            y: Lateral velocity
+            yaw: Yaw rate
+            obstacle_avoidance: Send api_id=1003 to the obstacle avoidance
+                topic instead of sport Move
+            mode: Obstacle avoidance mode
+            wait: Wait for the response; False only sends the command
+            
+        Returns:
+            bool: True if the command was sent
+            
+        Raises:
+            ConnectionError: With wait=False, if the connection is down
+        """
+        if wait:
+            await self._ensure_connection()
+        elif not self._connection_ready():
+            # The velocity channel cancels a send in flight when a stop
+            # arrives; reconnect in the background and let the tick retry
+            if self.conn:
+                self._start_reconnect()
+            raise ConnectionError("Not connected, reconnecting")
+        # Ensure locomotion is enabled (BalanceStand) after StandDown/Sit/StandUp
+        if self._needs_balance_stand and (x or y or yaw):
             try:
-                req_id = int(asyncio.get_event_loop().time() * 1000) % 2147483648
-                self.conn.datachannel.pub_sub.publish_without_callback(  # type: ignore[union-attr]
-                    RTC_TOPIC['OBSTACLES_AVOID'],
-                    {
-                        "header": {"identity": {"id": req_id, "api_id": 1003}},
-                        "parameter": json.dumps({"x": x, "y": y, "yaw": yaw, "mode": mode}),
-                    },
-                    DATA_CHANNEL_TYPE["REQUEST"],
-                )
-                return True
+                await self.execute_command("BalanceStand", wait_time=0.3)
             except Exception:
-                return False
+                pass
+            self._needs_balance_stand = False
 
-    async def sport_move(self, x: float, y: float, z: float) -> bool:
         try:
-            # Ensure locomotion is enabled (BalanceStand) after StandDown/Sit/StandUp
-            if self._needs_balance_stand:
+            if obstacle_avoidance:
+                request = self._prepared("avoid_move", RTC_TOPIC['OBSTACLES_AVOID'], 1003,
+                                         ("x", "y", "yaw", "mode"))
+                values = (x, y, yaw, mode)
+            else:
+                request = self._prepared("move", RTC_TOPIC["SPORT_MOD"],
+                                         MCF_CMD.get("Move") or SPORT_CMD["Move"], ("x", "y", "z"))
+                values = (x, y, yaw)
+            if wait:
                 try:
-                    await self.execute_command("BalanceStand", wait_time=0.3)
-                except Exception:
-                    pass
-                self._needs_balance_stand = False
-            
-            await self.execute_command("Move", {"x": x, "y": y, "z": z}, wait_time=0.0)
+                    await request(*values)
+                    return True
+                except ConnectionError as e:
+                    self.logger.debug(f"Velocity command not sent, sending without response: {e}")
+                except Exception as e:
+                    self.logger.warning(f"Velocity command ({x}, {y}, {yaw}) failed: {e!r}")
+                    return False
+            # Fallback: fire-and-forget
+            request.send_nowait(*values)
             return True
-        except Exception:
+        except Exception as e:
+            self.logger.debug(f"Velocity command ({x}, {y}, {yaw}) not sent: {e}")
             return False
 
-    async def move(self, x: float, y: float, z: float, obstacle_avoidance: bool = False) -> bool:
-        if obstacle_avoidance:
-            return await self.avoid_move(x, y, z, 0)
-        return await self.sport_move(x, y, z)
+    def _prepared(self, name: str, topic: str, api_id: int, parameter_keys=None):
+        """Get a cached request template, rebuilt when the data channel changed."""
+        pub_sub = self.conn.datachannel.pub_sub  # type: ignore[union-attr]
+        request = self._prepared_requests.get(name)
+        if request is None or request.pub_sub is not pub_sub:
+            request = pub_sub.prepare_request(topic, api_id, parameter_keys)
+            self._prepared_requests[name] = request
+        return request
 
     async def stop(self, obstacle_avoidance: bool = False) -> bool:
         if obstacle_avoidance:
@@ -34,7 +34,8 @@ Usage Example:
 Audio File Requirements:
 - Supported formats: MP3, WAV
 - Automatic conversion to 44.1kHz WAV for compatibility
-- Files are chunked into 4KB blocks for transmission
+- Files are chunked into 4KB blocks for transmission through the bulk
+  outbound lane, so motion commands are not delayed by uploads
 - MD5 checksums ensure data integrity
 
 Megaphone Mode:
@@ -61,6 +62,7 @@ from typing import Dict, Any, Optional
 from pydub import AudioSegment
 from go2_webrtc_driver.constants import AUDIO_API
 from go2_webrtc_driver.webrtc_driver import Go2WebRTCConnection
+from go2_webrtc_driver.msgs.outbound import LANE_BULK
 import asyncio
 
 CHUNK_SIZE = 61440  # Default chunk size for file transfer (60KB)
@@ -493,7 +495,8 @@ class WebRTCAudioHub:
                     {
                         "api_id": AUDIO_API['UPLOAD_AUDIO_FILE'],
                         "parameter": json.dumps(parameter, ensure_ascii=True)
-                    }
+                    },
+                    lane=LANE_BULK
                 )
                 
                 # Wait a small amount between chunks
@@ -644,7 +647,8 @@ class WebRTCAudioHub:
                     {
                         "api_id": AUDIO_API['UPLOAD_MEGAPHONE'],
                         "parameter": json.dumps(parameter, ensure_ascii=True)
-                    }
+                    },
+                    lane=LANE_BULK
                 )
                 
                 # Wait a small amount between chunks
@@ -12,6 +12,8 @@ Key Features:
 - Binary data processing for sensor information (LiDAR, etc.)
 - Error handling and status reporting
 - Configurable data decoders for different sensor types
+- Optional worker pool for LiDAR decoding off the event loop
+- Lazy payload decoding, so frames nobody reads cost only a header parse
 
 Data Channel Protocol:
 - JSON messages for control and status
@@ -33,20 +35,29 @@ Example:
 """
 
 import asyncio
+import functools
 import json
 import logging
 import struct
 import sys
-from typing import Dict, Any, Optional, Callable, Union
+import time
+from typing import Dict, Any, Optional, Callable, Set, Tuple, Union
 
+from .msgs import json_codec
 from .msgs.pub_sub import WebRTCDataChannelPubSub
 from .lidar.lidar_decoder_unified import UnifiedLidarDecoder
+from .lidar.lidar_decode_executor import LidarDecodeExecutor
 from .msgs.heartbeat import WebRTCDataChannelHeartBeat
 from .msgs.validation import WebRTCDataChannelValidation
 from .msgs.rtc_inner_req import WebRTCDataChannelRTCInnerReq
+from .msgs.lazy_payload import LazyDecodedData
+from .msgs.lazy_message import LazyMessage
+from .msgs.metrics import DataChannelMetrics
+from .msgs.subscription_manager import SubscriptionManager
+from .msgs.capture import CaptureRecorder, robot_stamp, text_stamp
 from .util import print_status
 from .msgs.error_handler import handle_error
-from .constants import DATA_CHANNEL_TYPE
+from .constants import DATA_CHANNEL_TYPE, RTC_TOPIC
 
 
 class WebRTCDataChannel:
@@ -66,9 +77,14 @@ class WebRTCDataChannel:
         validation: Connection validation handler
         rtc_inner_req: Internal RTC request handler
         decoder: Data decoder for binary messages (LiDAR, etc.)
+        decode_executor: Optional worker pool decoding LiDAR frames off the event loop
+        decode_executor_topics: Topics whose binary payloads use the decode executor
+        metrics: Per-topic traffic counters and timing histograms
+        recorder: Raw message capture in progress, if any
     """
     
-    def __init__(self, conn, pc) -> None:
+    def __init__(self, conn, pc, metrics: Optional[DataChannelMetrics] = None,
+                 subscriptions: Optional[SubscriptionManager] = None) -> None:
         """
         Initialize the WebRTC data channel.
         
@@ -78,19 +94,29 @@ class WebRTCDataChannel:
         Args:
             conn: Parent WebRTC connection instance
             pc: RTCPeerConnection instance for WebRTC communication
+            metrics: Metrics to record traffic and timings in, shared across
+                reconnects by the connection (a new instance if not given)
+            subscriptions: Robot-side subscriptions and local subscribers,
+                shared across reconnects by the connection (a new instance if
+                not given)
         """
         # Create and configure the data channel
         self.channel = pc.createDataChannel("data")
         self.data_channel_opened = False
         self.conn = conn
+        self.metrics = metrics if metrics is not None else DataChannelMetrics()
 
         # Initialize core messaging components
-        self.pub_sub = WebRTCDataChannelPubSub(self.channel)
+        self.pub_sub = WebRTCDataChannelPubSub(self.channel, self.metrics, subscriptions)
         self.heartbeat = WebRTCDataChannelHeartBeat(self.channel, self.pub_sub)
         self.validation = WebRTCDataChannelValidation(self.channel, self.pub_sub)
         self.rtc_inner_req = WebRTCDataChannelRTCInnerReq(self.conn, self.channel, self.pub_sub)
 
         # Set up default decoder for binary data
+        self.decode_executor: Optional[LidarDecodeExecutor] = None
+        self.decode_executor_topics = {RTC_TOPIC["ULIDAR_ARRAY"]}
+        self.recorder: Optional[CaptureRecorder] = None
+        self._response_tasks: Set[asyncio.Task] = set()
         self.set_decoder(decoder_type='libvoxel')
 
         # Configure validation success callback
@@ -99,6 +125,8 @@ class WebRTCDataChannel:
             self.data_channel_opened = True
             self.heartbeat.start_heartbeat()
             self.rtc_inner_req.network_status.start_network_status_fetch()
+            # Topics still referenced from before a reconnect
+            self.pub_sub.subscriptions.restore()
             print_status("Data Channel Verification", "✅ OK")
 
         self.validation.set_on_validate_callback(on_validate)
@@ -130,12 +158,22 @@ class WebRTCDataChannel:
             self.data_channel_opened = False
             self.heartbeat.stop_heartbeat()
             self.rtc_inner_req.network_status.stop_network_status_fetch()
+            self.set_decode_executor(None)
+            self.pub_sub.close_streams()
+            self.pub_sub.future_resolver.cancel_all()
+            self.pub_sub.outbound.cancel_all()
+            self.stop_capture()
             
         @self.channel.on("message")
-        async def on_message(message: Union[str, bytes]) -> None:
+        def on_message(message: Union[str, bytes]) -> None:
             """
             Handle incoming data channel messages.
             
+            Synchronous, so the event emitter calls it inline instead of
+            creating a task per message. Streaming (MSG) messages are fully
+            handled here; only control responses that need awaiting
+            (validation, errors) are handed to handle_response() in a task.
+            
             Args:
                 message: Raw message data (string or bytes)
             """
@@ -147,9 +185,31 @@ class WebRTCDataChannel:
 
                 # Parse message based on type
                 if isinstance(message, str):
-                    parsed_data = json.loads(message)
+                    # Only type and topic are read now; the body is parsed
+                    # when a consumer first touches it
+                    parsed_data = LazyMessage.parse(message)
+                    self.metrics.record_message("in", parsed_data.get("topic"),
+                                                parsed_data.get("type"), len(message))
+                    if self.recorder is not None:
+                        # Reading data.stamp would parse the whole message;
+                        # scan the raw text for it instead
+                        lazy = isinstance(parsed_data, LazyMessage) and not parsed_data.is_parsed
+                        self.recorder.record("in", message, parsed_data.get("topic"),
+                                             text_stamp(message) if lazy else robot_stamp(parsed_data))
                 elif isinstance(message, bytes):
-                    parsed_data = self.deal_array_buffer(message)
+                    # Payloads are decoded on first access to data['data']
+                    split = self.split_array_buffer(message)
+                    if split is not None:
+                        self.metrics.record_message("in", split[0].get("topic"),
+                                                    split[0].get("type"), len(message))
+                    if self.recorder is not None:
+                        # Raw message with the compressed payload, before decoding
+                        header = split[0] if split is not None else {}
+                        self.recorder.record("in", message, header.get("topic"),
+                                             robot_stamp(header))
+                    if self.decode_executor and self.submit_array_buffer(split):
+                        return
+                    parsed_data = self._decode_split_buffer(split, "binary", lazy=True)
                 else:
                     logging.warning(f"Received unknown message type: {type(message)}")
                     return
@@ -157,14 +217,31 @@ class WebRTCDataChannel:
                 # Process message through pub/sub system
                 self.pub_sub.run_resolve(parsed_data)
 
+                # Stream data has no control handler
+                if parsed_data.get("type") == DATA_CHANNEL_TYPE["MSG"]:
+                    return
+
                 # Handle message routing
-                await self.handle_response(parsed_data)
+                self._spawn_response_handler(parsed_data)
         
             except json.JSONDecodeError as e:
                 logging.error(f"Failed to decode JSON message: {e}")
             except Exception as e:
                 logging.error(f"Error processing WebRTC data: {e}")
 
+    def _spawn_response_handler(self, msg: Dict[str, Any]) -> None:
+        """Run handle_response() for a control message in a task."""
+        task = asyncio.ensure_future(self._handle_response_logged(msg))
+        # The loop only keeps weak references to tasks
+        self._response_tasks.add(task)
+        task.add_done_callback(self._response_tasks.discard)
+
+    async def _handle_response_logged(self, msg: Dict[str, Any]) -> None:
+        try:
+            await self.handle_response(msg)
+        except Exception as e:
+            logging.error(f"Error processing WebRTC data: {e}")
+
     async def handle_response(self, msg: Dict[str, Any]) -> None:
         """
         Route incoming messages to appropriate handlers.
@@ -253,39 +330,123 @@ class WebRTCDataChannel:
             # Normal sensor data format
             return self.deal_array_buffer_for_normal(buffer)
 
-    def deal_array_buffer_for_normal(self, buffer: bytes) -> Dict[str, Any]:
+    @staticmethod
+    def split_array_buffer(buffer: bytes) -> Optional[Tuple[Dict[str, Any], bytes]]:
         """
-        Process normal binary sensor data.
+        Split a binary message into its JSON header and binary payload.
+        
+        Only the header is parsed; the binary payload is returned undecoded.
+        Static so recorded messages can be split without a connection.
         
         Args:
-            buffer: Binary buffer containing JSON header and sensor data
+            buffer: Raw binary message data
             
         Returns:
-            Dict containing parsed message with decoded sensor data
+            Tuple of (parsed JSON header, binary payload), or None if the
+            buffer is malformed
         """
+        if len(buffer) < 4:
+            logging.warning("Received buffer too small for header")
+            return None
+
+        header_1, header_2 = struct.unpack_from('<HH', buffer, 0)
+
+        if header_1 == 2 and header_2 == 0:
+            return WebRTCDataChannel._split_lidar_buffer(buffer[4:])
+        return WebRTCDataChannel._split_normal_buffer(buffer)
+
+    @staticmethod
+    def _split_normal_buffer(buffer: bytes) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Split a normal binary message (16-bit header length) into header and payload."""
         if len(buffer) < 4:
             logging.warning("Normal buffer too small")
-            return {}
+            return None
             
         # Extract header length and data
         header_length, = struct.unpack_from('<H', buffer, 0)
         
         if len(buffer) < 4 + header_length:
             logging.warning("Buffer smaller than expected header length")
-            return {}
+            return None
+
+        try:
+            decoded_json = json_codec.loads(buffer[4:4 + header_length])
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logging.error(f"Error processing normal buffer: {e}")
+            return None
+        return decoded_json, buffer[4 + header_length:]
+
+    @staticmethod
+    def _split_lidar_buffer(buffer: bytes) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Split a LiDAR binary message (32-bit header length) into header and payload."""
+        if len(buffer) < 8:
+            logging.warning("LiDAR buffer too small")
+            return None
             
-        json_data = buffer[4:4 + header_length]
-        binary_data = buffer[4 + header_length:]
+        # Extract header length and data (LiDAR uses 32-bit header length)
+        header_length, = struct.unpack_from('<I', buffer, 0)
+        
+        if len(buffer) < 8 + header_length:
+            logging.warning("LiDAR buffer smaller than expected header length")
+            return None
 
         try:
-            decoded_json = json.loads(json_data.decode('utf-8'))
-            decoded_data = self.decoder.decode(binary_data, decoded_json['data'])
+            decoded_json = json_codec.loads(buffer[8:8 + header_length])
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logging.error(f"Error processing LiDAR buffer: {e}")
+            return None
+        return decoded_json, buffer[8 + header_length:]
+
+    def _decode_split_buffer(self, split: Optional[Tuple[Dict[str, Any], bytes]],
+                             kind: str, lazy: bool = False) -> Dict[str, Any]:
+        """
+        Decode the binary payload of a split message into ``data['data']``.
+        
+        With lazy=True the payload is wrapped in a LazyDecodedData and only
+        decoded when a consumer first reads ``data['data']``.
+        """
+        if split is None:
+            return {}
+        decoded_json, binary_data = split
+        if lazy:
+            if not isinstance(decoded_json.get('data'), dict):
+                logging.error(f"Error processing {kind} buffer: missing 'data' header")
+                return {}
+            topic = decoded_json.get('topic')
+            decoded_json['data'] = LazyDecodedData(
+                decoded_json['data'],
+                lambda payload, metadata: self._timed_decode(topic, payload, metadata),
+                binary_data,
+            )
+            return decoded_json
+        try:
+            decoded_data = self._timed_decode(decoded_json.get('topic'), binary_data,
+                                              decoded_json['data'])
             decoded_json['data']['data'] = decoded_data
             return decoded_json
-        except (json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
-            logging.error(f"Error processing normal buffer: {e}")
+        except KeyError as e:
+            logging.error(f"Error processing {kind} buffer: {e}")
             return {}
 
+    def _timed_decode(self, topic: Optional[str], payload: bytes, metadata: Dict[str, Any]) -> Any:
+        """Decode a binary payload and record the decode time."""
+        start = time.perf_counter()
+        decoded = self.decoder.decode(payload, metadata)
+        self.metrics.observe_decode(topic, time.perf_counter() - start)
+        return decoded
+
+    def deal_array_buffer_for_normal(self, buffer: bytes) -> Dict[str, Any]:
+        """
+        Process normal binary sensor data.
+        
+        Args:
+            buffer: Binary buffer containing JSON header and sensor data
+            
+        Returns:
+            Dict containing parsed message with decoded sensor data
+        """
+        return self._decode_split_buffer(self._split_normal_buffer(buffer), "normal")
+
     def deal_array_buffer_for_lidar(self, buffer: bytes) -> Dict[str, Any]:
         """
         Process LiDAR binary data messages.
@@ -296,28 +457,40 @@ class WebRTCDataChannel:
         Returns:
             Dict containing parsed message with decoded LiDAR data
         """
-        if len(buffer) < 8:
-            logging.warning("LiDAR buffer too small")
-            return {}
-            
-        # Extract header length and data (LiDAR uses 32-bit header length)
-        header_length, = struct.unpack_from('<I', buffer, 0)
+        return self._decode_split_buffer(self._split_lidar_buffer(buffer), "LiDAR")
+
+    def submit_array_buffer(self, split: Optional[Tuple[Dict[str, Any], bytes]]) -> bool:
+        """
+        Hand a split binary message to the decode executor if its topic uses it.
         
-        if len(buffer) < 8 + header_length:
-            logging.warning("LiDAR buffer smaller than expected header length")
-            return {}
+        The header has already been parsed on the event loop; the payload is
+        decoded in the executor and the decoded message is delivered to the
+        pub/sub system in arrival order.
+        
+        Args:
+            split: Result of split_array_buffer()
             
-        json_data = buffer[8:8 + header_length]
-        binary_data = buffer[8 + header_length:]
+        Returns:
+            bool: True if the message was submitted or skipped because nobody
+            consumes it (unsubscribed, or decimated away for every
+            subscriber), False if it should be decoded inline
+        """
+        if split is None or self.decode_executor is None:
+            return False
 
-        try:
-            decoded_json = json.loads(json_data.decode('utf-8'))
-            decoded_data = self.decoder.decode(binary_data, decoded_json['data'])
-            decoded_json['data']['data'] = decoded_data
-            return decoded_json
-        except (json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
-            logging.error(f"Error processing LiDAR buffer: {e}")
-            return {}
+        message, binary_data = split
+        if message.get("topic") not in self.decode_executor_topics:
+            return False
+        if not isinstance(message.get("data"), dict):
+            return False
+        handles = self.pub_sub.select_consumers(message["topic"], message.get("type"))
+        if handles is None:
+            # Decimated, or still in flight after unsubscribe(); don't spend a worker on it
+            return True
+
+        self.decode_executor.submit(message, binary_data,
+                                    functools.partial(self.pub_sub.run_resolve, handles=handles))
+        return True
 
     async def disableTrafficSaving(self, switch: bool) -> bool:
         """
@@ -383,7 +556,7 @@ class WebRTCDataChannel:
         )
         logging.debug(f"Audio channel: {'on' if switch else 'off'}")
     
-    def set_decoder(self, decoder_type: str) -> None:
+    def set_decoder(self, decoder_type: str, **decoder_options: Any) -> None:
         """
         Set the decoder type for processing binary data.
         
@@ -393,6 +566,9 @@ class WebRTCDataChannel:
         
         Args:
             decoder_type: Type of decoder to use ("libvoxel" or "native")
+            **decoder_options: Extra keyword arguments for the decoder, also
+                used by the decode executor workers (e.g. roi=VoxelROI(...)
+                for "native")
             
         Raises:
             ValueError: If decoder_type is not supported
@@ -400,14 +576,115 @@ class WebRTCDataChannel:
         Example:
             >>> datachannel.set_decoder("libvoxel")  # Use WebAssembly decoder
             >>> datachannel.set_decoder("native")    # Use native Python decoder
+            >>> # Only decode voxels between 0.2 m and 1 m height
+            >>> datachannel.set_decoder("native", roi=VoxelROI(z=(0.2, 1.0), metric=True))
         """
         if decoder_type not in ["libvoxel", "native"]:
             raise ValueError("Invalid decoder type. Choose 'libvoxel' or 'native'.")
 
         # Create decoder instance
-        self.decoder = UnifiedLidarDecoder(decoder_type=decoder_type)
+        self.decoder = UnifiedLidarDecoder(decoder_type=decoder_type, **decoder_options)
+        self.decoder_type = decoder_type
+        self.decoder_options = decoder_options
         logging.debug(f"Data decoder changed to: {decoder_type}")
+
+        # Keep the decode executor workers on the same decoder
+        executor = self.decode_executor
+        if executor and (executor.decoder_type != decoder_type
+                         or executor.decoder_options != decoder_options):
+            self.set_decode_executor(executor.executor_type, executor.max_workers,
+                                     executor.max_pending)
+
+    def set_decode_executor(self, executor: Optional[str] = "thread", max_workers: int = 1,
+                            max_pending: Optional[int] = 2) -> None:
+        """
+        Enable or disable decoding LiDAR frames in a worker pool.
+        
+        When enabled, binary payloads for the topics in ``decode_executor_topics``
+        (by default ``rt/utlidar/voxel_map_compressed``) are decoded in a thread
+        or process pool instead of on the asyncio event loop, so slow frames do
+        not delay heartbeats, state callbacks or request responses. Decoded
+        frames are delivered to subscribers in arrival order.
+        
+        Args:
+            executor: "thread", "process", or None to decode inline again
+            max_workers: Number of pool workers
+            max_pending: Maximum number of frames decoding or waiting for
+                delivery; the oldest frame is dropped when exceeded. None
+                never drops frames.
+            
+        Raises:
+            ValueError: If executor or max_pending is invalid
+            
+        Note:
+            Process workers are started with the "spawn" method, so scripts using
+            the "process" executor must guard their entry point with
+            ``if __name__ == "__main__":``.
+            
+        Example:
+            >>> datachannel.set_decode_executor("process", max_workers=2)
+            >>> datachannel.set_decode_executor(None)  # Back to inline decoding
+        """
+        if self.decode_executor:
+            self.decode_executor.shutdown()
+            self.decode_executor = None
+
+        if executor is None:
+            logging.debug("LiDAR decode executor disabled")
+            return
+
+        self.decode_executor = LidarDecodeExecutor(
+            self.decoder_type,
+            decoder_options=self.decoder_options,
+            executor=executor,
+            max_workers=max_workers,
+            max_pending=max_pending,
+            on_decode_time=self.metrics.observe_decode,
+        )
+        logging.debug(f"LiDAR decode executor enabled: {executor} x{max_workers}")
     
+    def start_capture(self, path: str, compression: str = "lz4", chunk_size: int = 1 << 20,
+                      flush_interval: float = 1.0) -> CaptureRecorder:
+        """
+        Record every raw inbound and outbound message to a capture file.
+        
+        Binary messages are stored undecoded (LiDAR frames keep their LZ4
+        voxel payload), together with monotonic and robot timestamps (read
+        from the raw text for text messages that were not parsed yet), in an
+        append-only compressed file with a per-topic time index. Read it back
+        with ``CaptureReader``. A capture already in progress is stopped first.
+        
+        Args:
+            path: Capture file; appended to if it exists
+            compression: "lz4" or "zstd" (requires the zstandard package)
+            chunk_size: Uncompressed bytes per compressed chunk
+            flush_interval: Maximum age in seconds of unwritten messages
+            
+        Returns:
+            CaptureRecorder: The active recorder (counters: records, raw_bytes,
+            written_bytes)
+            
+        Raises:
+            ValueError: If the compression is invalid or unavailable
+            
+        Example:
+            >>> datachannel.start_capture("shift.go2cap")
+            >>> ...
+            >>> datachannel.stop_capture()
+        """
+        self.stop_capture()
+        self.recorder = CaptureRecorder(path, compression, chunk_size, flush_interval)
+        self.pub_sub.recorder = self.recorder
+        logging.info(f"Capturing data channel messages to {path}")
+        return self.recorder
+
+    def stop_capture(self) -> None:
+        """Stop the capture in progress, writing its remaining messages."""
+        recorder, self.recorder = self.recorder, None
+        self.pub_sub.recorder = None
+        if recorder is not None:
+            recorder.close()
+
     def is_open(self) -> bool:
         """
         Check if the data channel is open and ready for use.
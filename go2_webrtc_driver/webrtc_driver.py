@@ -53,6 +53,8 @@ from aiortc.mediastreams import MediaStreamError
 
 from .unitree_auth import send_sdp_to_local_peer, send_sdp_to_remote_peer
 from .webrtc_datachannel import WebRTCDataChannel
+from .msgs.metrics import DataChannelMetrics
+from .msgs.subscription_manager import SubscriptionManager
 from .webrtc_audio import WebRTCAudioChannel
 from .webrtc_video import WebRTCVideoChannel
 from .constants import WebRTCConnectionMethod
@@ -99,6 +101,9 @@ class Go2WebRTCConnection:
         token (str): Authentication token for remote connections
         public_key: RSA public key for encryption (remote connections)
         datachannel (WebRTCDataChannel): Data channel for robot communication
+        metrics (DataChannelMetrics): Data channel traffic metrics, kept across reconnects
+        subscriptions (SubscriptionManager): Local subscribers and the robot-side
+            subscriptions they hold, kept and restored across reconnects
         audio (WebRTCAudioChannel): Audio channel manager
         video (WebRTCVideoChannel): Video channel manager
     """
@@ -153,6 +158,8 @@ class Go2WebRTCConnection:
         self.datachannel: Optional[WebRTCDataChannel] = None
         self.audio: Optional[WebRTCAudioChannel] = None
         self.video: Optional[WebRTCVideoChannel] = None
+        self.metrics = DataChannelMetrics()
+        self.subscriptions = SubscriptionManager(self.metrics)
 
     async def connect(self) -> None:
         """
@@ -337,7 +344,8 @@ class Go2WebRTCConnection:
         self.pc = RTCPeerConnection(configuration)
 
         # Initialize communication channels
-        self.datachannel = WebRTCDataChannel(self, self.pc)
+        self.datachannel = WebRTCDataChannel(self, self.pc, metrics=self.metrics,
+                                             subscriptions=self.subscriptions)
         self.audio = WebRTCAudioChannel(self.pc, self.datachannel)
         self.video = WebRTCVideoChannel(self.pc, self.datachannel)
 
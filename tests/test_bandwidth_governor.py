@@ -0,0 +1,139 @@
+import types
+
+import pytest
+
+from go2_webrtc_driver import bandwidth_governor
+from go2_webrtc_driver.bandwidth_governor import BandwidthGovernor, BandwidthPolicy
+from go2_webrtc_driver.constants import RTC_TOPIC
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.pending = 0
+        self.dropped_frames = 0
+
+    def pending_count(self):
+        return self.pending
+
+
+class FakeDataChannel:
+    """Data channel stub recording the switches the governor makes."""
+
+    def __init__(self):
+        self.calls = []
+        self.buffered = 0
+        self.decode_executor = FakeExecutor()
+        self.metrics = types.SimpleNamespace(traffic={}, register_gauge=lambda *args: None)
+        outbound = types.SimpleNamespace(buffered_amount=lambda: self.buffered)
+        self.pub_sub = types.SimpleNamespace(
+            streams=[], outbound=outbound,
+            publish_without_callback=lambda topic, data: self.calls.append((topic, data)))
+
+    def is_open(self):
+        return True
+
+    def switchVideoChannel(self, switch):
+        self.calls.append(("video", switch))
+
+    async def disableTrafficSaving(self, switch):
+        self.calls.append(("traffic_saving", switch))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(bandwidth_governor, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def governor(**policy):
+    conn = types.SimpleNamespace(datachannel=FakeDataChannel())
+    policy.setdefault("min_dwell", 0.0)
+    return BandwidthGovernor(conn, BandwidthPolicy(max_decode_backlog=4, **policy))
+
+
+async def run(gov, clock, backlog, samples):
+    """Evaluate samples one second apart with a fixed decode backlog."""
+    gov.conn.datachannel.decode_executor.pending = backlog
+    for _ in range(samples):
+        clock[0] += 1.0
+        await gov.evaluate()
+    return gov.level
+
+
+async def test_steps_down_after_congested_samples(clock):
+    gov = governor(steps=("video", "lidar"), step_down_after=3)
+    assert await run(gov, clock, backlog=4, samples=2) == 0
+    assert await run(gov, clock, backlog=4, samples=1) == 1
+    assert gov.conn.datachannel.calls == [("video", False)]
+
+    # The congestion count starts over after each step
+    assert await run(gov, clock, backlog=4, samples=2) == 1
+    assert await run(gov, clock, backlog=4, samples=1) == 2
+    assert gov.conn.datachannel.calls[-1] == (RTC_TOPIC["ULIDAR_SWITCH"], "off")
+    assert gov.applied_steps == ("video", "lidar")
+
+    # No further rung to step down to
+    assert await run(gov, clock, backlog=4, samples=5) == 2
+
+
+async def test_holds_level_inside_headroom_band(clock):
+    gov = governor(steps=("video", "lidar"), step_down_after=1, step_up_after=2, headroom=0.5)
+    assert await run(gov, clock, backlog=4, samples=1) == 1
+    # 3 / 4 is below the limit but above the headroom: neither congested nor clear
+    assert await run(gov, clock, backlog=3, samples=20) == 1
+    # Clear samples interrupted by a band sample start over
+    assert await run(gov, clock, backlog=1, samples=1) == 1
+    assert await run(gov, clock, backlog=3, samples=1) == 1
+    assert await run(gov, clock, backlog=1, samples=1) == 1
+    assert await run(gov, clock, backlog=1, samples=1) == 0
+
+
+async def test_min_dwell_delays_level_changes(clock):
+    gov = governor(steps=("video", "lidar"), step_down_after=1, min_dwell=5.0)
+    assert await run(gov, clock, backlog=4, samples=1) == 1
+    assert await run(gov, clock, backlog=4, samples=4) == 1
+    assert await run(gov, clock, backlog=4, samples=1) == 2
+
+
+async def test_flap_doubles_step_up_requirement(clock):
+    gov = governor(steps=("video",), step_down_after=1, step_up_after=2)
+    assert await run(gov, clock, backlog=4, samples=1) == 1
+    assert await run(gov, clock, backlog=0, samples=2) == 0
+    assert gov.flaps == 0
+
+    # Congested again right after the step up: a flap
+    assert await run(gov, clock, backlog=4, samples=1) == 1
+    assert gov.flaps == 1
+    assert await run(gov, clock, backlog=0, samples=3) == 1
+    assert await run(gov, clock, backlog=0, samples=1) == 0
+
+    # A second flap doubles it again
+    assert await run(gov, clock, backlog=4, samples=1) == 1
+    assert gov.flaps == 2
+    assert await run(gov, clock, backlog=0, samples=7) == 1
+    assert await run(gov, clock, backlog=0, samples=1) == 0
+
+
+async def test_reapplies_steps_after_reconnect(clock):
+    gov = governor(steps=("video", "lidar"), step_down_after=1)
+    assert await run(gov, clock, backlog=4, samples=2) == 2
+
+    gov.conn.datachannel = FakeDataChannel()
+    assert await run(gov, clock, backlog=1, samples=1) == 2
+    assert gov.conn.datachannel.calls == [("video", False), (RTC_TOPIC["ULIDAR_SWITCH"], "off")]
+
+
+async def test_stop_restores_every_step(clock):
+    gov = governor(step_down_after=1)
+    assert await run(gov, clock, backlog=4, samples=3) == 3
+    datachannel = gov.conn.datachannel
+    datachannel.calls.clear()
+
+    await gov.stop()
+    assert gov.level == 0
+    assert datachannel.calls == [
+        (RTC_TOPIC["ULIDAR_SWITCH"], "on"),
+        ("traffic_saving", True),
+        ("video", True),
+    ]
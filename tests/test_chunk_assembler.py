@@ -0,0 +1,167 @@
+import json
+import random
+
+import pytest
+
+from go2_webrtc_driver.msgs.chunk_assembler import ChunkAssembler, ChunkAssembly
+
+
+def split(payload, size):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+
+def feed(assembler, key, chunks, order):
+    """Add chunks (1-based indices in order) and return every non-None result."""
+    results = []
+    for index in order:
+        data = assembler.add(key, index, len(chunks), chunks[index - 1])
+        if data is not None:
+            results.append(data)
+    return results
+
+
+PAYLOAD = json.dumps({"points": list(range(500))}).encode()
+
+
+def test_in_order():
+    chunks = split(PAYLOAD, 100)
+    results = feed(ChunkAssembler(), "k", chunks, range(1, len(chunks) + 1))
+    assert results == [PAYLOAD]
+    assert isinstance(results[0], bytearray)
+    assert json.loads(results[0]) == json.loads(PAYLOAD)
+    assert results[0].decode() == PAYLOAD.decode()
+
+
+def test_shuffled_with_duplicates():
+    chunks = split(PAYLOAD, 100)
+    rng = random.Random(1)
+    for _ in range(20):
+        indices = list(range(1, len(chunks) + 1))
+        rng.shuffle(indices)
+        # Repeat already received chunks before the transfer completes
+        order = []
+        for index in indices:
+            if order and rng.random() < 0.5:
+                order.append(rng.choice(order))
+            order.append(index)
+        assert feed(ChunkAssembler(), "k", chunks, order) == [PAYLOAD]
+
+
+def test_duplicates_do_not_count():
+    assembly = ChunkAssembly(3)
+    assembly.add(1, b"abc")
+    assembly.add(1, b"abc")
+    assembly.add(2, b"def")
+    assert assembly.received == 2
+    assert not assembly.complete
+    assembly.add(3, b"g")
+    assert assembly.complete
+    assert assembly.result() == b"abcdefg"
+
+
+def test_short_final_chunk_first():
+    chunks = split(PAYLOAD, 128)
+    assert len(chunks[-1]) < 128
+    order = [len(chunks)] + list(range(1, len(chunks)))
+    assembler = ChunkAssembler()
+    results = feed(assembler, "k", chunks, order)
+    assert results == [PAYLOAD]
+    assert isinstance(results[0], bytearray)
+
+
+def test_short_final_chunk_first_then_shuffled():
+    chunks = split(PAYLOAD, 128)
+    rest = list(range(1, len(chunks)))
+    random.Random(2).shuffle(rest)
+    assert feed(ChunkAssembler(), "k", chunks, [len(chunks)] + rest) == [PAYLOAD]
+
+
+def test_final_chunk_sets_exact_length():
+    assembly = ChunkAssembly(2)
+    assembly.add(1, b"abcd")
+    assert assembly.nbytes == 8
+    assembly.add(2, b"e")
+    assert assembly.nbytes == 5
+    assert assembly.result() == b"abcde"
+
+
+@pytest.mark.parametrize("order", [[1, 2, 3, 4], [4, 3, 2, 1], [2, 4, 1, 3], [3, 1, 4, 2]])
+def test_irregular_chunk_sizes(order):
+    chunks = [b"12345", b"6789012", b"345", b"67890123"]
+    results = feed(ChunkAssembler(), "k", chunks, order)
+    assert results == [b"".join(chunks)]
+    assert json.loads(results[0]) == int(b"".join(chunks))
+
+
+def test_irregular_final_chunk_first():
+    # A final chunk longer than the regular ones only shows up once they arrive
+    chunks = [b"ab", b"cd", b"efgh"]
+    assert feed(ChunkAssembler(), "k", chunks, [3, 1, 2]) == [b"abcdefgh"]
+
+
+def test_single_chunk():
+    assert ChunkAssembler().add("k", 1, 1, "text") == b"text"
+
+
+def test_out_of_range_index_is_ignored():
+    assembler = ChunkAssembler()
+    assert assembler.add("k", 3, 2, b"x") is None
+    assert assembler.add("k", 1, 2, b"ab") is None
+    assert assembler.add("k", 2, 2, b"c") == b"abc"
+
+
+def test_new_total_restarts_transfer():
+    assembler = ChunkAssembler()
+    assembler.add("k", 1, 3, b"ab")
+    assert assembler.add("k", 1, 2, b"xy") is None
+    assert assembler.add("k", 2, 2, b"z") == b"xyz"
+
+
+def test_eviction_calls_on_evict():
+    evicted = []
+    assembler = ChunkAssembler(budget=1000, on_evict=lambda key, reason: evicted.append(key))
+    assembler.add("old", 1, 3, b"x" * 200)      # Reserves 600 bytes
+    assembler.add("new", 1, 3, b"y" * 200)      # Another 600: over budget
+    assert evicted == ["old"]
+    assert assembler.evicted == 1
+    assert "old" not in assembler
+    assert "new" in assembler
+    assert assembler.nbytes == 600
+
+
+def test_eviction_spares_recently_active_transfer():
+    evicted = []
+    assembler = ChunkAssembler(budget=1000, on_evict=lambda key, reason: evicted.append(key))
+    assembler.add("a", 1, 3, b"x" * 100)
+    assembler.add("b", 1, 3, b"y" * 100)
+    assembler.add("a", 2, 3, b"x" * 100)        # "a" is now the most recent
+    assembler.add("c", 1, 3, b"z" * 200)
+    assert evicted == ["b"]
+    assert "a" in assembler and "c" in assembler
+
+
+def test_transfer_larger_than_budget_is_rejected():
+    reasons = []
+    assembler = ChunkAssembler(budget=100, on_evict=lambda key, reason: reasons.append((key, reason)))
+    assert assembler.add("big", 1, 10, b"x" * 50) is None
+    assert [key for key, _ in reasons] == ["big"]
+    assert "budget" in reasons[0][1]
+    assert len(assembler) == 0
+    assert assembler.nbytes == 0
+
+
+def test_nbytes_released_on_completion_and_discard():
+    assembler = ChunkAssembler()
+    assembler.add("a", 1, 2, b"ab")
+    assembler.add("b", 1, 2, b"cd")
+    assert assembler.nbytes == 8
+    assembler.add("a", 2, 2, b"e")
+    assert assembler.nbytes == 4
+    assert assembler.discard("b")
+    assert not assembler.discard("b")
+    assert assembler.nbytes == 0
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        ChunkAssembler(budget=0)
@@ -0,0 +1,145 @@
+import asyncio
+import math
+
+import pytest
+
+from go2_webrtc_driver.constants import DATA_CHANNEL_TYPE
+from go2_webrtc_driver.msgs.future_resolver import FutureResolver
+
+TOPIC = "rt/api/test/request"
+
+
+def chunk(request_id, index, total, data):
+    return {
+        "type": DATA_CHANNEL_TYPE["RESPONSE"],
+        "topic": TOPIC,
+        "data": {
+            "header": {"identity": {"id": request_id}},
+            "content_info": {"enable_chunking": True, "chunk_index": index,
+                             "total_chunk_num": total},
+            "data": data,
+        },
+    }
+
+
+def request(resolver, request_id, timeout=None):
+    future = asyncio.get_running_loop().create_future()
+    resolver.save_resolve(DATA_CHANNEL_TYPE["REQUEST"], TOPIC, future, request_id, timeout)
+    return future
+
+
+async def test_chunked_response_resolves_future():
+    resolver = FutureResolver()
+    future = request(resolver, 1)
+    resolver.run_resolve_for_topic(chunk(1, 2, 3, b"def"))
+    resolver.run_resolve_for_topic(chunk(1, 3, 3, b"g"))
+    assert not future.done()
+    resolver.run_resolve_for_topic(chunk(1, 1, 3, b"abc"))
+    message = await future
+    assert message["data"]["data"] == b"abcdefg"
+    assert resolver.stats()["in_flight"] == 0
+    assert resolver.stats()["chunk_buffers"] == 0
+
+
+async def test_timeout_fails_future_and_purges_buffer():
+    resolver = FutureResolver()
+    future = request(resolver, 1, timeout=0.05)
+    resolver.run_resolve_for_topic(chunk(1, 1, 3, b"abc"))
+    assert resolver.stats()["chunk_buffers"] == 1
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(future, 1.0)
+
+    stats = resolver.stats()
+    assert stats["timed_out"] == 1
+    assert stats["purged_chunk_buffers"] == 1
+    assert stats["chunk_buffers"] == 0
+    assert stats["chunk_buffer_bytes"] == 0
+    assert stats["in_flight"] == 0
+
+
+async def test_chunk_extends_deadline():
+    resolver = FutureResolver()
+    future = request(resolver, 1, timeout=0.2)
+    # Each chunk arrives before the running deadline; together they take
+    # twice the timeout
+    for index in range(1, 4):
+        await asyncio.sleep(0.1)
+        resolver.run_resolve_for_topic(chunk(1, index, 5, b"ab"))
+    await asyncio.sleep(0.1)
+    assert not future.done()
+    resolver.run_resolve_for_topic(chunk(1, 4, 5, b"ab"))
+    resolver.run_resolve_for_topic(chunk(1, 5, 5, b"c"))
+    assert (await future)["data"]["data"] == b"ababababc"
+    assert resolver.timed_out == 0
+
+
+async def test_stalled_transfer_times_out_after_last_chunk():
+    resolver = FutureResolver()
+    future = request(resolver, 1, timeout=0.15)
+    await asyncio.sleep(0.1)
+    resolver.run_resolve_for_topic(chunk(1, 1, 2, b"ab"))
+    await asyncio.sleep(0.1)
+    assert not future.done()    # Past the original deadline, extended by the chunk
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(future, 1.0)
+    assert resolver.purged_chunk_buffers == 1
+
+
+async def test_unanswered_request_times_out():
+    resolver = FutureResolver(default_timeout=0.05)
+    future = request(resolver, 1)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(future, 1.0)
+    assert resolver.timed_out == 1
+    assert resolver.in_flight() == 0
+
+
+async def test_resolved_request_does_not_time_out():
+    resolver = FutureResolver(default_timeout=0.05)
+    future = request(resolver, 1)
+    resolver.run_resolve_for_topic(chunk(1, 1, 1, b"x"))
+    assert (await future)["data"]["data"] == b"x"
+    await asyncio.sleep(0.1)
+    assert resolver.timed_out == 0
+
+
+async def test_infinite_timeout_disables_deadline():
+    resolver = FutureResolver(default_timeout=0.05)
+    future = request(resolver, 1, timeout=math.inf)
+    await asyncio.sleep(0.1)
+    assert not future.done()
+    resolver.cancel_all()
+    with pytest.raises(ConnectionError):
+        await future
+
+
+async def test_orphan_chunk_buffer_expires():
+    resolver = FutureResolver(default_timeout=0.05)
+    resolver.run_resolve_for_topic(chunk(7, 1, 2, b"ab"))
+    assert resolver.stats()["chunk_buffers"] == 1
+    await asyncio.sleep(0.15)
+    assert resolver.stats()["chunk_buffers"] == 0
+    assert resolver.purged_chunk_buffers == 1
+
+
+async def test_eviction_fails_waiting_future():
+    resolver = FutureResolver(chunk_budget=1000)
+    old = request(resolver, 1)
+    new = request(resolver, 2)
+    resolver.run_resolve_for_topic(chunk(1, 1, 3, b"x" * 200))
+    resolver.run_resolve_for_topic(chunk(2, 1, 3, b"y" * 200))
+    with pytest.raises(MemoryError):
+        await old
+    assert not new.done()
+    assert resolver.stats()["evicted_chunk_buffers"] == 1
+    resolver.run_resolve_for_topic(chunk(2, 2, 3, b"y" * 200))
+    resolver.run_resolve_for_topic(chunk(2, 3, 3, b"y"))
+    assert (await new)["data"]["data"] == b"y" * 401
+
+
+async def test_invalid_timeouts():
+    with pytest.raises(ValueError):
+        FutureResolver(default_timeout=0)
+    with pytest.raises(ValueError):
+        request(FutureResolver(), 1, timeout=-1)
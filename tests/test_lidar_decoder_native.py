@@ -0,0 +1,278 @@
+import lz4.block
+import numpy as np
+import pytest
+
+from go2_webrtc_driver.lidar import lidar_decoder_native
+from go2_webrtc_driver.lidar.lidar_decoder_native import (
+    NUMBA_AVAILABLE,
+    SLICE_BYTES,
+    LidarDecoder,
+    VoxelGrid,
+    VoxelROI,
+    bits_to_points,
+)
+
+ORIGIN = [-3.2, 1.05, -0.4]
+RESOLUTION = 0.05
+
+BACKENDS = [
+    "numpy",
+    pytest.param(
+        "numba", marks=pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+    ),
+]
+
+
+def voxel_buffer(size, seed=0):
+    rng = np.random.default_rng(seed)
+    buf = rng.integers(0, 256, size, dtype=np.uint8)
+    buf[rng.random(size) < 0.8] = 0  # Mostly empty bytes, like real frames
+    return buf.tobytes()
+
+
+ROIS = [
+    VoxelROI(z=(1, 3)),
+    VoxelROI(x=(3, 77), y=(5, 100), z=(0, 4), stride=3),
+    VoxelROI(x=(9, 12), y=(120, 200)),
+    VoxelROI(x=(-10, 200), stride=2),
+    VoxelROI(x=(40, 40)),
+    VoxelROI(x=(-1.0, -2.0), y=(2.0, 4.0), z=(None, -0.2), metric=True),
+    VoxelROI(x=(-1.0, 1.0), z=(-0.3, None), stride=2, metric=True),
+]
+
+
+def reference_points(buf, origin, resolution, roi=None):
+    """Pure-Python expansion of the bit layout: z slice, y row, byte column, MSB = lowest x."""
+    slices = -(-len(buf) // SLICE_BYTES)
+    if roi is None:
+        ranges, stride = ((0, 128), (0, 128), (0, slices)), 1
+    else:
+        ranges, stride = roi.resolve(origin, resolution, slices), roi.stride
+    origin32 = [np.float32(value) for value in origin]
+    resolution32 = np.float32(resolution)
+
+    points = []
+    for n, byte_value in enumerate(buf):
+        z, y, column = n // SLICE_BYTES, (n % SLICE_BYTES) // 16, n % 16
+        for bit in range(8):
+            if not byte_value & (0x80 >> bit):
+                continue
+            voxel = (column * 8 + bit, y, z)
+            if all(start <= value < stop and (value - start) % stride == 0
+                   for value, (start, stop) in zip(voxel, ranges)):
+                points.append([np.float32(value) * resolution32 + offset
+                               for value, offset in zip(voxel, origin32)])
+    return np.array(points, dtype=np.float32).reshape(-1, 3)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("size", [4 * SLICE_BYTES, 3 * SLICE_BYTES + 100])
+def test_bits_to_points_matches_reference(backend, size):
+    buf = voxel_buffer(size)
+    points = bits_to_points(buf, ORIGIN, RESOLUTION, backend=backend)
+    assert points.dtype == np.float32
+    assert np.array_equal(points, reference_points(buf, ORIGIN, RESOLUTION))
+
+
+def test_bits_to_points_empty_grid():
+    points = bits_to_points(bytes(2 * SLICE_BYTES), ORIGIN, RESOLUTION, backend="numpy")
+    assert points.shape == (0, 3)
+
+
+def test_bits_to_points_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        bits_to_points(bytes(SLICE_BYTES), ORIGIN, RESOLUTION, backend="cython")
+
+
+def frame(buf):
+    metadata = {"src_size": len(buf), "origin": ORIGIN, "resolution": RESOLUTION}
+    return lz4.block.compress(buf, store_size=False), metadata
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_decoder_reuses_arena_across_frames(backend):
+    decoder = LidarDecoder(backend=backend, zero_copy=True)
+    sizes = ((1, 2), (2, 5), (3, 3))
+    buffers = [voxel_buffer(slices * SLICE_BYTES, seed) for seed, slices in sizes]
+
+    points = decoder.decode(*frame(buffers[0]))["points"]
+    assert np.array_equal(points, reference_points(buffers[0], ORIGIN, RESOLUTION))
+
+    # Larger frame: the arena grows with slack
+    points = decoder.decode(*frame(buffers[1]))["points"]
+    assert np.array_equal(points, reference_points(buffers[1], ORIGIN, RESOLUTION))
+    capacity = decoder.capacity
+    assert capacity > len(points)
+
+    # Smaller frame: decoded into the same arena as a read-only view
+    points = decoder.decode(*frame(buffers[2]))["points"]
+    assert np.array_equal(points, reference_points(buffers[2], ORIGIN, RESOLUTION))
+    assert decoder.capacity == capacity
+    assert np.shares_memory(points, decoder._arena)
+    assert not points.flags.writeable
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_decoder_copies_by_default(backend):
+    decoder = LidarDecoder(backend=backend)
+    buf = voxel_buffer(2 * SLICE_BYTES, seed=5)
+    points = decoder.decode(*frame(buf))["points"]
+    assert not np.shares_memory(points, decoder._arena)
+    assert points.flags.writeable
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+@pytest.mark.parametrize("arena_size", [None, 0, 10, 100000])
+def test_numba_expansion_sizes_output_in_one_pass(monkeypatch, arena_size):
+    buf = np.frombuffer(voxel_buffer(3 * SLICE_BYTES, seed=6), dtype=np.uint8)
+    expected = reference_points(buf.tobytes(), ORIGIN, RESOLUTION)
+    kernel = lidar_decoder_native._expand_points_numba
+    calls = []
+
+    def counting_kernel(*args):
+        calls.append(len(args[1]))
+        return kernel(*args)
+
+    monkeypatch.setattr(lidar_decoder_native, "_expand_points_numba", counting_kernel)
+    arena = None if arena_size is None else np.empty((arena_size, 3), dtype=np.float32)
+    points = lidar_decoder_native._expand_points(buf, ORIGIN, RESOLUTION, "numba", arena)
+
+    assert np.array_equal(points, expected)
+    if arena_size is None:
+        # One-off expansion: sized up front, exactly one kernel pass
+        assert calls == [len(expected)]
+    elif arena_size < len(expected):
+        # Reused arena too small: count, grow and expand again
+        assert calls == [arena_size, len(expected)]
+    else:
+        assert calls == [arena_size]
+        assert np.shares_memory(points, arena)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("roi", ROIS, ids=repr)
+@pytest.mark.parametrize("size", [4 * SLICE_BYTES, 3 * SLICE_BYTES + 100])
+def test_roi_matches_reference(backend, roi, size):
+    buf = voxel_buffer(size, seed=7)
+    points = bits_to_points(buf, ORIGIN, RESOLUTION, backend=backend, roi=roi)
+    assert np.array_equal(points, reference_points(buf, ORIGIN, RESOLUTION, roi))
+
+
+def test_roi_metric_bounds_match_point_filter():
+    buf = voxel_buffer(4 * SLICE_BYTES, seed=8)
+    points = bits_to_points(buf, ORIGIN, RESOLUTION, backend="numpy")
+    roi = VoxelROI(x=(-1.0, 1.5), y=(2.0, 4.0), z=(-0.3, -0.25), metric=True)
+    inside = np.all((points >= np.float32([-1.0, 2.0, -0.3]))
+                    & (points <= np.float32([1.5, 4.0, -0.25])), axis=1)
+    assert np.array_equal(bits_to_points(buf, ORIGIN, RESOLUTION, backend="numpy", roi=roi),
+                          points[inside])
+
+
+def test_roi_resolve_clips_and_empties():
+    roi = VoxelROI(x=(-5, 300), y=(None, 10), z=(8, 2))
+    assert roi.resolve(ORIGIN, RESOLUTION, 4) == ((0, 128), (0, 10), (4, 4))
+    assert VoxelROI().resolve(ORIGIN, RESOLUTION, 4) == ((0, 128), (0, 128), (0, 4))
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"stride": 0},
+    {"stride": 1.5},
+    {"x": (1, 2, 3)},
+    {"z": (0.5, 2)},
+])
+def test_roi_rejects_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        VoxelROI(**kwargs)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_decoder_applies_roi(backend):
+    roi = VoxelROI(y=(20, 90), z=(1, 3), stride=2)
+    decoder = LidarDecoder(backend=backend, roi=roi)
+    buf = voxel_buffer(3 * SLICE_BYTES, seed=9)
+    points = decoder.decode(*frame(buf))["points"]
+    assert np.array_equal(points, reference_points(buf, ORIGIN, RESOLUTION, roi))
+
+
+def reference_voxels(buf):
+    """Set of occupied (x, y, z) voxel indices."""
+    voxels = set()
+    for n, byte_value in enumerate(buf):
+        for bit in range(8):
+            if byte_value & (0x80 >> bit):
+                voxels.add(((n % 16) * 8 + bit, (n % SLICE_BYTES) // 16, n // SLICE_BYTES))
+    return voxels
+
+
+def grid_voxels(grid):
+    return {tuple(voxel) for voxel in grid.indices().tolist()}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_grid_count_indices_and_points(backend):
+    buf = voxel_buffer(3 * SLICE_BYTES + 100, seed=10)
+    grid = VoxelGrid.from_buffer(buf, ORIGIN, RESOLUTION)
+    expected = reference_points(buf, ORIGIN, RESOLUTION)
+
+    assert grid.shape == (128, 128, 4)
+    assert grid.count() == len(expected)
+    assert grid_voxels(grid) == reference_voxels(buf)
+    assert np.array_equal(grid.to_points(backend=backend), expected)
+
+
+def test_grid_occupied_lookup():
+    buf = voxel_buffer(2 * SLICE_BYTES, seed=11)
+    grid = VoxelGrid.from_buffer(buf, ORIGIN, RESOLUTION)
+    occupied = reference_voxels(buf)
+    x, y, z = np.meshgrid(np.arange(128), np.arange(128), np.arange(2), indexing="ij")
+    lookup = grid.occupied(x, y, z)
+    assert {tuple(v) for v in np.argwhere(lookup).tolist()} == occupied
+    assert not grid.occupied([-1, 128, 0, 0], [0, 0, -1, 0], [0, 0, 0, 2]).any()
+
+
+def test_grid_occupied_at_world_coordinates():
+    buf = voxel_buffer(2 * SLICE_BYTES, seed=12)
+    grid = VoxelGrid.from_buffer(buf, ORIGIN, RESOLUTION)
+    points = reference_points(buf, ORIGIN, RESOLUTION)
+    # Anywhere within the voxel rounds to it
+    assert grid.occupied_at(points + 0.4 * RESOLUTION).all()
+    assert grid.occupied_at(points[0]).shape == ()
+    outside = np.array(ORIGIN) - [1.0, 0.0, 0.0]
+    assert not grid.occupied_at(outside)
+    empty = VoxelGrid(np.zeros_like(grid.bits), ORIGIN, RESOLUTION)
+    assert not empty.occupied_at(points).any()
+
+
+def test_grid_bitwise_operators():
+    first, second = voxel_buffer(2 * SLICE_BYTES, seed=13), voxel_buffer(2 * SLICE_BYTES, seed=14)
+    a = VoxelGrid.from_buffer(first, ORIGIN, RESOLUTION)
+    b = VoxelGrid.from_buffer(second, ORIGIN, RESOLUTION)
+    va, vb = reference_voxels(first), reference_voxels(second)
+
+    assert grid_voxels(a & b) == va & vb
+    assert grid_voxels(a | b) == va | vb
+    assert grid_voxels(a ^ b) == va ^ vb
+    assert (a | b).count() == len(va | vb)
+    assert a == VoxelGrid.from_buffer(first, ORIGIN, RESOLUTION)
+    assert a != b
+
+
+def test_grid_operators_require_compatible_grids():
+    buf = voxel_buffer(2 * SLICE_BYTES, seed=15)
+    grid = VoxelGrid.from_buffer(buf, ORIGIN, RESOLUTION)
+    with pytest.raises(ValueError):
+        grid & VoxelGrid.from_buffer(buf, [0.0, 0.0, 0.0], RESOLUTION)
+    with pytest.raises(ValueError):
+        grid | VoxelGrid.from_buffer(buf + bytes(SLICE_BYTES), ORIGIN, RESOLUTION)
+    with pytest.raises(TypeError):
+        grid ^ grid.bits
+    with pytest.raises(ValueError):
+        VoxelGrid(np.zeros((2, 64, 16), dtype=np.uint8), ORIGIN, RESOLUTION)
+
+
+def test_decoder_grid_output():
+    buf = voxel_buffer(2 * SLICE_BYTES, seed=16)
+    grid = LidarDecoder(output="grid").decode(*frame(buf))["grid"]
+    assert grid == VoxelGrid.from_buffer(buf, ORIGIN, RESOLUTION)
+    with pytest.raises(ValueError):
+        LidarDecoder(output="grid", roi=VoxelROI(z=(0, 1)))
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from go2_webrtc_driver.constants import RTC_TOPIC
+from go2_webrtc_driver.msgs import outbound
+from go2_webrtc_driver.msgs.outbound import LANE_BULK, LANE_CONTROL, OutboundScheduler
+from go2_webrtc_driver.msgs.pub_sub import WebRTCDataChannelPubSub
+
+
+class FakeChannel:
+    """Buffers sent bytes until transmit() and fires bufferedamountlow like aiortc."""
+
+    def __init__(self):
+        self.readyState = "open"
+        self.bufferedAmount = 0
+        self.bufferedAmountLowThreshold = 0
+        self.sent = []
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def send(self, message):
+        self.sent.append(message)
+        self.bufferedAmount += len(message)
+
+    def transmit(self, size):
+        before = self.bufferedAmount
+        self.bufferedAmount = max(before - size, 0)
+        if before > self.bufferedAmountLowThreshold >= self.bufferedAmount:
+            self.handlers["bufferedamountlow"]()
+
+
+@pytest.fixture(autouse=True)
+def no_polling(monkeypatch):
+    # Only bufferedamountlow may drain the lanes in these tests
+    monkeypatch.setattr(outbound, "POLL_INTERVAL", 60.0)
+
+
+def chunk(index, size=1000):
+    return f"{index:04d}".ljust(size, "x")
+
+
+async def test_bulk_pauses_above_threshold_and_resumes_on_event():
+    channel = FakeChannel()
+    scheduler = OutboundScheduler(channel, request_limit=8000, bulk_limit=2500)
+    assert channel.bufferedAmountLowThreshold == 1250
+
+    senders = [asyncio.create_task(scheduler.send(chunk(i), LANE_BULK)) for i in range(6)]
+    await asyncio.sleep(0)
+    # Two chunks fit below the limit; the rest wait in the bulk lane
+    assert len(channel.sent) == 2
+    assert scheduler.queued() == 4
+    assert sum(sender.done() for sender in senders) == 2
+
+    # Still above the low threshold: nothing more is sent
+    channel.transmit(500)
+    await asyncio.sleep(0)
+    assert len(channel.sent) == 2
+
+    # Crossing the threshold resumes sending up to the limit
+    channel.transmit(500)
+    await asyncio.sleep(0)
+    assert len(channel.sent) == 3
+    assert channel.bufferedAmount == 2000
+
+    while scheduler.queued():
+        channel.transmit(channel.bufferedAmount)
+        await asyncio.sleep(0)
+    await asyncio.gather(*senders)
+    assert channel.sent == [chunk(i) for i in range(6)]
+    assert scheduler.stats()["lanes"]["bulk"]["queued_total"] == 4
+    assert scheduler.max_buffered <= 2500
+
+
+async def test_control_overtakes_backlogged_bulk_lane():
+    channel = FakeChannel()
+    scheduler = OutboundScheduler(channel, request_limit=8000, bulk_limit=2500)
+    senders = [asyncio.create_task(scheduler.send(chunk(i), LANE_BULK)) for i in range(10)]
+    await asyncio.sleep(0)
+    assert scheduler.queued() == 8
+
+    scheduler.send_nowait("move", topic=RTC_TOPIC["SPORT_MOD"])
+    scheduler.send_nowait("stop", LANE_CONTROL)
+    # Sent at once, ahead of every queued chunk
+    assert channel.sent[2:] == ["move", "stop"]
+
+    # A request waits for room but drains before the bulk backlog
+    scheduler.send_nowait("x" * 6000, topic=RTC_TOPIC["ULIDAR_SWITCH"])
+    assert channel.sent[-1] == "stop"
+    channel.transmit(channel.bufferedAmount)
+    await asyncio.sleep(0)
+    assert channel.sent[4] == "x" * 6000
+
+    while scheduler.queued():
+        channel.transmit(channel.bufferedAmount)
+        await asyncio.sleep(0)
+    await asyncio.gather(*senders)
+    assert [message for message in channel.sent if len(message) == 1000] == \
+        [chunk(i) for i in range(10)]
+
+
+async def test_closed_channel_fails_waiting_senders():
+    channel = FakeChannel()
+    scheduler = OutboundScheduler(channel, request_limit=2000, bulk_limit=1000)
+    first = asyncio.create_task(scheduler.send(chunk(0), LANE_BULK))
+    second = asyncio.create_task(scheduler.send(chunk(1), LANE_BULK))
+    await asyncio.sleep(0)
+
+    channel.readyState = "closed"
+    channel.transmit(channel.bufferedAmount)
+    await first
+    with pytest.raises(ConnectionError):
+        await second
+    assert scheduler.queued() == 0
+
+
+async def test_publish_bulk_is_paced_through_the_bulk_lane():
+    channel = FakeChannel()
+    pub_sub = WebRTCDataChannelPubSub(channel)
+    upload = [{"chunk": i, "data": "x" * 30000} for i in range(5)]
+
+    async def uploader():
+        for data in upload:
+            await pub_sub.publish_bulk("", data)
+
+    task = asyncio.create_task(uploader())
+    await asyncio.sleep(0)
+    # The default 64 KiB bulk limit holds two chunks
+    assert len(channel.sent) == 2
+    assert not task.done()
+
+    while not task.done():
+        channel.transmit(channel.bufferedAmount)
+        await asyncio.sleep(0)
+    await task
+    assert [message.count('"chunk"') for message in channel.sent] == [1] * 5
+    assert pub_sub.outbound.stats()["lanes"]["bulk"]["sent"] == 5
@@ -0,0 +1,240 @@
+import json
+import logging
+import time
+import types
+
+import pytest
+
+from go2_webrtc_driver.msgs import topic_router
+from go2_webrtc_driver.msgs.lazy_message import LazyMessage
+from go2_webrtc_driver.msgs.pub_sub import WebRTCDataChannelPubSub
+from go2_webrtc_driver.msgs.topic_router import TopicRouter
+from go2_webrtc_driver.webrtc_datachannel import WebRTCDataChannel
+
+LIDAR_TOPIC = "rt/utlidar/voxel_map_compressed"
+
+
+def message(topic):
+    return {"type": "msg", "topic": topic, "data": {}}
+
+
+class Recorder:
+    """Callback recording (name, topic) of every delivered message."""
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def __call__(self, msg):
+        self.log.append((self.name, msg["topic"]))
+
+
+def subscribe(router, log, pattern, name=None):
+    return router.add(pattern, Recorder(log, name or pattern))
+
+
+@pytest.mark.parametrize("pattern, matching, other", [
+    ("rt/lf/lowstate", ["rt/lf/lowstate"], ["rt/lf", "rt/lf/lowstate/x", "rt/lf/sportmodestate"]),
+    ("rt/utlidar/*", ["rt/utlidar/voxel_map", "rt/utlidar/switch"],
+     ["rt/utlidar", "rt/utlidar/a/b", "rt/lf/lowstate"]),
+    ("rt/*/lowstate", ["rt/lf/lowstate", "rt/mf/lowstate"], ["rt/lf/sportmodestate"]),
+    ("rt/**", ["rt/lf", "rt/lf/lowstate", "rt/utlidar/a/b/c"], ["rt", "api/rt/lf"]),
+    ("**", ["rt", "rt/lf/lowstate"], []),
+])
+def test_pattern_matching(pattern, matching, other):
+    router = TopicRouter()
+    handle = router.add(pattern, lambda msg: None)
+    for topic in matching:
+        assert router.match(topic) == (handle,), topic
+    for topic in other:
+        assert router.match(topic) == (), topic
+
+
+def test_double_wildcard_only_as_last_segment():
+    with pytest.raises(ValueError):
+        TopicRouter().add("rt/**/lowstate", lambda msg: None)
+
+
+def test_delivery_in_registration_order():
+    router, log = TopicRouter(), []
+    subscribe(router, log, "rt/**", "tail")
+    subscribe(router, log, "rt/lf/lowstate", "exact")
+    subscribe(router, log, "rt/*/lowstate", "single")
+    subscribe(router, log, "rt/lf/lowstate", "exact2")
+
+    assert router.dispatch(message("rt/lf/lowstate")) == 4
+    assert [name for name, _ in log] == ["tail", "exact", "single", "exact2"]
+
+
+def test_match_cache_follows_subscription_changes():
+    router, log = TopicRouter(), []
+    first = subscribe(router, log, "rt/lf/lowstate")
+    assert router.match("rt/lf/lowstate") == (first,)
+    assert router.match("rt/lf/lowstate") is router.match("rt/lf/lowstate")  # Cached
+
+    second = subscribe(router, log, "rt/lf/*")
+    assert router.match("rt/lf/lowstate") == (first, second)
+    first.remove()
+    assert router.match("rt/lf/lowstate") == (second,)
+
+
+def test_remove_prunes_trie():
+    router, log = TopicRouter(), []
+    exact = subscribe(router, log, "rt/lf/lowstate")
+    wildcard = subscribe(router, log, "rt/utlidar/*")
+    tail = subscribe(router, log, "api/**")
+    shared = subscribe(router, log, "rt/lf/sportmodestate")
+
+    exact.remove()
+    exact.remove()  # Idempotent
+    assert not exact.active
+    assert set(router._root.children["rt"].children["lf"].children) == {"sportmodestate"}
+
+    for handle in (wildcard, tail, shared):
+        handle.remove()
+    assert router._root.children == {}
+    assert router.patterns() == []
+    assert router.dispatch(message("rt/lf/lowstate")) == 0
+    assert log == []
+
+
+def test_remove_pattern_and_on_remove():
+    removed = []
+    router, log = TopicRouter(on_remove=removed.append), []
+    handles = [subscribe(router, log, "rt/lf/lowstate", str(i)) for i in range(3)]
+    other = subscribe(router, log, "rt/lf/*")
+
+    assert router.handles_for_pattern("rt/lf/lowstate") == handles
+    assert router.remove_pattern("rt/lf/lowstate") == 3
+    assert removed == handles
+    assert router.match("rt/lf/lowstate") == (other,)
+
+
+def test_raising_callback_does_not_block_later_subscribers(caplog):
+    router, log = TopicRouter(), []
+
+    def broken(msg):
+        raise RuntimeError("boom")
+
+    subscribe(router, log, "rt/lf/lowstate", "first")
+    router.add("rt/lf/*", broken)
+    subscribe(router, log, "rt/**", "last")
+
+    with caplog.at_level(logging.ERROR):
+        assert router.dispatch(message("rt/lf/lowstate")) == 3
+    assert [name for name, _ in log] == ["first", "last"]
+    assert "boom" in caplog.text
+
+
+def test_subscriber_removed_during_dispatch_is_skipped():
+    router, log = TopicRouter(), []
+    later = None
+
+    def remove_later(msg):
+        later.remove()
+
+    router.add("rt/lf/lowstate", remove_later)
+    later = subscribe(router, log, "rt/lf/lowstate")
+    router.dispatch(message("rt/lf/lowstate"))
+    assert log == []
+
+
+class FakeChannel:
+    readyState = "open"
+    bufferedAmount = 0
+
+    def __init__(self):
+        self.sent = []
+
+    def on(self, event, handler):
+        pass
+
+    def send(self, message):
+        self.sent.append(message)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    fake_time = types.SimpleNamespace(monotonic=lambda: now[0], perf_counter=time.perf_counter)
+    monkeypatch.setattr(topic_router, "time", fake_time)
+    return now
+
+
+def test_every_nth():
+    router, log = TopicRouter(), []
+    handle = router.add("rt/lf/lowstate", Recorder(log, "third"), every_nth=3)
+    subscribe(router, log, "rt/lf/lowstate", "all")
+
+    delivered = [router.dispatch(message("rt/lf/lowstate")) for _ in range(9)]
+    assert delivered == [1, 1, 2] * 3
+    assert [name for name, _ in log].count("third") == 3
+    assert handle.skipped == 6
+
+
+def test_max_rate_hz(clock):
+    router, delivered = TopicRouter(), []
+    handle = router.add(LIDAR_TOPIC, lambda msg: delivered.append(clock[0] - 1000.0),
+                        max_rate_hz=10)
+    for offset in (0.0, 0.05, 0.1, 0.12, 0.2, 0.31, 5.0, 5.01, 5.05, 5.1):
+        clock[0] = 1000.0 + offset
+        router.dispatch(message(LIDAR_TOPIC))
+    # On schedule despite jitter; no burst to catch up after the gap
+    assert delivered == pytest.approx([0.0, 0.1, 0.2, 0.31, 5.0, 5.1])
+    assert handle.skipped == 4
+
+
+def test_every_nth_then_max_rate(clock):
+    router, delivered = TopicRouter(), []
+    router.add(LIDAR_TOPIC, lambda msg: delivered.append(clock[0] - 1000.0),
+               every_nth=2, max_rate_hz=2)
+    for step in range(12):
+        clock[0] = 1000.0 + step * 0.125
+        router.dispatch(message(LIDAR_TOPIC))
+    # Every second message (0.125, 0.375, ...), then at most one per 0.5 s
+    assert delivered == [0.125, 0.625, 1.125]
+
+
+def test_invalid_decimation():
+    router = TopicRouter()
+    with pytest.raises(ValueError):
+        router.add(LIDAR_TOPIC, print, every_nth=0)
+    with pytest.raises(ValueError):
+        router.add(LIDAR_TOPIC, print, max_rate_hz=0)
+
+
+def test_executor_path_decimates_once_and_skips_decoding():
+    pub_sub = WebRTCDataChannelPubSub(FakeChannel())
+    delivered = []
+    pub_sub.subscribe(LIDAR_TOPIC, delivered.append, every_nth=2)
+    submitted = []
+    executor = types.SimpleNamespace(
+        submit=lambda msg, payload, deliver: submitted.append((msg, deliver)))
+    datachannel = types.SimpleNamespace(decode_executor=executor, pub_sub=pub_sub,
+                                        decode_executor_topics={LIDAR_TOPIC})
+
+    for index in range(6):
+        header = {"type": "msg", "topic": LIDAR_TOPIC, "data": {"index": index}}
+        assert WebRTCDataChannel.submit_array_buffer(datachannel, (header, b"voxels"))
+    # Only admitted frames reach a decode worker
+    assert [msg["data"]["index"] for msg, _ in submitted] == [1, 3, 5]
+
+    for msg, deliver in submitted:
+        deliver(msg)  # The executor delivers the decoded message
+    # Selection is not repeated on delivery
+    assert [msg["data"]["index"] for msg in delivered] == [1, 3, 5]
+
+
+def test_text_messages_skipped_by_decimation_are_not_parsed():
+    pub_sub = WebRTCDataChannelPubSub(FakeChannel())
+    delivered = []
+    pub_sub.subscribe("rt/lf/lowstate", lambda msg: delivered.append(msg["data"]["tick"]),
+                      every_nth=3)
+
+    messages = [LazyMessage.parse(json.dumps(
+        {"type": "msg", "topic": "rt/lf/lowstate", "data": {"tick": tick}})) for tick in range(6)]
+    for msg in messages:
+        pub_sub.run_resolve(msg)
+
+    assert delivered == [2, 5]
+    assert [msg.is_parsed for msg in messages] == [False, False, True, False, False, True]
@@ -0,0 +1,107 @@
+import asyncio
+
+from go2_webrtc_driver.velocity_coalescer import ZERO_VELOCITY, VelocityCoalescer
+
+
+class FakeSend:
+    """Records every send; non-zero sends can hang and zero sends can fail."""
+
+    def __init__(self, hang=False, zero_failures=0):
+        self.calls = []
+        self.cancelled = []
+        self.hang = hang
+        self.zero_failures = zero_failures
+
+    async def __call__(self, x, y, yaw):
+        velocity = (x, y, yaw)
+        self.calls.append(velocity)
+        if velocity == ZERO_VELOCITY:
+            if self.zero_failures:
+                self.zero_failures -= 1
+                raise ConnectionError("Data channel is not open")
+        elif self.hang:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.cancelled.append(velocity)
+                raise
+
+
+async def test_burst_of_targets_is_coalesced():
+    send = FakeSend()
+    channel = VelocityCoalescer(send, period=0.1, deadman_timeout=None)
+    channel.start()
+    for step in range(50):
+        channel.set(step * 0.01, 0.0, 0.0)
+    await asyncio.sleep(0.05)
+
+    assert send.calls == [(0.49, 0.0, 0.0)]
+    assert channel.coalesced == 49
+    assert channel.updates == 50
+    await channel.stop(send_zero=False)
+
+
+async def test_deadman_sends_zero_after_timeout():
+    send = FakeSend()
+    channel = VelocityCoalescer(send, period=0.01, deadman_timeout=0.05)
+    channel.start()
+    channel.set(0.3, 0.0, 0.0)
+    await asyncio.sleep(0.02)
+    assert send.calls and send.calls[-1] == (0.3, 0.0, 0.0)
+
+    await asyncio.sleep(0.1)
+    assert send.calls[-1] == ZERO_VELOCITY
+    assert send.calls.count(ZERO_VELOCITY) == 1  # A stop is not repeated
+    assert channel.deadman_trips == 1
+    assert channel.target == ZERO_VELOCITY
+    await channel.stop(send_zero=False)
+
+
+async def test_zero_target_cancels_hung_send():
+    send = FakeSend(hang=True)
+    channel = VelocityCoalescer(send, period=0.01, deadman_timeout=None)
+    channel.start()
+    channel.set(0.5, 0.0, 0.2)
+    await asyncio.sleep(0.05)
+    # The hung command holds back further non-zero ticks
+    assert send.calls == [(0.5, 0.0, 0.2)]
+    assert channel.busy_ticks > 0
+
+    channel.set(0.0, 0.0, 0.0)
+    await asyncio.sleep(0.03)
+    assert send.calls == [(0.5, 0.0, 0.2), ZERO_VELOCITY]
+    assert send.cancelled == [(0.5, 0.0, 0.2)]
+    assert channel.preempted == 1
+    await channel.stop(send_zero=False)
+
+
+async def test_failed_stop_is_retried():
+    send = FakeSend(zero_failures=2)
+    channel = VelocityCoalescer(send, period=0.01, deadman_timeout=None)
+    channel.start()
+    channel.set(0.3, 0.0, 0.0)
+    await asyncio.sleep(0.02)
+    channel.set(0.0, 0.0, 0.0)
+    await asyncio.sleep(0.08)
+
+    assert send.calls.count(ZERO_VELOCITY) == 3
+    assert channel.errors == 2
+    assert channel.stats()["sent"] == len(send.calls) - 2
+    await channel.stop(send_zero=False)
+
+
+async def test_stop_sends_final_zero():
+    send = FakeSend(hang=True)
+    channel = VelocityCoalescer(send, period=0.01, deadman_timeout=None)
+    channel.start()
+    channel.set(0.2, 0.1, 0.0)
+    await asyncio.sleep(0.03)
+
+    await channel.stop()
+    assert not channel.running
+    assert send.calls[-1] == ZERO_VELOCITY
+
+    calls = len(send.calls)
+    await asyncio.sleep(0.03)
+    assert send.cancelled == [(0.2, 0.1, 0.0)]  # Cancelled, not waited for
+    assert len(send.calls) == calls  # Nothing is sent after stop()
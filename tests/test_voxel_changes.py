@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from go2_webrtc_driver.lidar.lidar_decoder_native import VoxelGrid
+from go2_webrtc_driver.lidar.voxel_changes import VoxelChangeDetector, _align
+
+SLICES = 6
+SHIFTS = [0, 1, -1, 7, -7, 8, -8, 9, -9, 63, -63, 127, -127, 128, -128]
+
+
+def random_grid(slices=SLICES, seed=0, origin=(0.0, 0.0, 0.0)):
+    rng = np.random.default_rng(seed)
+    bits = rng.integers(0, 256, (slices, 128, 16), dtype=np.uint8)
+    bits &= rng.integers(0, 256, bits.shape, dtype=np.uint8)  # About 25% occupied
+    return VoxelGrid(bits, origin, 0.05)
+
+
+def reference_align(bits, shift, slices):
+    """Voxel i of the result is voxel i + shift of bits, via unpackbits/roll/packbits."""
+    voxels = np.unpackbits(bits, axis=2).astype(bool)  # (z, y, x)
+    # Pad so the window may extend past the source and shifts never wrap into it
+    pad_z = max(slices, voxels.shape[0]) + 128
+    padded = np.zeros((voxels.shape[0] + 2 * pad_z, 3 * 128, 3 * 128), dtype=bool)
+    padded[pad_z:pad_z + voxels.shape[0], 128:256, 128:256] = voxels
+    sx, sy, sz = shift
+    rolled = np.roll(padded, (-sz, -sy, -sx), axis=(0, 1, 2))
+    window = rolled[pad_z:pad_z + slices, 128:256, 128:256]
+    return np.packbits(window, axis=2)
+
+
+@pytest.mark.parametrize("axis", [0, 1, 2])
+@pytest.mark.parametrize("offset", SHIFTS)
+def test_align_matches_reference(axis, offset):
+    grid = random_grid()
+    shift = [0, 0, 0]
+    shift[axis] = offset
+    shift = tuple(shift)
+    assert np.array_equal(_align(grid, shift, SLICES), reference_align(grid.bits, shift, SLICES))
+
+
+@pytest.mark.parametrize(
+    "shift", [(3, -5, 1), (-11, 17, -2), (127, -1, 0), (-128, 0, 0), (5, 127, -5)]
+)
+@pytest.mark.parametrize("slices", [SLICES - 2, SLICES, SLICES + 3])
+def test_align_combined_shifts_and_slice_counts(shift, slices):
+    grid = random_grid(seed=1)
+    assert np.array_equal(_align(grid, shift, slices), reference_align(grid.bits, shift, slices))
+
+
+def test_detector_reports_changes_in_moved_window():
+    previous = random_grid(seed=2)
+    shift = (5, -3, 1)
+    origin = tuple(np.float32(s * 0.05) for s in shift)
+    current_bits = reference_align(previous.bits, shift, SLICES)
+    current_bits[0, 10, 2] ^= 0x10  # One voxel toggled
+    current = VoxelGrid(current_bits, origin, 0.05)
+
+    detector = VoxelChangeDetector()
+    assert detector.update(previous).keyframe
+    changes = detector.update(current)
+
+    assert not changes.keyframe
+    assert changes.shift == shift
+    assert sum(changes.counts()) == 1
+    toggled = changes.added if changes.added.count() else changes.removed
+    assert toggled.occupied(2 * 8 + 3, 10, 0)